@@ -8,9 +8,14 @@ from users.views import UserProfileView, UserManagementViewSet
 from core.views import (
     OrganizationViewSet, LocationViewSet, ContactViewSet,
     DocumentationViewSet, PasswordEntryViewSet, ConfigurationViewSet,
-    NetworkDeviceViewSet, EndpointUserViewSet, ServerViewSet, PeripheralViewSet, SoftwareViewSet, BackupViewSet, VoIPViewSet
+    NetworkDeviceViewSet, EndpointUserViewSet, ServerViewSet, PeripheralViewSet, SoftwareViewSet, BackupViewSet, VoIPViewSet,
+    RMMEndpointViewSet, SoftwareCatalogViewSet, SoftwareInstallationViewSet, SubnetViewSet, IPAddressViewSet
+)
+from .views import (
+    dashboard_stats, diagram_data, search, fuzzy, autocomplete, expiring,
+    phone_lookup, extension_conflict_report, mac_lookup, mac_vendors,
+    asset_lookup, duplicate_assets, trash, trash_restore, trash_purge
 )
-from .views import dashboard_stats, diagram_data
 
 app_name = 'api'
 
@@ -28,6 +33,11 @@ router.register(r'peripherals', PeripheralViewSet, basename='peripheral')
 router.register(r'software', SoftwareViewSet, basename='software')
 router.register(r'backups', BackupViewSet, basename='backup')
 router.register(r'voip', VoIPViewSet, basename='voip')
+router.register(r'rmm-endpoints', RMMEndpointViewSet, basename='rmm-endpoint')
+router.register(r'software-catalog', SoftwareCatalogViewSet, basename='software-catalog')
+router.register(r'software-installations', SoftwareInstallationViewSet, basename='software-installation')
+router.register(r'subnets', SubnetViewSet, basename='subnet')
+router.register(r'ip-addresses', IPAddressViewSet, basename='ip-address')
 router.register(r'users', UserManagementViewSet, basename='user')
 
 urlpatterns = [
@@ -36,6 +46,25 @@ urlpatterns = [
 
     # Dashboard endpoints
     path('dashboard/stats/', dashboard_stats, name='dashboard-stats'),
+    path('dashboard/expiring/', expiring, name='dashboard-expiring'),
+
+    # Global search
+    path('search/', search, name='search'),
+    path('search/fuzzy/', fuzzy, name='fuzzy-search'),
+    path('autocomplete/<str:kind>/', autocomplete, name='autocomplete'),
+
+    # Phone number index
+    path('phone/lookup/', phone_lookup, name='phone-lookup'),
+    path('phone/extension-conflicts/', extension_conflict_report, name='extension-conflicts'),
+    path('mac/lookup/', mac_lookup, name='mac-lookup'),
+    path('mac/vendors/', mac_vendors, name='mac-vendors'),
+    path('assets/lookup/', asset_lookup, name='asset-lookup'),
+    path('assets/duplicates/', duplicate_assets, name='asset-duplicates'),
+
+    # Trash (soft-deleted items of every type)
+    path('trash/', trash, name='trash'),
+    path('trash/restore/', trash_restore, name='trash-restore'),
+    path('trash/purge/', trash_purge, name='trash-purge'),
 
     # Diagram endpoints
     path('diagram/data/', diagram_data, name='diagram-data'),
@@ -1,3 +1,7 @@
+import math
+import uuid
+from datetime import date
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -6,8 +10,27 @@ from core.models import (
     PasswordEntry, Configuration, NetworkDevice, EndpointUser, Server, Peripheral, Software, Backup, VoIP
 )
 from core.serializers import (
-    NetworkDeviceSerializer, EndpointUserSerializer, ServerSerializer, PeripheralSerializer, SoftwareSerializer, BackupSerializer, VoIPSerializer
+    NetworkDeviceSerializer, EndpointUserSerializer, ServerSerializer, PeripheralSerializer, SoftwareSerializer, BackupSerializer, VoIPSerializer,
+    SearchEntrySerializer
+)
+from core.search_index import SEARCHABLE_MODELS, global_search, group_results
+from core.autocomplete import LOOKUPS, DEFAULT_LIMIT, MAX_LIMIT, cached_lookup
+from core.fuzzy import FUZZY_MODELS, DEFAULT_THRESHOLD, fuzzy_search
+from core.phone_index import normalize_extension, normalize_number, country_code, reverse_lookup, extension_conflicts
+from core.mac import (
+    MAX_VENDOR_LOOKUP as MAX_MAC_VENDOR_LOOKUP, normalize_mac, format_mac, find_devices,
+    get_database as get_oui_database, mac_vendors as lookup_mac_vendors
+)
+from core.asset_index import (
+    IDENTIFIERS as ASSET_IDENTIFIERS, lookup as asset_index_lookup, duplicates as asset_duplicates
 )
+from core.trash import (
+    TRASH_MODELS, MAX_LIMIT as TRASH_MAX_LIMIT, MAX_BULK_ITEMS as MAX_TRASH_ITEMS, InvalidCursor,
+    trash_page, trash_type, restore_items as restore_trash_items, purge_items as purge_trash_items
+)
+from core.soft_delete import ParentDeleted
+from core.params import organization_id_param
+from core.expiry import EXPIRING_SOURCES, MAX_LIMIT as EXPIRING_MAX_LIMIT, default_range, expiring_items, expiring_counts
 
 
 @api_view(['GET'])
@@ -43,6 +66,435 @@ def dashboard_stats(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """
+    Search across all entity types at once.
+
+    Query parameters:
+    - q: Search terms (required)
+    - organization_id: Restrict to one organization
+    - types: Comma-separated entity types (e.g. server,contact)
+    - limit: Maximum number of hits (default 50, max 200)
+
+    Hits are ranked together and returned grouped by type, best group first.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'query': '', 'count': 0, 'groups': []})
+
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    types = [t for t in request.query_params.get('types', '').split(',') if t]
+    unknown = [t for t in types if t not in SEARCHABLE_MODELS]
+    if unknown:
+        return Response({'detail': f"Unknown types: {', '.join(unknown)}"}, status=400)
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', 50)), 1), 200)
+    except ValueError:
+        limit = 50
+
+    entries = global_search(query, organization_id=org_id, object_types=types, limit=limit)
+    groups = [
+        {
+            'type': group['type'],
+            'label': group['label'],
+            'count': len(group['results']),
+            'results': SearchEntrySerializer(group['results'], many=True).data,
+        }
+        for group in group_results(entries)
+    ]
+    return Response({'query': query, 'count': len(entries), 'groups': groups})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def fuzzy(request):
+    """
+    Typo-tolerant search on device names, hostnames, serial numbers and contact names.
+
+    Query parameters:
+    - q: Search text (required)
+    - types: Comma-separated types (network_device, endpoint_user, server, peripheral, contact)
+    - organization_id: Restrict to one organization
+    - threshold: Minimum similarity between 0 and 1 (default 0.3)
+    - limit: Maximum number of hits (default 20, max 100)
+
+    Hits are ranked by trigram similarity and report the field that matched.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response([])
+
+    types = [t for t in request.query_params.get('types', '').split(',') if t]
+    unknown = [t for t in types if t not in FUZZY_MODELS]
+    if unknown:
+        return Response({'detail': f"Unknown types: {', '.join(unknown)}"}, status=400)
+
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    try:
+        threshold = float(request.query_params.get('threshold', DEFAULT_THRESHOLD))
+        if not math.isfinite(threshold):
+            raise ValueError(threshold)
+    except ValueError:
+        return Response({'detail': 'threshold must be a number.'}, status=400)
+    threshold = min(max(threshold, 0.05), 1.0)
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+
+    return Response(fuzzy_search(query, types, organization_id=org_id, threshold=threshold, limit=limit))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def autocomplete(request, kind):
+    """
+    Typeahead suggestions for form selects: contacts, locations, organizations or devices.
+
+    Query parameters:
+    - q: Case-insensitive name prefix (required)
+    - organization_id: Restrict to one organization
+    - limit: Maximum number of suggestions (default 10, max 25)
+
+    Returns a list of {id, label}; device suggestions also carry their type.
+    """
+    if kind not in LOOKUPS:
+        return Response({'detail': f'Unknown lookup: {kind}'}, status=404)
+
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response([])
+
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+
+    return Response(cached_lookup(request.user, kind, query, organization_id=org_id, limit=limit))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def expiring(request):
+    """
+    Software licences, VoIP subscriptions and endpoint warranties expiring in a date range.
+
+    Query parameters:
+    - start, end: ISO dates, inclusive (default today to 30 days from now)
+    - organization_id: Restrict to one organization
+    - types: Comma-separated kinds (software, voip, warranty)
+    - limit: Maximum number of items (default 100, max 500)
+
+    Items are ordered by expiry date; counts cover the whole range per kind.
+    """
+    start, end = default_range()
+    try:
+        if request.query_params.get('start'):
+            start = date.fromisoformat(request.query_params['start'])
+        if request.query_params.get('end'):
+            end = date.fromisoformat(request.query_params['end'])
+    except ValueError:
+        return Response({'detail': 'start and end must be ISO dates (YYYY-MM-DD).'}, status=400)
+    if end < start:
+        return Response({'detail': 'end must not be before start.'}, status=400)
+
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    types = [t for t in request.query_params.get('types', '').split(',') if t]
+    unknown = [t for t in types if t not in EXPIRING_SOURCES]
+    if unknown:
+        return Response({'detail': f"Unknown types: {', '.join(unknown)}"}, status=400)
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', 100)), 1), EXPIRING_MAX_LIMIT)
+    except ValueError:
+        limit = 100
+
+    return Response({
+        'start': start,
+        'end': end,
+        'counts': expiring_counts(start, end, organization_id=org_id, kinds=types),
+        'results': expiring_items(start, end, organization_id=org_id, kinds=types, limit=limit),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def phone_lookup(request):
+    """
+    Reverse lookup of a phone number or extension, e.g. for caller-ID screen pops.
+
+    Query parameters:
+    - number: Phone number in any common format; read as E.164 when it starts
+      with + or 00, otherwise as a national number of the organization's
+      country (or the default country without organization_id)
+    - extension: Extension digits (requires organization_id)
+    - organization_id: Restrict to one organization
+
+    Returns the normalized value and every contact, assignment and VoIP
+    service it belongs to.
+    """
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    raw_number = request.query_params.get('number', '').strip()
+    raw_extension = request.query_params.get('extension', '').strip()
+    if raw_number:
+        country = Organization.objects.filter(id=org_id).values_list('country', flat=True).first() if org_id else None
+        number = normalize_number(raw_number, country_code(country))
+        if not number:
+            return Response({'detail': 'Not a valid phone number.'}, status=400)
+        return Response({'number': number, 'results': reverse_lookup(number=number, organization_id=org_id)})
+    if raw_extension:
+        if not org_id:
+            return Response({'detail': 'organization_id is required for extension lookups.'}, status=400)
+        extension = normalize_extension(raw_extension)
+        if not extension:
+            return Response({'detail': 'Not a valid extension.'}, status=400)
+        return Response({'extension': extension, 'results': reverse_lookup(extension=extension, organization_id=org_id)})
+    return Response({'detail': 'number or extension is required.'}, status=400)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def extension_conflict_report(request):
+    """
+    Extensions used by more than one contact or listed by more than one VoIP
+    service within an organization.
+
+    Query parameters:
+    - organization_id: Restrict to one organization (default all)
+    """
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    conflicts = extension_conflicts(organization_id=org_id)
+    return Response({'count': len(conflicts), 'results': conflicts})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def mac_lookup(request):
+    """
+    Find the devices holding a MAC address, e.g. from a switch or DHCP table.
+
+    Query parameters:
+    - mac: MAC address in any common notation (aa:bb:.., AA-BB-.., aabb.cc..)
+    - organization_id: Restrict to one organization
+
+    Returns the canonical MAC, its OUI vendor and every network device,
+    endpoint, server, peripheral and RMM endpoint it is recorded on.
+    """
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    mac = normalize_mac(request.query_params.get('mac', ''))
+    if not mac:
+        return Response({'detail': 'mac must be a valid MAC address.'}, status=400)
+    return Response({
+        'mac': format_mac(mac),
+        'vendor': get_oui_database().vendor(mac),
+        'results': find_devices(mac, organization_id=org_id),
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mac_vendors(request):
+    """
+    Resolve OUI vendors for many MAC addresses at once.
+
+    Body: {"macs": ["00:50:56:aa:bb:cc", ...]} (at most MAX_MAC_VENDOR_LOOKUP)
+
+    Returns {"results": {mac: vendor or null}} keyed by the input strings.
+    """
+    macs = request.data.get('macs') if isinstance(request.data, dict) else None
+    if not isinstance(macs, list) or not all(isinstance(mac, str) for mac in macs):
+        return Response({'detail': 'macs must be a list of strings.'}, status=400)
+    if len(macs) > MAX_MAC_VENDOR_LOOKUP:
+        return Response({'detail': f'At most {MAX_MAC_VENDOR_LOOKUP} MAC addresses per request.'}, status=400)
+    return Response({'results': lookup_mac_vendors(macs)})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def asset_lookup(request):
+    """
+    Find devices of any type by serial number, MAC address or hostname.
+
+    Query parameters:
+    - q: Identifier to look up (required); matched after normalization
+    - identifiers: Comma-separated identifiers to try (serial_number, mac_address, hostname; default all)
+    - organization_id: Restrict to one organization
+
+    Each hit reports which identifiers matched.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'detail': 'q is required.'}, status=400)
+
+    identifiers = [i for i in request.query_params.get('identifiers', '').split(',') if i]
+    unknown = [i for i in identifiers if i not in ASSET_IDENTIFIERS]
+    if unknown:
+        return Response({'detail': f"Unknown identifiers: {', '.join(unknown)}"}, status=400)
+
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    results = asset_index_lookup(query, identifiers=identifiers, organization_id=org_id)
+    return Response({'query': query, 'count': len(results), 'results': results})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def duplicate_assets(request):
+    """
+    Serial numbers, MAC addresses and hostnames recorded on more than one asset.
+
+    Serial numbers and MACs are compared across every organization and model;
+    hostnames within each organization. An RMM endpoint reconciled with a
+    documented endpoint or server counts as the same asset.
+
+    Query parameters:
+    - identifiers: Comma-separated identifiers to check (default all)
+    - organization_id: Only duplicates involving this organization's devices
+    """
+    identifiers = [i for i in request.query_params.get('identifiers', '').split(',') if i] or ASSET_IDENTIFIERS
+    unknown = [i for i in identifiers if i not in ASSET_IDENTIFIERS]
+    if unknown:
+        return Response({'detail': f"Unknown identifiers: {', '.join(unknown)}"}, status=400)
+
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    results = [
+        duplicate
+        for identifier in identifiers
+        for duplicate in asset_duplicates(identifier, organization_id=org_id)
+    ]
+    return Response({'count': len(results), 'results': results})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def trash(request):
+    """
+    Soft-deleted items of every type in one list, most recently deleted first.
+
+    Query parameters:
+    - organization_id: Restrict to one organization
+    - types: Comma-separated item types (e.g. contact,server)
+    - limit: Items per page (default 50, max 200)
+    - cursor: The 'next' value of the previous page
+    """
+    org_id, error = organization_id_param(request)
+    if error:
+        return error
+
+    types = [t for t in request.query_params.get('types', '').split(',') if t]
+    unknown = [t for t in types if t not in TRASH_MODELS]
+    if unknown:
+        return Response({'detail': f"Unknown types: {', '.join(unknown)}"}, status=400)
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', 50)), 1), TRASH_MAX_LIMIT)
+    except ValueError:
+        limit = 50
+
+    try:
+        page = trash_page(
+            organization_id=org_id, object_types=types, cursor=request.query_params.get('cursor'), limit=limit
+        )
+    except InvalidCursor as exc:
+        return Response({'detail': str(exc)}, status=400)
+    return Response(page)
+
+
+def _trash_items(request):
+    """[(type, id), ...] from a {"items": [{"type": ..., "id": ...}]} body, or an error Response."""
+    items = request.data.get('items') if isinstance(request.data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, Response({'detail': 'items must be a non-empty list of {"type", "id"} objects.'}, status=400)
+    if len(items) > MAX_TRASH_ITEMS:
+        return None, Response({'detail': f'At most {MAX_TRASH_ITEMS} items per request.'}, status=400)
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict) or item.get('type') not in TRASH_MODELS:
+            return None, Response({'detail': f'Unknown item type: {item!r}'}, status=400)
+        try:
+            parsed.append((item['type'], uuid.UUID(str(item.get('id')))))
+        except ValueError:
+            return None, Response({'detail': f'Invalid id: {item!r}'}, status=400)
+    return parsed, None
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def trash_restore(request):
+    """
+    Restore many soft-deleted items at once, with everything their deletion
+    cascaded to.
+
+    Body: {"items": [{"type": "contact", "id": "..."}, ...]}
+
+    Items that are not deleted are skipped. If any item belongs to a deleted
+    parent that is not restored with it, nothing is restored and the response
+    is a 400 listing those items under "blocked".
+    """
+    items, error = _trash_items(request)
+    if error:
+        return error
+    try:
+        restored = restore_trash_items(items)
+    except ParentDeleted as e:
+        object_type = trash_type(e.model)
+        return Response(
+            {'detail': str(e), 'blocked': [{'type': object_type, 'id': pk} for pk in e.pks]},
+            status=400
+        )
+    return Response({'detail': f'{sum(restored.values())} items restored.', 'restored': restored})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def trash_purge(request):
+    """
+    Permanently delete many soft-deleted items at once (admin only).
+
+    Body: {"items": [{"type": "contact", "id": "..."}, ...]}
+
+    Everything a hard delete of the items would remove goes with them.
+    """
+    if not request.user.is_staff:
+        return Response({'detail': 'Only administrators can permanently delete items.'}, status=403)
+    items, error = _trash_items(request)
+    if error:
+        return error
+    deleted = purge_trash_items(items)
+    return Response({'detail': 'Items permanently deleted.', 'deleted': deleted})
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def diagram_data(request):
@@ -55,8 +507,6 @@ def diagram_data(request):
     - location_id: Filter by location (includes unassigned items with location=null)
     """
     from django.db.models import Q
-    import uuid
-
     org_id = request.query_params.get('organization_id')
     location_id_str = request.query_params.get('location_id')
 
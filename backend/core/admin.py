@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     Organization, Location, Contact, Documentation,
-    PasswordEntry, Configuration
+    PasswordEntry, Configuration, RMMSource, RMMSyncRun, ArchivedRow
 )
 
 
@@ -65,3 +65,33 @@ class ConfigurationAdmin(admin.ModelAdmin):
     list_filter = ['organization', 'config_type', 'is_active', 'created_at']
     search_fields = ['name', 'description']
     readonly_fields = ['id', 'created_by', 'created_at', 'updated_at']
+
+
+@admin.register(RMMSource)
+class RMMSourceAdmin(admin.ModelAdmin):
+    list_display = ['name', 'organization', 'sync_interval_minutes', 'is_active', 'last_sync_at', 'last_sync_status', 'next_sync_at']
+    list_filter = ['organization', 'is_active', 'last_sync_status']
+    search_fields = ['name', 'base_url']
+    readonly_fields = [
+        'id', 'created_by', 'created_at', 'updated_at', 'last_sync_at', 'last_sync_status',
+        'last_error', 'consecutive_failures', 'locked_until'
+    ]
+
+
+@admin.register(RMMSyncRun)
+class RMMSyncRunAdmin(admin.ModelAdmin):
+    list_display = ['source', 'organization', 'started_at', 'duration_seconds', 'status', 'agents_total', 'stale_count']
+    list_filter = ['status', 'source']
+    readonly_fields = [
+        'source', 'organization', 'started_at', 'finished_at', 'duration_seconds', 'status',
+        'agents_total', 'created_count', 'updated_count', 'stale_count', 'error'
+    ]
+
+
+@admin.register(ArchivedRow)
+class ArchivedRowAdmin(admin.ModelAdmin):
+    list_display = ['object_type', 'object_id', 'organization_id', 'deleted_at', 'archived_at']
+    list_filter = ['object_type']
+    search_fields = ['object_id']
+    exclude = ['data']
+    readonly_fields = ['object_type', 'object_id', 'organization_id', 'deleted_at', 'archived_at']
@@ -4,3 +4,37 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db import connections
+        from django.db.models.signals import post_migrate
+        from .search import ensure_sqlite_indexes
+        from .autocomplete import ensure_prefix_indexes
+        from .search_index import connect_signals
+        from .fuzzy import connect_signals as connect_fuzzy_signals
+        from .tags import connect_signals as connect_tag_signals
+        from .inventory import connect_signals as connect_inventory_signals
+        from .compliance import connect_signals as connect_compliance_signals
+        from .backup_health import connect_signals as connect_backup_health_signals
+        from .phone_index import connect_signals as connect_phone_signals
+        from .ipam import connect_signals as connect_ipam_signals
+        from .mac import connect_signals as connect_mac_signals
+        from .asset_index import connect_signals as connect_asset_signals
+
+        def repair_raw_indexes(sender, using, **kwargs):
+            # SQLite table rebuilds during migrate drop the FTS triggers and
+            # the raw SQL autocomplete indexes
+            ensure_sqlite_indexes(connections[using])
+            ensure_prefix_indexes(connections[using])
+
+        post_migrate.connect(repair_raw_indexes, sender=self, weak=False)
+        connect_signals()
+        connect_fuzzy_signals()
+        connect_tag_signals()
+        connect_inventory_signals()
+        connect_compliance_signals()
+        connect_backup_health_signals()
+        connect_phone_signals()
+        connect_ipam_signals()
+        connect_mac_signals()
+        connect_asset_signals()
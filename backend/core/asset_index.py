@@ -0,0 +1,249 @@
+"""
+Unified asset index across the device models.
+
+Serial numbers, hostnames and MAC addresses of network devices, endpoints,
+servers, peripherals and RMM endpoints are copied, normalized, into one
+asset_index table with an index on each identifier. Looking a device up by
+any identifier is a single index hit, and duplicate detection is a GROUP BY
+on one table instead of a join across five.
+
+Serial numbers and MACs are globally unique, so they are compared across
+organizations; hostnames only mean something inside one organization.
+"""
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_save, post_delete
+
+from .mac import normalize_mac
+from .models import NetworkDevice, EndpointUser, Server, Peripheral, RMMEndpoint, AssetIndexEntry
+from .soft_delete import soft_delete_changed
+
+BATCH_SIZE = 1000
+
+# Placeholder serials reported by BIOSes that must never be used as a match key
+IGNORED_SERIALS = {
+    '', '0', '00000000', '0123456789', '1234567890', 'NONE', 'N/A', 'NA',
+    'DEFAULT STRING', 'TO BE FILLED BY O.E.M.', 'SYSTEM SERIAL NUMBER',
+    'NOT SPECIFIED', 'NOT APPLICABLE', 'INVALID', 'UNKNOWN',
+}
+
+# object_type -> model and the field holding its hostname (None if it has none)
+ASSET_MODELS = {
+    'network_device': {'model': NetworkDevice, 'hostname': None},
+    'endpoint_user': {'model': EndpointUser, 'hostname': 'hostname'},
+    'server': {'model': Server, 'hostname': 'hostname'},
+    'peripheral': {'model': Peripheral, 'hostname': None},
+    'rmm_endpoint': {'model': RMMEndpoint, 'hostname': 'name'},
+}
+OBJECT_TYPES = {spec['model']: object_type for object_type, spec in ASSET_MODELS.items()}
+
+IDENTIFIERS = ['serial_number', 'mac_address', 'hostname']
+# Identifiers compared within one organization only
+ORGANIZATION_SCOPED = {'hostname'}
+WATCHED_FIELDS = {
+    'name', 'hostname', 'serial_number', 'mac_address', 'organization', 'location', 'deleted_at',
+    'endpoint_user', 'server',
+}
+
+
+def normalize_serial(value):
+    serial = (value or '').strip().upper()
+    return '' if serial in IGNORED_SERIALS else serial
+
+
+def normalize_hostname(value):
+    return (value or '').strip().lower().split('.')[0]
+
+
+def _fields(object_type):
+    hostname = ASSET_MODELS[object_type]['hostname']
+    fields = ['id', 'organization_id', 'location_id', 'name', 'serial_number', 'mac_address', 'deleted_at']
+    if hostname and hostname != 'name':
+        fields.append(hostname)
+    if object_type == 'rmm_endpoint':
+        fields += ['endpoint_user_id', 'server_id']
+    return fields
+
+
+def _entry(object_type, obj):
+    hostname = ASSET_MODELS[object_type]['hostname']
+    return AssetIndexEntry(
+        organization_id=obj.organization_id,
+        location_id=obj.location_id,
+        object_type=object_type,
+        object_id=obj.pk,
+        asset_id=(obj.endpoint_user_id or obj.server_id or obj.pk) if object_type == 'rmm_endpoint' else obj.pk,
+        name=obj.name,
+        serial_number=normalize_serial(obj.serial_number),
+        hostname=normalize_hostname(getattr(obj, hostname)) if hostname else '',
+        mac_address=normalize_mac(obj.mac_address),
+    )
+
+
+def sync_objects(object_type, objects):
+    """
+    Replace the index rows of `objects` (instances of one asset model).
+
+    Soft-deleted objects are left without rows. Returns the number of rows written.
+    """
+    entries = [_entry(object_type, obj) for obj in objects if obj.deleted_at is None]
+    with transaction.atomic():
+        AssetIndexEntry.objects.filter(object_type=object_type, object_id__in=[obj.pk for obj in objects]).delete()
+        AssetIndexEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+    return len(entries)
+
+
+def sync_ids(object_type, ids):
+    """Re-index objects by primary key, e.g. after bulk updates that skip signals."""
+    ids = list(ids)
+    written = 0
+    for start in range(0, len(ids), BATCH_SIZE):
+        objects = list(ASSET_MODELS[object_type]['model'].all_objects.filter(
+            pk__in=ids[start:start + BATCH_SIZE]
+        ).only(*_fields(object_type)))
+        written += sync_objects(object_type, objects)
+    return written
+
+
+def index_object(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and not WATCHED_FIELDS.intersection(update_fields):
+        return
+    sync_objects(OBJECT_TYPES[sender], [instance])
+
+
+def unindex_object(sender, instance, **kwargs):
+    AssetIndexEntry.objects.filter(object_type=OBJECT_TYPES[sender], object_id=instance.pk).delete()
+
+
+def resync_objects(sender, pks, deleted, **kwargs):
+    if not deleted:
+        sync_ids(OBJECT_TYPES[sender], pks)
+        return
+    for start in range(0, len(pks), BATCH_SIZE):
+        AssetIndexEntry.objects.filter(
+            object_type=OBJECT_TYPES[sender], object_id__in=pks[start:start + BATCH_SIZE]
+        ).delete()
+
+
+def connect_signals():
+    for object_type, spec in ASSET_MODELS.items():
+        post_save.connect(index_object, sender=spec['model'], dispatch_uid=f'asset-index-save-{object_type}')
+        post_delete.connect(unindex_object, sender=spec['model'], dispatch_uid=f'asset-index-delete-{object_type}')
+        soft_delete_changed.connect(resync_objects, sender=spec['model'], dispatch_uid=f'asset-index-cascade-{object_type}')
+
+
+def rebuild_index(batch_size=BATCH_SIZE):
+    """Rebuild every model's rows. Returns {object_type: rows written}."""
+    counts = {}
+    for object_type, spec in ASSET_MODELS.items():
+        queryset = spec['model'].all_objects.order_by('pk').only(*_fields(object_type))
+        written = 0
+        batch = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                written += sync_objects(object_type, batch)
+                batch = []
+        if batch:
+            written += sync_objects(object_type, batch)
+        counts[object_type] = written
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def normalized_identifiers(value):
+    """{identifier: normalized value} a search value could stand for; unusable forms are left out."""
+    values = {
+        'serial_number': normalize_serial(value),
+        'mac_address': normalize_mac(value),
+        'hostname': normalize_hostname(value),
+    }
+    return {identifier: normalized for identifier, normalized in values.items() if normalized}
+
+
+def _holder(entry, matched_on=None):
+    holder = {
+        'type': entry.object_type,
+        'id': entry.object_id,
+        'asset_id': entry.asset_id,
+        'name': entry.name,
+        'organization_id': entry.organization_id,
+        'location_id': entry.location_id,
+        'serial_number': entry.serial_number,
+        'hostname': entry.hostname,
+        'mac_address': entry.mac_address,
+    }
+    if matched_on is not None:
+        holder['matched_on'] = matched_on
+    return holder
+
+
+def lookup(value, identifiers=None, organization_id=None):
+    """
+    Devices whose serial number, MAC or hostname equals `value` once normalized.
+
+    One query: an OR of equality tests, each served by its identifier's index.
+    """
+    values = normalized_identifiers(value)
+    if identifiers:
+        values = {identifier: values[identifier] for identifier in identifiers if identifier in values}
+    if not values:
+        return []
+    condition = Q()
+    for identifier, normalized in values.items():
+        condition |= Q(**{identifier: normalized})
+    queryset = AssetIndexEntry.objects.filter(condition)
+    if organization_id:
+        queryset = queryset.filter(organization_id=organization_id)
+    return [
+        _holder(entry, [identifier for identifier in IDENTIFIERS if values.get(identifier) == getattr(entry, identifier)])
+        for entry in queryset.order_by('object_type', 'name')
+    ]
+
+
+def duplicates(identifier, organization_id=None):
+    """
+    Identifier values held by more than one physical asset, with every holder.
+
+    Serial numbers and MACs are grouped across all organizations; with
+    `organization_id`, only values held by at least one of its devices are
+    reported. Hostnames are grouped per organization.
+    """
+    rows = AssetIndexEntry.objects.exclude(**{identifier: ''})
+    group_by = [identifier]
+    if identifier in ORGANIZATION_SCOPED:
+        group_by.insert(0, 'organization_id')
+        if organization_id:
+            rows = rows.filter(organization_id=organization_id)
+    elif organization_id:
+        rows = rows.filter(**{f'{identifier}__in': AssetIndexEntry.objects.filter(
+            organization_id=organization_id
+        ).exclude(**{identifier: ''}).values(identifier)})
+    groups = rows.values(*group_by).annotate(
+        assets=Count('asset_id', distinct=True)
+    ).filter(assets__gt=1).order_by(*group_by)
+    keys = {tuple(row[field] for field in group_by) for row in groups}
+    if not keys:
+        return []
+
+    found = {}
+    entries = AssetIndexEntry.objects.filter(**{f'{identifier}__in': {key[-1] for key in keys}})
+    if identifier in ORGANIZATION_SCOPED:
+        entries = entries.filter(organization_id__in={key[0] for key in keys})
+    for entry in entries.order_by(*group_by, 'object_type', 'name'):
+        key = tuple(getattr(entry, field) for field in group_by)
+        if key not in keys:
+            continue
+        duplicate = found.setdefault(key, {
+            'identifier': identifier,
+            'value': getattr(entry, identifier),
+            'organization_id': entry.organization_id if identifier in ORGANIZATION_SCOPED else None,
+            'holders': [],
+        })
+        duplicate['holders'].append(_holder(entry))
+    for duplicate in found.values():
+        duplicate['organizations'] = len({holder['organization_id'] for holder in duplicate['holders']})
+    return list(found.values())
@@ -0,0 +1,157 @@
+"""
+Typeahead lookups for form selects.
+
+Each lookup matches a case-insensitive prefix on a few short columns and
+returns only ids and labels. On PostgreSQL the columns carry partial indexes
+on lower(column) ``varchar_pattern_ops`` for live rows, so LIKE 'abc%' can use
+them. SQLite turns the prefix into a range (lower(column) >= 'abc' AND < 'abd')
+over (deleted_at, lower(column)) indexes; a partial index there loses to the
+plain deleted_at index in the planner.
+"""
+import hashlib
+
+from decouple import config
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .models import Organization, Location, Contact, NetworkDevice, EndpointUser, Server, Peripheral
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+MAX_QUERY_LENGTH = 100
+CACHE_TTL = config('AUTOCOMPLETE_CACHE_TTL', default=30, cast=int)
+
+# lookup kind -> models queried, the prefix-matched columns and the label columns.
+# Contacts also match "first last" as a first_name + last_name prefix pair.
+LOOKUPS = {
+    'organizations': [
+        {'model': Organization, 'fields': ['name'], 'label': ['name']},
+    ],
+    'locations': [
+        {'model': Location, 'fields': ['name'], 'label': ['name']},
+    ],
+    'contacts': [
+        {
+            'model': Contact, 'fields': ['first_name', 'last_name', 'email'],
+            'label': ['first_name', 'last_name'], 'name_pair': ('first_name', 'last_name'),
+        },
+    ],
+    'devices': [
+        {'model': NetworkDevice, 'type': 'network_device', 'fields': ['name'], 'label': ['name']},
+        {'model': EndpointUser, 'type': 'endpoint_user', 'fields': ['name', 'hostname'], 'label': ['name']},
+        {'model': Server, 'type': 'server', 'fields': ['name', 'hostname'], 'label': ['name']},
+        {'model': Peripheral, 'type': 'peripheral', 'fields': ['name'], 'label': ['name']},
+    ],
+}
+
+
+def prefix_index_name(table, column):
+    return f'{table}_{column}_prefix_idx'
+
+
+def prefix_index_sql(table, column, vendor):
+    """CREATE INDEX statement for a case-insensitive prefix index on live rows."""
+    qn = connection.ops.quote_name
+    name = qn(prefix_index_name(table, column))
+    if vendor == 'postgresql':
+        return (
+            f'CREATE INDEX IF NOT EXISTS {name} ON {qn(table)} '
+            f'(lower({qn(column)}) varchar_pattern_ops) WHERE deleted_at IS NULL'
+        )
+    return f'CREATE INDEX IF NOT EXISTS {name} ON {qn(table)} (deleted_at, lower({qn(column)}))'
+
+
+def prefix_index_drop_sql(table, column):
+    return f'DROP INDEX IF EXISTS {connection.ops.quote_name(prefix_index_name(table, column))}'
+
+
+def prefix_indexes():
+    """(table, column) of every prefix-matched column in LOOKUPS."""
+    columns = {}
+    for specs in LOOKUPS.values():
+        for spec in specs:
+            for field in spec['fields']:
+                columns.setdefault((spec['model']._meta.db_table, spec['model']._meta.get_field(field).column), None)
+    return list(columns)
+
+
+def ensure_prefix_indexes(using_connection=None):
+    """
+    Create any missing prefix indexes.
+
+    They are raw SQL (the PostgreSQL and SQLite shapes differ), so migration
+    state does not know them and SQLite table rebuilds drop them; this runs
+    after every migrate.
+    """
+    conn = using_connection or connection
+    if conn.vendor not in ('postgresql', 'sqlite'):
+        return
+    with conn.cursor() as cursor:
+        existing_tables = set(conn.introspection.table_names(cursor))
+        for table, column in prefix_indexes():
+            if table in existing_tables:
+                cursor.execute(prefix_index_sql(table, column, conn.vendor))
+
+
+def _prefix_q(field, prefix):
+    """Q matching lower(field) starting with `prefix` (already lower-cased)."""
+    alias = f'_{field}_lower'
+    if connection.vendor == 'postgresql':
+        return alias, Q(**{f'{alias}__startswith': prefix})
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return alias, Q(**{f'{alias}__gte': prefix, f'{alias}__lt': upper})
+
+
+def _matches(queryset, spec, prefix):
+    condition = Q()
+    aliases = {}
+    for field in spec['fields']:
+        alias, q = _prefix_q(field, prefix)
+        aliases[alias] = Lower(field)
+        condition |= q
+    first, _, rest = prefix.partition(' ')
+    if spec.get('name_pair') and rest.strip():
+        first_field, second_field = spec['name_pair']
+        first_alias, first_q = _prefix_q(first_field, first)
+        second_alias, second_q = _prefix_q(second_field, rest.strip())
+        aliases[first_alias] = Lower(first_field)
+        aliases[second_alias] = Lower(second_field)
+        condition |= first_q & second_q
+    return queryset.alias(**aliases).filter(condition)
+
+
+def lookup(kind, query, organization_id=None, limit=DEFAULT_LIMIT):
+    """Up to `limit` {id, label} dicts (plus type for devices) ordered by label."""
+    prefix = ' '.join((query or '').lower().split())[:MAX_QUERY_LENGTH]
+    if not prefix:
+        return []
+    results = []
+    for spec in LOOKUPS[kind]:
+        queryset = spec['model'].objects.all()
+        if organization_id:
+            field = 'id' if spec['model'] is Organization else 'organization_id'
+            queryset = queryset.filter(**{field: organization_id})
+        rows = _matches(queryset, spec, prefix).order_by(Lower(spec['label'][0])).values_list(
+            'id', *spec['label']
+        )[:limit]
+        for pk, *labels in rows:
+            item = {'id': pk, 'label': ' '.join(label for label in labels if label)}
+            if 'type' in spec:
+                item['type'] = spec['type']
+            results.append(item)
+    if len(LOOKUPS[kind]) > 1:
+        results.sort(key=lambda item: item['label'].lower())
+    return results[:limit]
+
+
+def cached_lookup(user, kind, query, organization_id=None, limit=DEFAULT_LIMIT):
+    """lookup() cached per user for CACHE_TTL seconds."""
+    digest = hashlib.sha1(f'{kind}|{organization_id}|{limit}|{query.lower()}'.encode()).hexdigest()
+    key = f'autocomplete:{user.pk}:{digest}'
+    results = cache.get(key)
+    if results is None:
+        results = lookup(kind, query, organization_id=organization_id, limit=limit)
+        cache.set(key, results, CACHE_TTL)
+    return results
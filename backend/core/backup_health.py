@@ -0,0 +1,186 @@
+"""
+Backup health: overdue and failed backup detection.
+
+Backup.frequency is free text ("Daily", "Every 4 hours", "2x per week"); it is
+parsed into an interval, and a backup is overdue once its expected run plus a
+grace period has passed without last_backup_date moving. The evaluation is
+stored on the row as health_status, and health_due_at records when a healthy
+backup would next turn overdue. Saves re-evaluate the row straight away, so
+the monitor only has to pick up rows whose health_due_at has passed.
+"""
+import re
+from datetime import timedelta
+
+from decouple import config
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .bulk import bulk_update_values
+from .models import Backup
+from .soft_delete import chunked, soft_delete_changed
+
+# Grace period as a fraction of the interval, never less than MIN_GRACE
+GRACE_RATIO = config('BACKUP_OVERDUE_GRACE', default=0.5, cast=float)
+MIN_GRACE = timedelta(hours=1)
+BATCH_SIZE = 1000
+
+AT_RISK_STATUSES = ['overdue', 'failed']
+HEALTH_FIELDS = ['health_status', 'overdue_since', 'health_checked_at', 'health_due_at']
+# Fields the evaluation reads; saves touching none of them keep the stored health
+WATCHED_FIELDS = {'frequency', 'last_backup_date', 'next_backup_date', 'backup_status', 'is_active', 'deleted_at'}
+
+# Word forms checked in order, so "bi-weekly" wins over "weekly"
+PERIOD_WORDS = [
+    (('continuous', 'real-time', 'realtime', 'cdp'), timedelta(hours=1)),
+    (('hourly',), timedelta(hours=1)),
+    (('weekday', 'business day', 'workday', 'mon-fri'), timedelta(days=3)),
+    (('nightly', 'daily', 'every day', 'every night'), timedelta(days=1)),
+    (('biweekly', 'bi-weekly', 'fortnightly'), timedelta(weeks=2)),
+    (('weekly',), timedelta(weeks=1)),
+    (('bimonthly', 'bi-monthly'), timedelta(days=62)),
+    (('monthly',), timedelta(days=31)),
+    (('quarterly',), timedelta(days=92)),
+    (('yearly', 'annually', 'annual'), timedelta(days=366)),
+]
+
+_COUNT_WORDS = {'once': 1, 'twice': 2, 'thrice': 3}
+_UNIT = r'(minutes?|mins?|m|hours?|hourly|hrs?|h|days?|daily|d|nights?|nightly|weeks?|weekly|wks?|w|months?|monthly|mo|years?|yearly|y)'
+# "2x daily", "twice a day", "3 times per week"
+_TIMES_PER_RE = re.compile(
+    r'(\d+|once|twice|thrice)\s*(?:x|times)?\s*(?:\ban?\b|per|each|/)\s*' + _UNIT + r'\b'
+)
+# "2x daily", "3 times weekly", "twice daily"
+_TIMES_RE = re.compile(r'(?:(\d+)\s*(?:x|times)|(twice|thrice)(?:\s*times)?)\s*' + _UNIT + r'\b')
+# "every 4 hours", "every day", "6h", "12 hours"
+_EVERY_RE = re.compile(r'every\s+(?:(\d+(?:\.\d+)?)\s*)?' + _UNIT + r'\b')
+_AMOUNT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*' + _UNIT + r'\b')
+# Clock times say when a run starts, not how often: "2am", "2:00 AM", "14:30"
+_TIME_OF_DAY_RE = re.compile(r'\b\d{1,2}(?::\d\d)?\s*[ap]\.?m\b\.?|\b\d{1,2}:\d\d\b')
+# How long copies are kept, not how often they are taken: "(30 day retention)",
+# "keep 4 weeks", "retained for 90 days"; removed up to the end of the clause
+_RETENTION_RE = re.compile(
+    r'(?:\d+(?:\.\d+)?\s*-?\s*' + _UNIT + r'\s+)?'
+    r'\b(?:retention|retained|retain|retaining|keep|keeps|keeping|kept|history)\b[^,;()]*'
+)
+
+
+def _unit_length(unit):
+    if unit.startswith(('mo',)):
+        return timedelta(days=31)
+    if unit.startswith('m'):
+        return timedelta(minutes=1)
+    if unit.startswith('h'):
+        return timedelta(hours=1)
+    if unit.startswith(('d', 'n')):
+        return timedelta(days=1)
+    if unit.startswith('w'):
+        return timedelta(weeks=1)
+    return timedelta(days=366)
+
+
+def parse_frequency(text):
+    """Interval between expected runs for a frequency description, or None if it can't be read."""
+    text = _TIME_OF_DAY_RE.sub(' ', (text or '').lower())
+    text = ' '.join(_RETENTION_RE.sub(' ', text).split())
+    if not text:
+        return None
+    match = _TIMES_PER_RE.search(text)
+    if match:
+        count = _COUNT_WORDS.get(match.group(1)) or int(match.group(1))
+        return _unit_length(match.group(2)) / count if count else None
+    match = _TIMES_RE.search(text)
+    if match:
+        count = int(match.group(1)) if match.group(1) else _COUNT_WORDS[match.group(2)]
+        return _unit_length(match.group(3)) / count if count else None
+    # A leading period word ("Daily, 7 days a week") outranks later amounts
+    for words, interval in PERIOD_WORDS:
+        if text.startswith(words):
+            return interval
+    match = _EVERY_RE.search(text) or _AMOUNT_RE.search(text)
+    if match:
+        amount = float(match.group(1) or 1)
+        return _unit_length(match.group(2)) * amount if amount else None
+    for words, interval in PERIOD_WORDS:
+        if any(word in text for word in words):
+            return interval
+    return None
+
+
+def grace_period(interval):
+    return max(interval * GRACE_RATIO, MIN_GRACE)
+
+
+def evaluate(backup, now=None):
+    """Health field values for a backup as of `now`."""
+    now = now or timezone.now()
+    values = {'health_checked_at': now, 'overdue_since': None, 'health_due_at': None}
+    if backup.deleted_at or not backup.is_active or backup.backup_status == 'inactive':
+        return {**values, 'health_status': 'unknown'}
+    if backup.backup_status == 'failed':
+        return {**values, 'health_status': 'failed'}
+    interval = parse_frequency(backup.frequency)
+    if interval is None:
+        return {**values, 'health_status': 'unknown'}
+
+    # A backup that never ran is measured from when it was documented
+    last_run = backup.last_backup_date or backup.created_at
+    expected = last_run + interval
+    if backup.next_backup_date and backup.next_backup_date > last_run:
+        expected = backup.next_backup_date
+    deadline = expected + grace_period(interval)
+    if now >= deadline:
+        return {**values, 'health_status': 'overdue', 'overdue_since': deadline}
+    return {**values, 'health_status': 'ok', 'health_due_at': deadline}
+
+
+def evaluate_backup(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and not WATCHED_FIELDS.intersection(update_fields):
+        return
+    values = evaluate(instance)
+    Backup.all_objects.filter(pk=instance.pk).update(**values)
+    for field, value in values.items():
+        setattr(instance, field, value)
+
+
+def reevaluate_backups(sender, pks, **kwargs):
+    now = timezone.now()
+    for chunk in chunked(pks, BATCH_SIZE):
+        backups = Backup.all_objects.filter(id__in=chunk).only('id', 'created_at', *WATCHED_FIELDS).order_by()
+        bulk_update_values(Backup, {backup.pk: evaluate(backup, now) for backup in backups}, HEALTH_FIELDS, batch_size=BATCH_SIZE)
+
+
+def connect_signals():
+    post_save.connect(evaluate_backup, sender=Backup, dispatch_uid='backup-health')
+    soft_delete_changed.connect(reevaluate_backups, sender=Backup, dispatch_uid='backup-health-bulk')
+
+
+def run_monitor(now=None, full=False, batch_size=BATCH_SIZE):
+    """
+    Re-evaluate backups whose health_due_at has passed (every live backup with `full`).
+
+    Health fields are written with one bulk UPDATE per batch. Returns
+    {'evaluated': n, 'ok': n, 'overdue': n, 'failed': n, 'unknown': n}.
+    """
+    now = now or timezone.now()
+    queryset = Backup.objects.all() if full else Backup.objects.filter(health_due_at__lte=now)
+    ids = list(queryset.order_by('health_due_at').values_list('id', flat=True))
+    counts = {'evaluated': len(ids), 'ok': 0, 'overdue': 0, 'failed': 0, 'unknown': 0}
+    for start in range(0, len(ids), batch_size):
+        backups = Backup.objects.filter(id__in=ids[start:start + batch_size]).only(
+            'id', 'created_at', *WATCHED_FIELDS
+        ).order_by()
+        updates = {}
+        for backup in backups:
+            values = evaluate(backup, now)
+            counts[values['health_status']] += 1
+            updates[backup.pk] = values
+        bulk_update_values(Backup, updates, HEALTH_FIELDS, batch_size=batch_size)
+    return counts
+
+
+def at_risk(organization_id=None):
+    """Overdue and failed backups, longest overdue first."""
+    queryset = Backup.objects.filter(health_status__in=AT_RISK_STATUSES)
+    if organization_id:
+        queryset = queryset.filter(organization_id=organization_id)
+    return queryset.order_by('health_status', 'overdue_since', 'name')
@@ -0,0 +1,247 @@
+"""
+Licence compliance: Software licences cross-checked against installed inventory.
+
+Installs come from the structured inventory of documented endpoints and
+servers (SoftwareInstallation) plus RMM-reported software on agents that are
+not reconciled with a documented machine, so no machine is counted twice.
+Licences and installs are matched on the inventory's normalized title (the
+licence name without a trailing version, as core.inventory parses it).
+
+Each source is read with one grouped query per organization and joined in
+memory on the title key. Reports are stored per organization in the
+compliance_reports table, shared by all workers, and cleared in the same
+transaction as any change to that organization's licences, assignments or
+inventory, so only the affected organization is recomputed on the next request.
+Clearing bumps the row's version, and a report is stored only over the version
+it was built from, so one built from data a concurrent write replaced is dropped.
+"""
+from collections import defaultdict
+
+from datetime import timedelta
+
+from decouple import config
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+
+from .inventory import normalize_name, parse_software
+from .models import (
+    ComplianceReport, EndpointUser, Server, Software, SoftwareAssignment, SoftwareInstallation, RMMSoftware,
+)
+from .soft_delete import soft_delete_changed
+
+CACHE_TTL = config('COMPLIANCE_CACHE_TTL', default=3600, cast=int)
+# Machine fields whose changes alter an organization's installs or seat usage
+MACHINE_FIELDS = {'software_installed', 'assigned_to', 'organization', 'deleted_at'}
+
+
+def title_key(name):
+    """Normalized title a licence or RMM software name matches installs on."""
+    items = parse_software(name)
+    return normalize_name(items[0][0]) if items else ''
+
+
+def _licences(organization_id, today):
+    rows = Software.objects.filter(organization_id=organization_id).annotate(
+        assigned=Count('software_assignments', filter=Q(software_assignments__deleted_at__isnull=True))
+    ).order_by('name').values(
+        'id', 'name', 'license_type', 'quantity', 'expiry_date', 'is_active', 'assigned'
+    )
+    licences = []
+    for row in rows:
+        row['key'] = title_key(row['name'])
+        row['expired'] = row['expiry_date'] is not None and row['expiry_date'] < today
+        row['covers'] = row['is_active'] and not row['expired']
+        licences.append(row)
+    return licences
+
+
+def _installs(organization_id):
+    """{title key: [documented machines, RMM-only endpoints]} with the display name seen first."""
+    installs = defaultdict(lambda: [0, 0])
+    names = {}
+    documented = SoftwareInstallation.objects.filter(organization_id=organization_id).values(
+        'catalog__normalized_name', 'catalog__name'
+    ).annotate(machines=Count('id')).order_by()
+    for row in documented:
+        key = row['catalog__normalized_name']
+        installs[key][0] += row['machines']
+        names.setdefault(key, row['catalog__name'])
+
+    # Agents linked to a documented machine are already counted through its inventory
+    reported = RMMSoftware.objects.filter(
+        endpoint__organization_id=organization_id,
+        endpoint__deleted_at__isnull=True,
+        endpoint__endpoint_user__isnull=True,
+        endpoint__server__isnull=True,
+    ).values('name').annotate(endpoints=Count('endpoint_id', distinct=True)).order_by()
+    for row in reported:
+        key = title_key(row['name'])
+        if key:
+            installs[key][1] += row['endpoints']
+            names.setdefault(key, parse_software(row['name'])[0][0])
+    return installs, names
+
+
+def _idle_assignments(organization_id, keys):
+    """{software id: assignments whose contact has no assigned endpoint with the title installed}."""
+    if not keys:
+        return {}
+    installed = set(SoftwareInstallation.objects.filter(
+        organization_id=organization_id,
+        catalog__normalized_name__in=keys,
+        endpoint_user__assigned_to__isnull=False,
+    ).values_list('endpoint_user__assigned_to_id', 'catalog__normalized_name').distinct())
+    idle = defaultdict(int)
+    for software_id, contact_id, name in SoftwareAssignment.objects.filter(
+        software__organization_id=organization_id, software__deleted_at__isnull=True
+    ).values_list('software_id', 'contact_id', 'software__name'):
+        if (contact_id, title_key(name)) not in installed:
+            idle[software_id] += 1
+    return idle
+
+
+def build_report(organization_id):
+    """Compute the compliance report for one organization (uncached)."""
+    today = timezone.localdate()
+    licences = _licences(organization_id, today)
+    installs, names = _installs(organization_id)
+    idle = _idle_assignments(organization_id, {licence['key'] for licence in licences if licence['key']})
+
+    # Seats covering each title; free licences cover any number of installs
+    seats = defaultdict(int)
+    unlimited = set()
+    for licence in licences:
+        if licence['covers']:
+            seats[licence['key']] += licence['quantity']
+            if licence['license_type'] == 'free':
+                unlimited.add(licence['key'])
+
+    licence_rows = []
+    for licence in licences:
+        documented, rmm = installs.get(licence['key'], (0, 0))
+        installed = documented + rmm
+        unlimited_title = licence['key'] in unlimited
+        licence_rows.append({
+            'software_id': licence['id'],
+            'name': licence['name'],
+            'license_type': licence['license_type'],
+            'is_active': licence['is_active'],
+            'expired': licence['expired'],
+            'quantity': licence['quantity'],
+            'assigned': licence['assigned'],
+            'installed': installed,
+            'over_assigned': max(0, licence['assigned'] - licence['quantity']) if licence['license_type'] != 'free' else 0,
+            'unused_seats': max(0, licence['quantity'] - licence['assigned']),
+            'idle_assignments': idle.get(licence['id'], 0),
+            'uncovered_installs': 0 if unlimited_title else max(0, installed - seats[licence['key']]),
+        })
+
+    unlicensed = []
+    for key, (documented, rmm) in installs.items():
+        if key in unlimited:
+            continue
+        uncovered = documented + rmm - seats.get(key, 0)
+        if uncovered > 0:
+            unlicensed.append({
+                'name': names[key],
+                'licensed_seats': seats.get(key, 0),
+                'installed': documented + rmm,
+                'documented_installs': documented,
+                'rmm_installs': rmm,
+                'uncovered_installs': uncovered,
+            })
+    unlicensed.sort(key=lambda item: (-item['uncovered_installs'], item['name']))
+
+    over_assigned = [row for row in licence_rows if row['over_assigned']]
+    return {
+        'organization': organization_id,
+        'generated_at': timezone.now().isoformat(),
+        'summary': {
+            'licences': len(licence_rows),
+            'seats': sum(row['quantity'] for row in licence_rows),
+            'assigned': sum(row['assigned'] for row in licence_rows),
+            'over_assigned_licences': len(over_assigned),
+            'over_assigned_seats': sum(row['over_assigned'] for row in over_assigned),
+            'unused_seats': sum(row['unused_seats'] for row in licence_rows),
+            'idle_assignments': sum(row['idle_assignments'] for row in licence_rows),
+            'unlicensed_titles': len(unlicensed),
+            'unlicensed_installs': sum(item['uncovered_installs'] for item in unlicensed),
+        },
+        'licences': licence_rows,
+        'over_assigned': over_assigned,
+        'unlicensed': unlicensed,
+    }
+
+
+def _stored(organization_id):
+    return ComplianceReport.objects.filter(organization_id=organization_id).values_list(
+        'version', 'data', 'generated_at'
+    ).first()
+
+
+def compliance_report(organization_id, refresh=False):
+    """Stored build_report() younger than CACHE_TTL seconds; `refresh` recomputes it regardless."""
+    stored = _stored(organization_id)
+    if stored is None:
+        # The row exists before the build starts, so an invalidate() during it has a version to bump
+        ComplianceReport.objects.bulk_create([ComplianceReport(organization_id=organization_id)], ignore_conflicts=True)
+        stored = _stored(organization_id)
+    version, data, generated_at = stored
+    if not refresh and data is not None and generated_at >= timezone.now() - timedelta(seconds=CACHE_TTL):
+        return data
+    report = build_report(organization_id)
+    ComplianceReport.objects.filter(organization_id=organization_id, version=version).update(
+        data=report, generated_at=timezone.now()
+    )
+    return report
+
+
+def invalidate(organization_id):
+    """Clear an organization's stored report; rolled back with the write that triggered it."""
+    if organization_id:
+        ComplianceReport.objects.filter(organization_id=organization_id).update(version=F('version') + 1, data=None)
+
+
+def invalidate_all():
+    """Clear every stored report, e.g. after the inventory was rebuilt in bulk."""
+    ComplianceReport.objects.update(version=F('version') + 1, data=None)
+
+
+def _software_changed(sender, instance, **kwargs):
+    invalidate(instance.organization_id)
+
+
+def _assignment_changed(sender, instance, **kwargs):
+    invalidate(Software.all_objects.filter(pk=instance.software_id).values_list(
+        'organization_id', flat=True
+    ).first())
+
+
+def _machine_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not MACHINE_FIELDS.intersection(update_fields):
+        return
+    invalidate(instance.organization_id)
+
+
+def _cascade_changed(sender, pks, **kwargs):
+    if sender is SoftwareAssignment:
+        organizations = Software.all_objects.filter(software_assignments__in=pks).values_list('organization_id', flat=True)
+    else:
+        organizations = sender.all_objects.filter(pk__in=pks).values_list('organization_id', flat=True)
+    for organization_id in set(organizations):
+        invalidate(organization_id)
+
+
+def connect_signals():
+    for model in (Software, SoftwareAssignment, EndpointUser, Server):
+        label = model._meta.model_name
+        soft_delete_changed.connect(_cascade_changed, sender=model, dispatch_uid=f'compliance-{label}-cascade')
+    post_save.connect(_software_changed, sender=Software, dispatch_uid='compliance-software-save')
+    post_delete.connect(_software_changed, sender=Software, dispatch_uid='compliance-software-delete')
+    post_save.connect(_assignment_changed, sender=SoftwareAssignment, dispatch_uid='compliance-assignment-save')
+    post_delete.connect(_assignment_changed, sender=SoftwareAssignment, dispatch_uid='compliance-assignment-delete')
+    for model in (EndpointUser, Server):
+        label = model._meta.model_name
+        post_save.connect(_machine_changed, sender=model, dispatch_uid=f'compliance-{label}-save')
+        post_delete.connect(_machine_changed, sender=model, dispatch_uid=f'compliance-{label}-delete')
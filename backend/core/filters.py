@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+import django_filters
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from .models import RMMEndpoint, Documentation, SoftwareInstallation, IPAddressEntry
+from .search import full_text_filter, is_indexed, search_terms
+from .tags import parse_tags, tagged_any, tagged_all
+from .inventory import normalize_name, version_key
+from .ipam import parse_network, in_network
+
+
+class RMMEndpointFilter(django_filters.FilterSet):
+    """Filters for RMM endpoints; disk filters rely on RMMEndpointQuerySet.with_disk_usage()."""
+    disk_usage_min = django_filters.NumberFilter(field_name='disk_usage', lookup_expr='gte')
+    disk_usage_max = django_filters.NumberFilter(field_name='disk_usage', lookup_expr='lte')
+    disk_free_max = django_filters.NumberFilter(field_name='disk_free_gb', lookup_expr='lte')
+    offline_days = django_filters.NumberFilter(method='filter_offline_days')
+    operating_system = django_filters.CharFilter(lookup_expr='istartswith')
+
+    class Meta:
+        model = RMMEndpoint
+        fields = ['organization', 'location', 'status', 'device_type']
+
+    def filter_offline_days(self, queryset, name, value):
+        """Endpoints that are not online and were last seen at least `value` days ago."""
+        cutoff = timezone.now() - timedelta(days=float(value))
+        return queryset.filter(status__in=RMMEndpoint.INACTIVE_STATUSES, last_seen__lt=cutoff)
+
+
+class DocumentationFilter(django_filters.FilterSet):
+    """Documentation filters; `tags` matches any of the comma-separated tags, `tags_all` every one."""
+    tags = django_filters.CharFilter(method='filter_tags_any')
+    tags_all = django_filters.CharFilter(method='filter_tags_all')
+
+    class Meta:
+        model = Documentation
+        fields = ['organization', 'category', 'is_published']
+
+    def filter_tags_any(self, queryset, name, value):
+        names = parse_tags(value)
+        return tagged_any(queryset, names) if names else queryset
+
+    def filter_tags_all(self, queryset, name, value):
+        names = parse_tags(value)
+        return tagged_all(queryset, names) if names else queryset
+
+
+def _validate_network(value):
+    try:
+        parse_network(value)
+    except ValueError:
+        raise ValidationError('Enter a valid network in CIDR notation, e.g. 10.20.0.0/24.')
+
+
+class IPAddressEntryFilter(django_filters.FilterSet):
+    """Indexed addresses; `network` (CIDR) matches every address inside the subnet."""
+    network = django_filters.CharFilter(method='filter_network', validators=[_validate_network])
+
+    class Meta:
+        model = IPAddressEntry
+        fields = ['organization', 'location', 'object_type', 'version']
+
+    def filter_network(self, queryset, name, value):
+        return in_network(queryset, parse_network(value))
+
+
+class SoftwareInstallationFilter(django_filters.FilterSet):
+    """
+    Installations by software (`name` exact, `name_prefix`) and version range.
+
+    Version bounds compare numeric parts (`version_lt=120` matches 119.0.6045
+    but not 120.0); installations without a version never match a bound.
+    """
+    name = django_filters.CharFilter(method='filter_name')
+    name_prefix = django_filters.CharFilter(method='filter_name_prefix')
+    version_lt = django_filters.CharFilter(method='filter_version')
+    version_lte = django_filters.CharFilter(method='filter_version')
+    version_gt = django_filters.CharFilter(method='filter_version')
+    version_gte = django_filters.CharFilter(method='filter_version')
+
+    class Meta:
+        model = SoftwareInstallation
+        fields = ['catalog', 'organization', 'endpoint_user', 'server', 'version']
+
+    def filter_name(self, queryset, name, value):
+        return queryset.filter(catalog__normalized_name=normalize_name(value))
+
+    def filter_name_prefix(self, queryset, name, value):
+        return queryset.filter(catalog__normalized_name__startswith=normalize_name(value))
+
+    def filter_version(self, queryset, name, value):
+        key = version_key(value)
+        if not key:
+            return queryset.none()
+        lookup = name.rsplit('_', 1)[1]
+        return queryset.exclude(version_key='').filter(**{f'version_key__{lookup}': key})
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    `?search=` backed by the full-text index instead of ILIKE scans.
+
+    Place it after OrderingFilter: without an explicit `?ordering=` the
+    results are ordered by relevance.
+    """
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query or not is_indexed(queryset.model):
+            return queryset
+        terms = search_terms(query)
+        if not terms:
+            # Punctuation only: nothing to match, and nothing to rank by
+            return queryset.none()
+        queryset = full_text_filter(queryset, query, terms)
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+        return queryset
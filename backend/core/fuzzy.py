@@ -0,0 +1,283 @@
+"""
+Fuzzy (trigram similarity) search on device names, hostnames, serials and contact names.
+
+PostgreSQL uses pg_trgm: GIN ``gin_trgm_ops`` indexes on each field and the
+``%`` operator, with the threshold set per transaction. Other databases use a
+pure-Python fallback: trigrams are stored in the fuzzy_trigrams table (kept
+current by signals), candidates are found through its trigram index, and the
+similarity is computed in Python the same way pg_trgm does.
+"""
+import math
+import re
+
+from decouple import config
+from django.db import connection, transaction
+from django.db.models import BooleanField, Count, FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_save, post_delete
+
+from .models import Contact, NetworkDevice, EndpointUser, Server, Peripheral, FuzzyTrigram
+from .soft_delete import chunked, soft_delete_changed
+
+DEFAULT_THRESHOLD = config('FUZZY_SEARCH_THRESHOLD', default=0.3, cast=float)
+DEFAULT_LIMIT = 20
+# Upper bound on fallback candidates re-scored in Python
+CANDIDATE_LIMIT = 1000
+REBUILD_BATCH_SIZE = 5000
+
+# object_type -> model, label columns and fuzzy fields (each a list of columns
+# joined with a space, e.g. a contact's full name)
+FUZZY_MODELS = {
+    'network_device': {
+        'model': NetworkDevice, 'label': ['name'],
+        'fields': {'name': ['name'], 'serial_number': ['serial_number']},
+    },
+    'endpoint_user': {
+        'model': EndpointUser, 'label': ['name'],
+        'fields': {'name': ['name'], 'hostname': ['hostname'], 'serial_number': ['serial_number']},
+    },
+    'server': {
+        'model': Server, 'label': ['name'],
+        'fields': {'name': ['name'], 'hostname': ['hostname'], 'serial_number': ['serial_number']},
+    },
+    'peripheral': {
+        'model': Peripheral, 'label': ['name'],
+        'fields': {'name': ['name'], 'serial_number': ['serial_number']},
+    },
+    'contact': {
+        'model': Contact, 'label': ['first_name', 'last_name'],
+        'fields': {'name': ['first_name', 'last_name']},
+    },
+}
+
+OBJECT_TYPES = {spec['model']: object_type for object_type, spec in FUZZY_MODELS.items()}
+
+_WORD_RE = re.compile(r'[^\W_]+', re.UNICODE)
+
+
+def trigrams(text):
+    """pg_trgm-compatible trigram set: lower-cased words padded with two spaces before and one after."""
+    result = set()
+    for word in _WORD_RE.findall((text or '').lower()):
+        padded = f'  {word} '
+        for i in range(len(padded) - 2):
+            result.add(padded[i:i + 3])
+    return result
+
+
+def similarity(a, b):
+    """pg_trgm similarity: shared trigrams over the union of both trigram sets."""
+    a, b = trigrams(a), trigrams(b)
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def _value(obj, columns):
+    return ' '.join(str(getattr(obj, column) or '') for column in columns).strip()
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL (pg_trgm)
+# ---------------------------------------------------------------------------
+
+def field_sql(columns):
+    """SQL expression for a fuzzy field; shared by the indexes and the queries."""
+    qn = connection.ops.quote_name
+    return " || ' ' || ".join(qn(column) for column in columns)
+
+
+def trigram_index_name(table, field):
+    return f'{table}_{field}_trgm_idx'
+
+
+def trigram_index_sql(table, field, columns):
+    qn = connection.ops.quote_name
+    return (
+        f'CREATE INDEX IF NOT EXISTS {qn(trigram_index_name(table, field))} ON {qn(table)} '
+        f'USING gin (({field_sql(columns)}) gin_trgm_ops) WHERE deleted_at IS NULL'
+    )
+
+
+def trigram_index_drop_sql(table, field):
+    return f'DROP INDEX IF EXISTS {connection.ops.quote_name(trigram_index_name(table, field))}'
+
+
+def _postgres_search(object_type, query, queryset, threshold, limit):
+    spec = FUZZY_MODELS[object_type]
+    fields = spec['fields']
+    match = ' OR '.join(f'({field_sql(columns)}) %% %s' for columns in fields.values())
+    scores = {
+        f'_sim_{field}': RawSQL(f'similarity({field_sql(columns)}, %s)', [query], output_field=FloatField())
+        for field, columns in fields.items()
+    }
+    queryset = queryset.filter(
+        RawSQL(f'({match})', [query] * len(fields), output_field=BooleanField())
+    ).annotate(**scores)
+    if len(scores) > 1:
+        queryset = queryset.annotate(_similarity=Greatest(*scores))
+    else:
+        queryset = queryset.annotate(_similarity=next(iter(scores.values())))
+    hits = []
+    for obj in queryset.order_by('-_similarity')[:limit]:
+        field = max(fields, key=lambda name: getattr(obj, f'_sim_{name}'))
+        hits.append(_hit(object_type, obj, field, getattr(obj, f'_sim_{field}')))
+    return hits
+
+
+# ---------------------------------------------------------------------------
+# Fallback (fuzzy_trigrams table)
+# ---------------------------------------------------------------------------
+
+def _postings(object_type, obj):
+    return [
+        FuzzyTrigram(object_type=object_type, object_id=obj.pk, field=field, trigram=trigram)
+        for field, columns in FUZZY_MODELS[object_type]['fields'].items()
+        for trigram in trigrams(_value(obj, columns))
+    ]
+
+
+def _fallback_search(object_type, query, queryset, threshold, limit):
+    spec = FUZZY_MODELS[object_type]
+    query_trigrams = trigrams(query)
+    if not query_trigrams:
+        return []
+    # similarity <= shared / len(query_trigrams), so fewer shared trigrams can never pass
+    min_shared = max(1, math.ceil(threshold * len(query_trigrams)))
+    candidates = FuzzyTrigram.objects.filter(
+        trigram__in=query_trigrams, object_type=object_type
+    ).values('object_id').annotate(shared=Count('id')).filter(
+        shared__gte=min_shared
+    ).order_by('-shared').values_list('object_id', flat=True)[:CANDIDATE_LIMIT]
+
+    columns = {column for cols in spec['fields'].values() for column in cols}
+    hits = []
+    for obj in queryset.filter(pk__in=list(candidates)).only('organization', *columns, *spec['label']).order_by():
+        best_field, best_score = None, 0.0
+        for field, columns in spec['fields'].items():
+            score = similarity(_value(obj, columns), query)
+            if score > best_score:
+                best_field, best_score = field, score
+        if best_field is not None and best_score >= threshold:
+            hits.append(_hit(object_type, obj, best_field, best_score))
+    hits.sort(key=lambda hit: -hit['similarity'])
+    return hits[:limit]
+
+
+def index_object(sender, instance, update_fields=None, **kwargs):
+    object_type = OBJECT_TYPES.get(sender)
+    if object_type is None or connection.vendor == 'postgresql':
+        return
+    spec = FUZZY_MODELS[object_type]
+    columns = {'deleted_at', *(column for cols in spec['fields'].values() for column in cols)}
+    if update_fields and not columns.intersection(update_fields):
+        return
+    with transaction.atomic():
+        FuzzyTrigram.objects.filter(object_type=object_type, object_id=instance.pk).delete()
+        if instance.deleted_at is None:
+            FuzzyTrigram.objects.bulk_create(_postings(object_type, instance))
+
+
+def unindex_object(sender, instance, **kwargs):
+    object_type = OBJECT_TYPES.get(sender)
+    if object_type is not None and connection.vendor != 'postgresql':
+        FuzzyTrigram.objects.filter(object_type=object_type, object_id=instance.pk).delete()
+
+
+def reindex_objects(sender, pks, deleted, **kwargs):
+    object_type = OBJECT_TYPES.get(sender)
+    if object_type is None or connection.vendor == 'postgresql':
+        return
+    for chunk in chunked(pks):
+        with transaction.atomic():
+            FuzzyTrigram.objects.filter(object_type=object_type, object_id__in=chunk).delete()
+            if not deleted:
+                _insert_postings(list(_posting_rows(object_type, sender.objects.filter(pk__in=chunk))))
+
+
+def connect_signals():
+    for object_type, spec in FUZZY_MODELS.items():
+        post_save.connect(index_object, sender=spec['model'], dispatch_uid=f'fuzzy-index-save-{object_type}')
+        post_delete.connect(unindex_object, sender=spec['model'], dispatch_uid=f'fuzzy-index-delete-{object_type}')
+        soft_delete_changed.connect(reindex_objects, sender=spec['model'], dispatch_uid=f'fuzzy-index-cascade-{object_type}')
+
+
+def _insert_postings(rows):
+    """Insert (object_type, object_id, field, trigram) tuples without building model instances."""
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {qn(FuzzyTrigram._meta.db_table)} (object_type, object_id, field, trigram) '
+            f'VALUES (%s, %s, %s, %s)',
+            rows,
+        )
+
+
+def _posting_rows(object_type, queryset):
+    """(object_type, object_id, field, trigram) rows for `queryset`, read without building model instances."""
+    spec = FUZZY_MODELS[object_type]
+    object_id_field = FuzzyTrigram._meta.get_field('object_id')
+    columns = sorted({column for cols in spec['fields'].values() for column in cols})
+    for pk, *values in queryset.order_by().values_list('pk', *columns).iterator(chunk_size=1000):
+        row = dict(zip(columns, values))
+        object_id = object_id_field.get_db_prep_value(pk, connection)
+        for field, field_columns in spec['fields'].items():
+            value = ' '.join(row[column] or '' for column in field_columns)
+            yield from ((object_type, object_id, field, trigram) for trigram in trigrams(value))
+
+
+def rebuild_index(batch_size=REBUILD_BATCH_SIZE):
+    """Rebuild the fallback trigram table. Returns {object_type: objects indexed}; no-op on PostgreSQL."""
+    if connection.vendor == 'postgresql':
+        return {}
+    counts = {}
+    for object_type, spec in FUZZY_MODELS.items():
+        with transaction.atomic():
+            FuzzyTrigram.objects.filter(object_type=object_type).delete()
+            rows = []
+            for row in _posting_rows(object_type, spec['model'].objects.all()):
+                rows.append(row)
+                if len(rows) >= batch_size:
+                    _insert_postings(rows)
+                    rows = []
+            if rows:
+                _insert_postings(rows)
+        counts[object_type] = spec['model'].objects.count()
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+def _hit(object_type, obj, field, score):
+    spec = FUZZY_MODELS[object_type]
+    return {
+        'type': object_type,
+        'id': obj.pk,
+        'label': _value(obj, spec['label']),
+        'organization': obj.organization_id,
+        'field': field,
+        'value': _value(obj, spec['fields'][field]),
+        'similarity': round(score, 4),
+    }
+
+
+def fuzzy_search(query, object_types=None, organization_id=None, threshold=DEFAULT_THRESHOLD, limit=DEFAULT_LIMIT):
+    """Objects whose fuzzy fields are at least `threshold` similar to `query`, most similar first."""
+    query = (query or '').strip()
+    if not query:
+        return []
+    hits = []
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)", [str(threshold)])
+        for object_type in object_types or FUZZY_MODELS:
+            queryset = FUZZY_MODELS[object_type]['model'].objects.all()
+            if organization_id:
+                queryset = queryset.filter(organization_id=organization_id)
+            search = _postgres_search if connection.vendor == 'postgresql' else _fallback_search
+            hits.extend(search(object_type, query, queryset, threshold, limit))
+    hits.sort(key=lambda hit: -hit['similarity'])
+    return hits[:limit]
@@ -0,0 +1,315 @@
+import hashlib
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import timedelta
+
+from decouple import config
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.bulk import bulk_update_values
+from core.compliance import invalidate as invalidate_compliance
+from core.integrations.tactical_rmm import TacticalRMMClient, RateLimiter
+from core.models import (
+    RMMEndpoint, RMMRawPayload, RMMSource, RMMSyncRun, RMMSoftware, RMMPatch, RMMDisk
+)
+
+logger = logging.getLogger(__name__)
+
+# Fields copied from parsed agent data onto RMMEndpoint
+ENDPOINT_FIELDS = [
+    'name', 'operating_system', 'cpu_model', 'cpu_cores', 'ram_gb',
+    'disk_total_gb', 'disk_free_gb', 'serial_number', 'mac_address',
+    'logged_in_user', 'status', 'last_seen',
+]
+
+# Lease length for the fallback lock on databases without advisory locks
+LOCK_LEASE = timedelta(hours=1)
+# Sync run history older than this is pruned after each run
+RUN_HISTORY_RETENTION = timedelta(days=30)
+
+# Per-agent detail stage: concurrent requests and requests per second
+DETAIL_WORKERS = config('TACTICAL_RMM_DETAIL_WORKERS', default=8, cast=int)
+DETAIL_RATE_LIMIT = config('TACTICAL_RMM_DETAIL_RATE_LIMIT', default=10, cast=float)
+INVENTORY_BATCH_SIZE = 1000
+
+
+def _lock_key(name):
+    """Map a lock name to a signed 64-bit advisory lock key."""
+    digest = hashlib.blake2b(f'rmm-sync:{name}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+@contextmanager
+def sync_lock(name, source=None):
+    """
+    Hold an exclusive sync lock, yielding whether it was acquired.
+
+    PostgreSQL uses a session-level advisory lock keyed on `name`. Other
+    databases fall back to a lease on `source.locked_until` claimed with a
+    conditional UPDATE; without a source the sync's own transaction is relied on.
+    """
+    if connection.vendor == 'postgresql':
+        key = _lock_key(name)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_try_advisory_lock(%s)', [key])
+            acquired = cursor.fetchone()[0]
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_unlock(%s)', [key])
+        return
+
+    if source is None:
+        yield True
+        return
+
+    now = timezone.now()
+    acquired = RMMSource.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now), pk=source.pk
+    ).update(locked_until=now + LOCK_LEASE) == 1
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            RMMSource.objects.filter(pk=source.pk).update(locked_until=None)
+
+
+def sync_agents(organization, agents, source=None, started_at=None):
+    """
+    Upsert parsed agents into RMMEndpoint and mark missing agents as stale.
+
+    Agents not returned by this sync (same organization and source) keep their
+    last_sync from a previous run, so one UPDATE on last_sync < started_at marks
+    them stale. Agents whose endpoint is in the trash are skipped: the user
+    deleted it, and restoring it from the trash brings it back into the sync.
+    Returns (created, updated, stale) counts.
+    """
+    started_at = started_at or timezone.now()
+    created = 0
+    updated = 0
+
+    with transaction.atomic():
+        agent_ids = [agent_data['agent_id'] for agent_data in agents]
+        previous = {}
+        trashed = set()
+        for start in range(0, len(agent_ids), INVENTORY_BATCH_SIZE):
+            for agent_id, raw_payload_id, organization_id, deleted_at in RMMEndpoint.all_objects.filter(
+                agent_id__in=agent_ids[start:start + INVENTORY_BATCH_SIZE]
+            ).values_list('agent_id', 'raw_payload_id', 'organization_id', 'deleted_at'):
+                previous[agent_id] = (raw_payload_id, organization_id)
+                if deleted_at is not None:
+                    trashed.add(agent_id)
+        released = set()
+        # Organizations whose RMM-only installs this sync can change
+        affected = {organization.pk}
+        for agent_data in agents:
+            if agent_data['agent_id'] in trashed:
+                continue
+            defaults = {field: agent_data[field] for field in ENDPOINT_FIELDS}
+            defaults['organization'] = organization
+            defaults['source'] = source
+            defaults['raw_payload_id'] = RMMRawPayload.objects.store(agent_data['raw_rmm_data'])
+            old_payload, old_organization = previous.get(agent_data['agent_id'], (None, None))
+            if old_payload not in (None, defaults['raw_payload_id']):
+                released.add(old_payload)
+            if old_organization:
+                affected.add(old_organization)
+            _, created_flag = RMMEndpoint.objects.update_or_create(
+                agent_id=agent_data['agent_id'],
+                defaults=defaults,
+            )
+            if created_flag:
+                created += 1
+            else:
+                updated += 1
+
+        if trashed:
+            logger.info(f"Skipped {len(trashed)} agents whose endpoints are in the trash")
+
+        stale = RMMEndpoint.objects.filter(
+            organization=organization, source=source, last_sync__lt=started_at
+        ).exclude(status='stale').update(status='stale')
+        if created or stale or len(affected) > 1:
+            for organization_id in affected:
+                invalidate_compliance(organization_id)
+
+        # Drop only payloads this run superseded and nothing references any
+        # more; a global orphan sweep could delete a payload a concurrent sync
+        # of another source has stored but not yet linked
+        released = list(released)
+        for start in range(0, len(released), INVENTORY_BATCH_SIZE):
+            RMMRawPayload.objects.orphaned().filter(
+                content_hash__in=released[start:start + INVENTORY_BATCH_SIZE]
+            ).delete()
+    return created, updated, stale
+
+
+def fetch_agent_details(client, agent_ids, workers=DETAIL_WORKERS):
+    """
+    Fetch per-agent details on a bounded thread pool.
+
+    Workers only do HTTP; the caller writes results. Returns
+    ({agent_id: details}, {agent_id: error message}).
+    """
+    results = {}
+    errors = {}
+    if not agent_ids:
+        return results, errors
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(client.get_agent_details, agent_id): agent_id for agent_id in agent_ids}
+        for future in as_completed(futures):
+            agent_id = futures[future]
+            try:
+                results[agent_id] = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to fetch details for agent {agent_id}: {e}")
+                errors[agent_id] = str(e)
+    return results, errors
+
+
+def store_agent_details(details_by_endpoint, hashes_by_endpoint):
+    """
+    Replace software, patch and disk rows for the given endpoints in bulk.
+
+    `details_by_endpoint` maps endpoint pk to parsed details and
+    `hashes_by_endpoint` maps endpoint pk to the summary hash they were fetched for.
+    """
+    now = timezone.now()
+    endpoint_ids = list(details_by_endpoint)
+    with transaction.atomic():
+        for start in range(0, len(endpoint_ids), INVENTORY_BATCH_SIZE):
+            batch = endpoint_ids[start:start + INVENTORY_BATCH_SIZE]
+            RMMSoftware.objects.filter(endpoint_id__in=batch).delete()
+            RMMPatch.objects.filter(endpoint_id__in=batch).delete()
+            RMMDisk.objects.filter(endpoint_id__in=batch).delete()
+
+        software, patches, disks = [], [], []
+        for endpoint_id, details in details_by_endpoint.items():
+            software.extend(RMMSoftware(endpoint_id=endpoint_id, **item) for item in details['software'])
+            patches.extend(RMMPatch(endpoint_id=endpoint_id, **item) for item in details['patches'])
+            disks.extend(RMMDisk(endpoint_id=endpoint_id, **item) for item in details['disks'])
+        RMMSoftware.objects.bulk_create(software, batch_size=INVENTORY_BATCH_SIZE)
+        RMMPatch.objects.bulk_create(patches, batch_size=INVENTORY_BATCH_SIZE)
+        RMMDisk.objects.bulk_create(disks, batch_size=INVENTORY_BATCH_SIZE)
+
+        bulk_update_values(
+            RMMEndpoint,
+            {
+                endpoint_id: {'inventory_hash': hashes_by_endpoint[endpoint_id], 'inventory_synced_at': now}
+                for endpoint_id in endpoint_ids
+            },
+            ['inventory_hash', 'inventory_synced_at'],
+            batch_size=INVENTORY_BATCH_SIZE,
+        )
+
+
+def sync_agent_details(organization, agents, client, source=None, incremental=True, workers=DETAIL_WORKERS):
+    """
+    Fetch and store per-agent inventory for synced agents.
+
+    In incremental mode only agents whose summary hash differs from the one
+    recorded at their last detail fetch are requested. Returns (fetched, failed).
+    """
+    endpoints = {
+        agent_id: (pk, inventory_hash)
+        for agent_id, pk, inventory_hash in RMMEndpoint.objects.filter(
+            organization=organization, source=source
+        ).values_list('agent_id', 'id', 'inventory_hash')
+    }
+
+    wanted = {}
+    for agent_data in agents:
+        endpoint = endpoints.get(agent_data['agent_id'])
+        if endpoint is None:
+            continue
+        if incremental and endpoint[1] == agent_data['summary_hash']:
+            continue
+        wanted[agent_data['agent_id']] = (endpoint[0], agent_data['summary_hash'])
+
+    results, errors = fetch_agent_details(client, list(wanted), workers=workers)
+    if results:
+        store_agent_details(
+            {wanted[agent_id][0]: details for agent_id, details in results.items()},
+            {wanted[agent_id][0]: wanted[agent_id][1] for agent_id in results},
+        )
+        invalidate_compliance(organization.pk)
+    return len(results), len(errors)
+
+
+def schedule_next(source, now=None, jitter=0.1):
+    """Return the next sync time: the source interval plus up to `jitter` of it at random."""
+    now = now or timezone.now()
+    interval = source.sync_interval_minutes * 60
+    return now + timedelta(seconds=interval + random.uniform(0, interval * jitter))
+
+
+def run_source_sync(source, jitter=0.1, details=None, incremental=True):
+    """
+    Sync one RMMSource under its lock and record the run.
+
+    `details` overrides the source's fetch_details setting. Returns the
+    RMMSyncRun. If another process holds the lock the run is recorded as
+    skipped and nothing is written to endpoints.
+    """
+    run = RMMSyncRun.objects.create(source=source, organization_id=source.organization_id)
+    started = time.monotonic()
+    fetch_details = source.fetch_details if details is None else details
+
+    with sync_lock(f'source:{source.pk}', source=source) as acquired:
+        if not acquired:
+            run.status = 'skipped'
+            run.error = 'Another sync of this source is already running.'
+        else:
+            client = TacticalRMMClient(
+                source.api_key, source.base_url, rate_limiter=RateLimiter(DETAIL_RATE_LIMIT)
+            )
+            try:
+                result = client.sync_all_agents()
+                if not result.get('success'):
+                    raise RuntimeError(result.get('error') or 'Failed to fetch agents')
+                agents = result['agents']
+                run.agents_total = len(agents)
+                run.created_count, run.updated_count, run.stale_count = sync_agents(
+                    source.organization, agents, source=source, started_at=run.started_at
+                )
+                if fetch_details:
+                    run.details_fetched, run.details_failed = sync_agent_details(
+                        source.organization, agents, client, source=source, incremental=incremental
+                    )
+                run.status = 'success'
+            except Exception as e:
+                logger.exception(f"RMM sync failed for source {source.pk}")
+                run.status = 'failed'
+                run.error = str(e)
+
+    now = timezone.now()
+    run.finished_at = now
+    run.duration_seconds = round(time.monotonic() - started, 3)
+    run.save()
+
+    source_updates = {'last_sync_status': run.status, 'next_sync_at': schedule_next(source, now, jitter)}
+    if run.status != 'skipped':
+        source_updates['last_sync_at'] = now
+        source_updates['last_error'] = run.error
+        source_updates['consecutive_failures'] = 0 if run.status == 'success' else source.consecutive_failures + 1
+    RMMSource.objects.filter(pk=source.pk).update(**source_updates)
+    for field, value in source_updates.items():
+        setattr(source, field, value)
+
+    RMMSyncRun.objects.filter(source=source, started_at__lt=now - RUN_HISTORY_RETENTION).delete()
+    return run
+
+
+def due_sources(now=None):
+    """Active sources whose next sync time has passed (or that never ran)."""
+    now = now or timezone.now()
+    return RMMSource.objects.filter(is_active=True).filter(
+        Q(next_sync_at__isnull=True) | Q(next_sync_at__lte=now)
+    ).select_related('organization').order_by('next_sync_at')
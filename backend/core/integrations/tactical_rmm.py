@@ -1,34 +1,160 @@
 import requests
+import hashlib
+import json
 import logging
-from typing import Dict, List, Any
+import re
+import threading
+import time
+from typing import Dict, List, Any, Optional
 from django.conf import settings
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+# Summary keys that change on every check-in; excluded from the summary hash so
+# incremental detail fetches only run when the agent's inventory may have changed
+VOLATILE_SUMMARY_KEYS = {
+    'last_seen', 'status', 'logged_in_user', 'checks', 'pending_actions_count',
+    'italic', 'boot_time', 'last_logged_in_user',
+}
+
+_SIZE_RE = re.compile(r'([\d.]+)\s*([KMGTP]?B)?', re.IGNORECASE)
+_SIZE_UNITS = {'B': 1 / 1024**3, 'KB': 1 / 1024**2, 'MB': 1 / 1024, 'GB': 1, 'TB': 1024, 'PB': 1024**2}
+
+
+def summary_hash(agent: Dict[str, Any]) -> str:
+    """Hash of the agent summary without volatile keys"""
+    stable = {key: value for key, value in agent.items() if key not in VOLATILE_SUMMARY_KEYS}
+    raw = json.dumps(stable, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def parse_size_gb(value) -> float:
+    """Parse a disk size (bytes as a number, or a string like '237.5 GB') into GB"""
+    if isinstance(value, (int, float)):
+        return round(value / (1024**3), 2) if value > 0 else 0
+    match = _SIZE_RE.search(str(value or ''))
+    if not match:
+        return 0
+    unit = (match.group(2) or 'B').upper()
+    return round(float(match.group(1)) * _SIZE_UNITS.get(unit, 1), 2)
+
+
+class RateLimiter:
+    """Thread-safe limiter allowing at most `rate` calls per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 class TacticalRMMClient:
     """Client for Tactical RMM API integration"""
 
-    def __init__(self, api_key: str, base_url: str):
+    def __init__(self, api_key: str, base_url: str, rate_limiter: Optional[RateLimiter] = None):
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.headers = {
             "Content-Type": "application/json",
             "X-API-Key": api_key,
         }
+        self.rate_limiter = rate_limiter
+
+    def _get(self, path: str) -> Any:
+        """GET a JSON resource, honouring the rate limiter and raising on errors"""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        response = requests.get(f"{self.base_url}{path}", headers=self.headers, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_agents(self) -> List[Dict[str, Any]]:
+        """Fetch all agents from Tactical RMM, raising on request errors"""
+        return self._get("/agents/")
 
     def get_all_agents(self) -> List[Dict[str, Any]]:
         """Fetch all agents from Tactical RMM"""
         try:
-            url = f"{self.base_url}/agents/"
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            return response.json()
+            return self.fetch_agents()
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch agents from Tactical RMM: {e}")
             return []
 
+    def get_agent_details(self, agent_id: str) -> Dict[str, Any]:
+        """Fetch software, patches and disks for one agent, raising on request errors"""
+        detail = self._get(f"/agents/{agent_id}/")
+        software = self._get(f"/software/{agent_id}/")
+        patches = self._get(f"/winupdate/{agent_id}/")
+        return {
+            'software': self.parse_software(software),
+            'patches': self.parse_patches(patches),
+            'disks': self.parse_disks(detail.get('disks') if isinstance(detail, dict) else None),
+        }
+
+    def parse_software(self, data: Any) -> List[Dict[str, Any]]:
+        """Parse the installed software response"""
+        items = data.get('software', []) if isinstance(data, dict) else data or []
+        parsed = []
+        for item in items:
+            name = (item.get('name') or '').strip()
+            if not name:
+                continue
+            parsed.append({
+                'name': name[:255],
+                'version': (item.get('version') or '')[:100],
+                'publisher': (item.get('publisher') or '')[:255],
+                'install_date': str(item.get('install_date') or '')[:50],
+            })
+        return parsed
+
+    def parse_patches(self, data: Any) -> List[Dict[str, Any]]:
+        """Parse the Windows update response"""
+        items = data.get('winupdates', []) if isinstance(data, dict) else data or []
+        parsed = []
+        for item in items:
+            date_installed = None
+            if item.get('date_installed'):
+                try:
+                    date_installed = datetime.fromisoformat(str(item['date_installed']).replace('Z', '+00:00'))
+                except ValueError:
+                    pass
+            parsed.append({
+                'kb': (item.get('kb') or '')[:50],
+                'title': (item.get('title') or item.get('kb') or 'Unknown update')[:500],
+                'severity': (item.get('severity') or '')[:50],
+                'installed': bool(item.get('installed')),
+                'date_installed': date_installed,
+            })
+        return parsed
+
+    def parse_disks(self, disks: Any) -> List[Dict[str, Any]]:
+        """Parse the disk list from the agent detail (list or index-keyed dict)"""
+        if isinstance(disks, dict):
+            disks = list(disks.values())
+        parsed = []
+        for disk in disks or []:
+            if not isinstance(disk, dict):
+                continue
+            parsed.append({
+                'device': str(disk.get('device') or disk.get('name') or '')[:100],
+                'fstype': str(disk.get('fstype') or '')[:50],
+                'total_gb': parse_size_gb(disk.get('total', disk.get('size', 0))),
+                'free_gb': parse_size_gb(disk.get('free', 0)),
+            })
+        return parsed
+
     def parse_agent_data(self, agent: Dict[str, Any]) -> Dict[str, Any]:
         """Parse Tactical RMM agent data into TechVault format"""
         try:
@@ -69,10 +195,12 @@ class TacticalRMMClient:
                 'disk_total_gb': round(disk_total_gb, 2),
                 'disk_free_gb': round(disk_free_gb, 2),
                 'serial_number': agent.get('serial_number', ''),
+                'mac_address': agent.get('mac_address') or '',
                 'logged_in_user': agent.get('logged_in_user', ''),
                 'last_seen': last_seen,
                 'status': agent.get('status', 'unknown'),
                 'raw_rmm_data': agent,
+                'summary_hash': summary_hash(agent),
             }
         except Exception as e:
             logger.error(f"Error parsing agent data: {e}")
@@ -80,9 +208,18 @@ class TacticalRMMClient:
 
     def sync_all_agents(self) -> Dict[str, Any]:
         """Fetch and parse all agents"""
-        agents = self.get_all_agents()
-        parsed_agents = []
+        try:
+            agents = self.fetch_agents()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Failed to fetch agents from Tactical RMM: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'total_agents': 0,
+                'agents': [],
+            }
 
+        parsed_agents = []
         for agent in agents:
             if isinstance(agent, dict):
                 parsed = self.parse_agent_data(agent)
@@ -94,4 +231,3 @@ class TacticalRMMClient:
             'total_agents': len(parsed_agents),
             'agents': parsed_agents,
         }
-    
\ No newline at end of file
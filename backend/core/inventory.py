@@ -0,0 +1,159 @@
+"""
+Structured software inventory for documented endpoints and servers.
+
+EndpointUser.software_installed and Server.software_installed remain the
+free-text fields the forms edit. They are parsed into SoftwareCatalogEntry
+titles and SoftwareInstallation rows on every save (and in bulk by the
+backfill_software_inventory command), so "where is X installed" and "what
+runs on this machine" are indexed lookups instead of text scans.
+"""
+import re
+
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from .models import EndpointUser, Server, SoftwareCatalogEntry, SoftwareInstallation
+from .soft_delete import chunked, soft_delete_changed
+
+# Machine models and the SoftwareInstallation FK that points at them
+MACHINE_MODELS = {
+    EndpointUser: 'endpoint_user',
+    Server: 'server',
+}
+
+BATCH_SIZE = 1000
+VERSION_PARTS = 6
+
+_ITEM_SPLIT_RE = re.compile(r'[,;\n]+')
+# Trailing version: "Chrome 119.0.6045", "Notepad++ v8.5", "Office (v2021)". A bare
+# number without a dot is part of the name ("Microsoft Office 365", "Windows 11")
+_VERSION_RE = re.compile(
+    r'^(?P<name>.*?\S)[\s(]+(?P<prefix>v?)(?P<version>\d+(?:[.\-_]\w+)*)\)?$', re.IGNORECASE
+)
+_DIGITS_RE = re.compile(r'\d+')
+
+
+def normalize_name(name):
+    return ' '.join(name.lower().split())[:255]
+
+
+def version_key(version):
+    """
+    Zero-padded numeric parts, always VERSION_PARTS of them, so keys compare
+    as strings ('119.0.6045' -> '00000119.00000000.00006045.00000000...');
+    '' without digits. 120 and 120.0 get the same key.
+    """
+    parts = _DIGITS_RE.findall(version or '')[:VERSION_PARTS]
+    if not parts:
+        return ''
+    parts += ['0'] * (VERSION_PARTS - len(parts))
+    return '.'.join(f'{min(int(part), 99999999):08d}' for part in parts)
+
+
+def parse_software(text):
+    """[(display_name, version)] from comma, semicolon or newline separated text, de-duplicated by name."""
+    items = {}
+    for raw in _ITEM_SPLIT_RE.split(text or ''):
+        item = ' '.join(raw.split())
+        if not item:
+            continue
+        match = _VERSION_RE.match(item)
+        if match and not match.group('prefix') and '.' not in match.group('version'):
+            match = None
+        name, version = (match.group('name'), match.group('version')) if match else (item, '')
+        name = name.strip(' -')[:255]
+        if name:
+            items.setdefault(normalize_name(name), (name, version[:100]))
+    return list(items.values())
+
+
+def get_catalog_ids(names):
+    """{normalized_name: catalog id} for display names, creating missing titles in bulk."""
+    wanted = {normalize_name(name): name for name in names}
+    if not wanted:
+        return {}
+    SoftwareCatalogEntry.objects.bulk_create(
+        [SoftwareCatalogEntry(name=name, normalized_name=key) for key, name in wanted.items()],
+        batch_size=BATCH_SIZE, ignore_conflicts=True,
+    )
+    ids = {}
+    keys = list(wanted)
+    for start in range(0, len(keys), BATCH_SIZE):
+        ids.update(SoftwareCatalogEntry.objects.filter(
+            normalized_name__in=keys[start:start + BATCH_SIZE]
+        ).values_list('normalized_name', 'id'))
+    return ids
+
+
+def sync_machines(model, machines):
+    """
+    Replace the installations of `machines` (instances of one machine model) from their text.
+
+    Soft-deleted machines are left without installations. Returns the number
+    of installation rows written.
+    """
+    link_field = MACHINE_MODELS[model]
+    parsed = {
+        machine.pk: (machine, [] if machine.deleted_at else parse_software(machine.software_installed))
+        for machine in machines
+    }
+    catalog_ids = get_catalog_ids([name for _, items in parsed.values() for name, _ in items])
+    installations = [
+        SoftwareInstallation(
+            catalog_id=catalog_ids[normalize_name(name)],
+            organization_id=machine.organization_id,
+            version=version,
+            version_key=version_key(version),
+            **{f'{link_field}_id': machine.pk},
+        )
+        for machine, items in parsed.values()
+        for name, version in items
+    ]
+    with transaction.atomic():
+        SoftwareInstallation.objects.filter(**{f'{link_field}_id__in': list(parsed)}).delete()
+        SoftwareInstallation.objects.bulk_create(installations, batch_size=BATCH_SIZE)
+    return len(installations)
+
+
+def sync_machine_software(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and not {'software_installed', 'organization', 'deleted_at'}.intersection(update_fields):
+        return
+    if created and not instance.software_installed:
+        return
+    sync_machines(sender, [instance])
+
+
+def resync_machines(sender, pks, deleted, **kwargs):
+    for chunk in chunked(pks, BATCH_SIZE):
+        if deleted:
+            SoftwareInstallation.objects.filter(**{f'{MACHINE_MODELS[sender]}_id__in': chunk}).delete()
+            continue
+        sync_machines(sender, list(sender.all_objects.filter(pk__in=chunk).only(
+            'id', 'organization_id', 'software_installed', 'deleted_at'
+        )))
+
+
+def connect_signals():
+    for model, link_field in MACHINE_MODELS.items():
+        post_save.connect(sync_machine_software, sender=model, dispatch_uid=f'software-inventory-{link_field}')
+        soft_delete_changed.connect(resync_machines, sender=model, dispatch_uid=f'software-inventory-cascade-{link_field}')
+
+
+def backfill(organization_id=None, batch_size=BATCH_SIZE):
+    """Rebuild installations for every machine (optionally one organization). Returns {link_field: rows}."""
+    counts = {}
+    for model, link_field in MACHINE_MODELS.items():
+        queryset = model.all_objects.order_by('pk').only('id', 'organization_id', 'software_installed', 'deleted_at')
+        if organization_id:
+            queryset = queryset.filter(organization_id=organization_id)
+        written = 0
+        batch = []
+        for machine in queryset.iterator(chunk_size=batch_size):
+            batch.append(machine)
+            if len(batch) >= batch_size:
+                written += sync_machines(model, batch)
+                batch = []
+        if batch:
+            written += sync_machines(model, batch)
+        counts[link_field] = written
+    return counts
@@ -0,0 +1,284 @@
+"""
+IP address management.
+
+The ip_address fields on network devices, endpoints, servers and peripherals
+stay free text. On every save the valid addresses in them are written to the
+ip_addresses table, with the address as an inet column on PostgreSQL and as a
+fixed-width hex key on every database. IPv4 addresses are keyed inside
+::ffff:0:0/96, so one key space sorts both families and a subnet is a
+contiguous key range:
+
+- containment is a range scan on (organization, address_key), or the GiST
+  inet index with ``<<=`` on PostgreSQL;
+- subnet utilization counts each subnet's key range;
+- conflicts group on (organization, address_key).
+
+Subnet rows get their start and end keys from their CIDR on save.
+"""
+import ipaddress
+import re
+
+from django.db import connection, transaction
+from django.db.models import BooleanField, Count, IntegerField, OuterRef, Subquery
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, post_delete, pre_save
+
+from .models import NetworkDevice, EndpointUser, Server, Peripheral, Subnet, IPAddressEntry
+from .soft_delete import chunked, soft_delete_changed
+
+BATCH_SIZE = 1000
+
+# object_type -> model whose ip_address field is indexed
+IP_MODELS = {
+    'network_device': NetworkDevice,
+    'endpoint_user': EndpointUser,
+    'server': Server,
+    'peripheral': Peripheral,
+}
+OBJECT_TYPES = {model: object_type for object_type, model in IP_MODELS.items()}
+WATCHED_FIELDS = {'ip_address', 'name', 'organization', 'location', 'deleted_at'}
+
+_SPLIT_RE = re.compile(r'[\s,;]+')
+_IPV4_MAPPED = int(ipaddress.IPv6Address('::ffff:0:0'))
+
+
+def _key(value):
+    return f'{value:032x}'
+
+
+def address_key(address):
+    """Sortable 32-hex-digit key of an ipaddress address object."""
+    value = int(address)
+    if address.version == 4:
+        value += _IPV4_MAPPED
+    return _key(value)
+
+
+def parse_network(value):
+    """ipaddress network for a CIDR or single address ('10.1.2.0/24', '10.1.2.3'); raises ValueError."""
+    return ipaddress.ip_network((value or '').strip(), strict=False)
+
+
+def network_keys(network):
+    """(first, last) address keys of an ipaddress network."""
+    return address_key(network.network_address), address_key(network.broadcast_address)
+
+
+def parse_addresses(text):
+    """Valid, de-duplicated addresses in free text; loopback and unspecified addresses are skipped."""
+    addresses = {}
+    for token in _SPLIT_RE.split(text or ''):
+        token = token.strip('[]()').split('%', 1)[0]
+        if not token:
+            continue
+        try:
+            address = ipaddress.ip_interface(token).ip
+        except ValueError:
+            continue
+        if address.is_loopback or address.is_unspecified:
+            continue
+        addresses.setdefault(address_key(address), address)
+    return list(addresses.values())
+
+
+def usable_hosts(network):
+    """Assignable addresses: IPv4 excludes network and broadcast below /31."""
+    if network.version == 4 and network.prefixlen < 31:
+        return network.num_addresses - 2
+    return network.num_addresses
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance
+# ---------------------------------------------------------------------------
+
+def inet_index_name(table):
+    return f'{table}_address_gist_idx'
+
+
+def inet_index_sql(table):
+    qn = connection.ops.quote_name
+    return f'CREATE INDEX IF NOT EXISTS {qn(inet_index_name(table))} ON {qn(table)} USING gist (address inet_ops)'
+
+
+def inet_index_drop_sql(table):
+    return f'DROP INDEX IF EXISTS {connection.ops.quote_name(inet_index_name(table))}'
+
+
+def sync_objects(object_type, objects):
+    """
+    Replace the address rows of `objects` (instances of one IP model) from their text.
+
+    Soft-deleted objects are left without rows. Returns the number of rows written.
+    """
+    entries = [
+        IPAddressEntry(
+            organization_id=obj.organization_id,
+            location_id=obj.location_id,
+            object_type=object_type,
+            object_id=obj.pk,
+            name=obj.name,
+            address=str(address),
+            address_key=address_key(address),
+            version=address.version,
+        )
+        for obj in objects if obj.deleted_at is None
+        for address in parse_addresses(obj.ip_address)
+    ]
+    with transaction.atomic():
+        IPAddressEntry.objects.filter(object_type=object_type, object_id__in=[obj.pk for obj in objects]).delete()
+        IPAddressEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+    return len(entries)
+
+
+def index_object(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and not WATCHED_FIELDS.intersection(update_fields):
+        return
+    if created and not instance.ip_address:
+        return
+    sync_objects(OBJECT_TYPES[sender], [instance])
+
+
+def unindex_object(sender, instance, **kwargs):
+    IPAddressEntry.objects.filter(object_type=OBJECT_TYPES[sender], object_id=instance.pk).delete()
+
+
+def set_subnet_keys(sender, instance, **kwargs):
+    network = parse_network(instance.network)
+    instance.network = str(network)
+    instance.start_key, instance.end_key = network_keys(network)
+
+
+def resync_objects(sender, pks, deleted, **kwargs):
+    object_type = OBJECT_TYPES[sender]
+    for chunk in chunked(pks, BATCH_SIZE):
+        if deleted:
+            IPAddressEntry.objects.filter(object_type=object_type, object_id__in=chunk).delete()
+            continue
+        sync_objects(object_type, list(sender.all_objects.filter(pk__in=chunk).only(
+            'id', 'organization_id', 'location_id', 'name', 'ip_address', 'deleted_at'
+        )))
+
+
+def connect_signals():
+    for object_type, model in IP_MODELS.items():
+        post_save.connect(index_object, sender=model, dispatch_uid=f'ip-index-save-{object_type}')
+        post_delete.connect(unindex_object, sender=model, dispatch_uid=f'ip-index-delete-{object_type}')
+        soft_delete_changed.connect(resync_objects, sender=model, dispatch_uid=f'ip-index-cascade-{object_type}')
+    pre_save.connect(set_subnet_keys, sender=Subnet, dispatch_uid='subnet-keys')
+
+
+def rebuild_index(batch_size=BATCH_SIZE):
+    """Rebuild every model's address rows. Returns {object_type: rows written}."""
+    counts = {}
+    for object_type, model in IP_MODELS.items():
+        queryset = model.all_objects.order_by('pk').only(
+            'id', 'organization_id', 'location_id', 'name', 'ip_address', 'deleted_at'
+        )
+        written = 0
+        batch = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                written += sync_objects(object_type, batch)
+                batch = []
+        if batch:
+            written += sync_objects(object_type, batch)
+        counts[object_type] = written
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def in_network(queryset, network):
+    """IPAddressEntry rows inside an ipaddress network."""
+    if connection.vendor == 'postgresql':
+        return queryset.filter(
+            RawSQL(f'{connection.ops.quote_name(IPAddressEntry._meta.db_table)}.address <<= %s::inet',
+                   [str(network)], output_field=BooleanField())
+        )
+    start, end = network_keys(network)
+    return queryset.filter(address_key__gte=start, address_key__lte=end)
+
+
+def with_utilization(subnets):
+    """Annotate `used`: distinct addresses of the subnet's organization inside its range."""
+    used = IPAddressEntry.objects.filter(
+        organization_id=OuterRef('organization_id'),
+        address_key__gte=OuterRef('start_key'),
+        address_key__lte=OuterRef('end_key'),
+    ).order_by().values('organization_id').annotate(count=Count('address_key', distinct=True)).values('count')
+    return subnets.annotate(used=Coalesce(Subquery(used, output_field=IntegerField()), 0))
+
+
+def utilization(subnet):
+    """{'size', 'used', 'free', 'percent'} for a subnet annotated by with_utilization()."""
+    size = usable_hosts(parse_network(subnet.network))
+    return {
+        'size': size,
+        'used': subnet.used,
+        'free': max(size - subnet.used, 0),
+        'percent': round(subnet.used * 100 / size, 2) if size else 0,
+    }
+
+
+def location_utilization(organization_id, location_id=None):
+    """
+    [{'location_id', 'location_name', 'size', 'used', 'percent', 'subnets': [...]}] for
+    one organization's subnets, grouped by location.
+    """
+    subnets = Subnet.objects.filter(organization_id=organization_id)
+    if location_id:
+        subnets = subnets.filter(location_id=location_id)
+    groups = {}
+    for subnet in with_utilization(subnets.select_related('location')).order_by('location__name', 'start_key'):
+        group = groups.setdefault(subnet.location_id, {
+            'location_id': subnet.location_id,
+            'location_name': subnet.location.name if subnet.location_id else None,
+            'size': 0,
+            'used': 0,
+            'subnets': [],
+        })
+        usage = utilization(subnet)
+        group['size'] += usage['size']
+        group['used'] += usage['used']
+        group['subnets'].append({
+            'id': subnet.pk, 'name': subnet.name, 'network': subnet.network, 'vlan_id': subnet.vlan_id, **usage
+        })
+    for group in groups.values():
+        group['percent'] = round(group['used'] * 100 / group['size'], 2) if group['size'] else 0
+    return list(groups.values())
+
+
+def ip_conflicts(organization_id=None):
+    """Addresses used by more than one device in the same organization, with every holder."""
+    duplicates = IPAddressEntry.objects.all()
+    if organization_id:
+        duplicates = duplicates.filter(organization_id=organization_id)
+    duplicates = duplicates.values('organization_id', 'address_key').annotate(
+        holders=Count('id')
+    ).filter(holders__gt=1).order_by('organization_id', 'address_key')
+    keys = {(row['organization_id'], row['address_key']) for row in duplicates}
+    if not keys:
+        return []
+
+    conflicts = {}
+    entries = IPAddressEntry.objects.filter(
+        organization_id__in={organization for organization, _ in keys},
+        address_key__in={key for _, key in keys},
+    ).order_by('organization_id', 'address_key', 'object_type', 'name')
+    for entry in entries:
+        if (entry.organization_id, entry.address_key) not in keys:
+            continue
+        conflict = conflicts.setdefault((entry.organization_id, entry.address_key), {
+            'organization_id': entry.organization_id,
+            'address': entry.address,
+            'holders': [],
+        })
+        conflict['holders'].append({
+            'type': entry.object_type, 'id': entry.object_id, 'name': entry.name, 'location_id': entry.location_id,
+        })
+    return list(conflicts.values())
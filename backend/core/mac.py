@@ -0,0 +1,187 @@
+"""
+MAC address canonicalization and offline OUI vendor lookup.
+
+Every model with a mac_address field also stores mac_normalized: twelve
+lower-case hex digits, or '' when the text is not a usable MAC. It is set on
+save and indexed, so a MAC from a switch table matches inventory with one
+equality lookup per model.
+
+Vendor names come from an IEEE OUI registry file (oui.csv, oui.txt or a plain
+"XX:XX:XX Vendor" list) at OUI_DATABASE_PATH, which the update_oui_database
+command fills with the full registry. The path lives outside the package
+(backend/var/oui.txt by default) so the download never touches a tracked file;
+until it exists, reads fall back to the small seed list in core/data/oui.txt.
+The file is read once per process into a sorted array of 24-bit prefixes
+searched with bisect.
+"""
+import csv
+import re
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from decouple import config
+from django.conf import settings
+from django.db.models.signals import post_save, pre_save
+
+from .models import NetworkDevice, EndpointUser, Server, Peripheral, RMMEndpoint
+
+OUI_DATABASE_PATH = config('OUI_DATABASE_PATH', default=str(Path(settings.BASE_DIR) / 'var' / 'oui.txt'))
+# Bundled seed list, read when OUI_DATABASE_PATH has not been downloaded yet
+OUI_SEED_PATH = Path(__file__).resolve().parent / 'data' / 'oui.txt'
+OUI_REGISTRY_URL = 'https://standards-oui.ieee.org/oui/oui.csv'
+# Largest list accepted by one bulk vendor lookup request
+MAX_VENDOR_LOOKUP = 100000
+
+# object_type -> model with mac_address / mac_normalized
+MAC_MODELS = {
+    'network_device': NetworkDevice,
+    'endpoint_user': EndpointUser,
+    'server': Server,
+    'peripheral': Peripheral,
+    'rmm_endpoint': RMMEndpoint,
+}
+
+_NON_HEX = re.compile(r'[^0-9a-f]')
+# "00:50:56 VMware", "00-50-56   (hex)  VMware, Inc.", "005056     (base 16)  VMware, Inc."
+_OUI_LINE_RE = re.compile(
+    r'^\s*([0-9A-Fa-f]{2}[:\-]?[0-9A-Fa-f]{2}[:\-]?[0-9A-Fa-f]{2})(?:/24)?\s+(?:\((?:hex|base 16)\)\s+)?(\S.*?)\s*$'
+)
+
+
+def normalize_mac(value):
+    """Twelve lower-case hex digits for a MAC in any common notation; '' if not a usable MAC."""
+    mac = _NON_HEX.sub('', (value or '').lower())
+    if len(mac) != 12 or mac in ('000000000000', 'ffffffffffff'):
+        return ''
+    return mac
+
+
+def format_mac(mac, separator=':'):
+    """'005056ab0102' -> '00:50:56:ab:01:02'."""
+    return separator.join(mac[i:i + 2] for i in range(0, len(mac), 2)) if mac else ''
+
+
+# ---------------------------------------------------------------------------
+# Canonical column
+# ---------------------------------------------------------------------------
+
+def set_mac_normalized(sender, instance, **kwargs):
+    instance.mac_normalized = normalize_mac(instance.mac_address)
+
+
+def save_mac_normalized(sender, instance, update_fields=None, **kwargs):
+    # save(update_fields=[..., 'mac_address']) would leave the derived column behind
+    if update_fields and 'mac_address' in update_fields and 'mac_normalized' not in update_fields:
+        sender.all_objects.filter(pk=instance.pk).update(mac_normalized=instance.mac_normalized)
+
+
+def connect_signals():
+    for object_type, model in MAC_MODELS.items():
+        pre_save.connect(set_mac_normalized, sender=model, dispatch_uid=f'mac-normalize-{object_type}')
+        post_save.connect(save_mac_normalized, sender=model, dispatch_uid=f'mac-normalize-save-{object_type}')
+
+
+def find_devices(mac, organization_id=None):
+    """[{'type', 'id', 'name', 'organization_id', 'mac_address'}] holding a MAC, one indexed query per model."""
+    mac = normalize_mac(mac)
+    if not mac:
+        return []
+    devices = []
+    for object_type, model in MAC_MODELS.items():
+        queryset = model.objects.filter(mac_normalized=mac)
+        if organization_id:
+            queryset = queryset.filter(organization_id=organization_id)
+        devices.extend(
+            {'type': object_type, 'id': pk, 'name': name, 'organization_id': org, 'mac_address': raw}
+            for pk, name, org, raw in queryset.order_by().values_list('id', 'name', 'organization_id', 'mac_address')
+        )
+    return devices
+
+
+# ---------------------------------------------------------------------------
+# OUI vendor database
+# ---------------------------------------------------------------------------
+
+class OUIDatabase:
+    """Sorted 24-bit OUI prefixes with a parallel vendor index, searched with bisect."""
+
+    def __init__(self, entries=()):
+        vendors = {}
+        by_prefix = {}
+        for prefix, vendor in entries:
+            by_prefix[prefix] = vendors.setdefault(vendor, len(vendors))
+        ordered = sorted(by_prefix.items())
+        self.prefixes = array('I', (prefix for prefix, _ in ordered))
+        self.vendor_ids = array('I', (vendor_id for _, vendor_id in ordered))
+        self.vendors = list(vendors)
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    @classmethod
+    def from_file(cls, path):
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with path.open(encoding='utf-8', errors='replace', newline='') as handle:
+            return cls(parse_oui_lines(handle))
+
+    def vendor(self, mac):
+        """Vendor for a canonical (normalize_mac) MAC, or None."""
+        if not mac:
+            return None
+        prefix = int(mac[:6], 16)
+        i = bisect_left(self.prefixes, prefix)
+        if i < len(self.prefixes) and self.prefixes[i] == prefix:
+            return self.vendors[self.vendor_ids[i]]
+        return None
+
+
+def parse_oui_lines(lines):
+    """Yield (prefix int, vendor) from IEEE oui.csv, oui.txt or "XX:XX:XX Vendor" lines."""
+    lines = iter(lines)
+    first = next(lines, '')
+    if first.startswith('Registry,'):
+        for row in csv.reader(lines):
+            if len(row) >= 3 and len(row[1]) == 6:
+                try:
+                    yield int(row[1], 16), row[2].strip()
+                except ValueError:
+                    continue
+        return
+    for line in (first, *lines):
+        if line.startswith('#'):
+            continue
+        match = _OUI_LINE_RE.match(line)
+        if match:
+            yield int(_NON_HEX.sub('', match.group(1).lower()), 16), match.group(2)
+
+
+_database = None
+
+
+def get_database():
+    """The process-wide OUIDatabase, read on first use from OUI_DATABASE_PATH or else the seed list."""
+    global _database
+    if _database is None:
+        path = Path(OUI_DATABASE_PATH)
+        _database = OUIDatabase.from_file(path if path.exists() else OUI_SEED_PATH)
+    return _database
+
+
+def reload_database():
+    global _database
+    _database = None
+    return get_database()
+
+
+def mac_vendor(value):
+    """Vendor name for a MAC in any notation, or None."""
+    return get_database().vendor(normalize_mac(value))
+
+
+def mac_vendors(values):
+    """{input: vendor or None} for many MACs at once."""
+    database = get_database()
+    return {value: database.vendor(normalize_mac(value)) for value in values}
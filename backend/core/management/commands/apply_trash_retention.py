@@ -0,0 +1,92 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.retention import BATCH_SIZE, apply_policy, expired, leaf_first, policies
+from core.trash import TRASH_MODELS
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        'Archive or permanently delete soft-deleted rows older than their retention period, '
+        'in small batches that are safe to run during business hours'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Rows removed per transaction (default: {BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.2,
+            help='Seconds to wait between batches so other writers get the locks (default: 0.2)'
+        )
+        parser.add_argument(
+            '--max-minutes',
+            type=float,
+            help='Stop after this many minutes; the next run picks up where this one stopped'
+        )
+        parser.add_argument(
+            '--type',
+            action='append',
+            dest='types',
+            choices=list(TRASH_MODELS),
+            help='Only apply the policy of this type (repeatable)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many rows are due without changing anything'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        started = time.monotonic()
+        deadline = started + options['max_minutes'] * 60 if options['max_minutes'] else None
+        now = timezone.now()
+        configured = policies()
+        removed = reclaimed = 0
+        stopped = False
+
+        for object_type in leaf_first(options['types'] or TRASH_MODELS):
+            days, action = configured[object_type]
+            if options['dry_run']:
+                due, held = expired(object_type, now - timedelta(days=days))
+                count = 0 if action == 'keep' else due.count()
+                self.stdout.write(f'{object_type}: {action} after {days} days, {count} due, {held.count()} held')
+                continue
+
+            report = apply_policy(
+                object_type, days, action, batch_size=options['batch_size'],
+                pause=options['pause'], deadline=deadline, now=now,
+            )
+            removed += report['removed']
+            reclaimed += report['reclaimed_bytes'] or 0
+            if report['removed'] or report['held'] or options['verbosity'] > 1:
+                line = f"{object_type}: {action} after {days} days, {report['removed']} removed"
+                if report['archived']:
+                    line += f", {report['archived']} archived"
+                if report['cascaded']:
+                    line += ' (with ' + ', '.join(f'{count} {name}' for name, count in report['cascaded'].items()) + ')'
+                if report['held']:
+                    line += f", {report['held']} held back by live dependents"
+                if report['removed'] and report['reclaimed_bytes'] is not None:
+                    line += f", ~{report['reclaimed_bytes'] / 1024 / 1024:.1f} MiB"
+                self.stdout.write(line)
+            if report['stopped']:
+                stopped = True
+                break
+
+        if options['dry_run']:
+            return
+        summary = f'Removed {removed} rows, ~{reclaimed / 1024 / 1024:.1f} MiB reclaimable, in {time.monotonic() - started:.2f}s'
+        if stopped:
+            self.stdout.write(self.style.WARNING(f'{summary}; stopped at --max-minutes, run again to continue'))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,100 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from core.ids import uuid7
+import uuid
+import time
+
+TABLE = 'benchmark_primary_keys'
+KEY_GENERATORS = {'uuid4': uuid.uuid4, 'uuid7': uuid7}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare insert throughput and primary key index size of random (uuid4) and '
+        'time-ordered (uuid7) keys on a scratch table'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=2000000,
+            help='Rows inserted per key type (default: 2000000)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Rows per INSERT batch and transaction (default: 10000)'
+        )
+
+    def create_table(self, cursor):
+        qn = connection.ops.quote_name
+        key_type = models.UUIDField().db_type(connection)
+        cursor.execute(f'DROP TABLE IF EXISTS {qn(TABLE)}')
+        cursor.execute(
+            f'CREATE TABLE {qn(TABLE)} (id {key_type} NOT NULL PRIMARY KEY, '
+            f'organization_id {key_type} NOT NULL, name varchar(255) NOT NULL)'
+        )
+
+    def index_size(self, cursor):
+        """Bytes used by the primary key index."""
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT pg_relation_size(indexrelid) FROM pg_index WHERE indrelid = %s::regclass AND indisprimary",
+                [TABLE],
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT SUM(pgsize) FROM dbstat WHERE name = (SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = %s)",
+                [TABLE],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def run(self, generate, rows, batch_size):
+        field = models.UUIDField()
+        organization_id = field.get_db_prep_value(uuid.uuid4(), connection)
+        qn = connection.ops.quote_name
+        insert = f'INSERT INTO {qn(TABLE)} (id, organization_id, name) VALUES (%s, %s, %s)'
+        with connection.cursor() as cursor:
+            self.create_table(cursor)
+            elapsed = 0.0
+            for start in range(0, rows, batch_size):
+                batch = [
+                    (field.get_db_prep_value(generate(), connection), organization_id, f'asset-{n}')
+                    for n in range(start, min(start + batch_size, rows))
+                ]
+                started = time.monotonic()
+                with transaction.atomic():
+                    cursor.executemany(insert, batch)
+                elapsed += time.monotonic() - started
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'ANALYZE {qn(TABLE)}')
+            size = self.index_size(cursor)
+            cursor.execute(f'DROP TABLE {qn(TABLE)}')
+        return elapsed, size
+
+    def handle(self, *args, **options):
+        rows, batch_size = options['rows'], options['batch_size']
+        if rows < 1 or batch_size < 1:
+            raise CommandError('--rows and --batch-size must be positive.')
+
+        results = {}
+        for name, generate in KEY_GENERATORS.items():
+            self.stdout.write(f'Inserting {rows} rows with {name} keys...')
+            elapsed, size = self.run(generate, rows, batch_size)
+            results[name] = (elapsed, size)
+            size_text = f'{size / 1024 / 1024:.1f} MiB' if size is not None else 'n/a'
+            self.stdout.write(
+                f'  {name}: {elapsed:.2f}s, {rows / elapsed:,.0f} rows/s, primary key index {size_text}'
+            )
+
+        (random_time, random_size), (ordered_time, ordered_size) = results['uuid4'], results['uuid7']
+        summary = f'uuid7 inserts are {random_time / ordered_time:.2f}x the speed of uuid4'
+        if random_size and ordered_size:
+            summary += f', index is {ordered_size / random_size:.0%} of the uuid4 size'
+        self.stdout.write(self.style.SUCCESS(summary))
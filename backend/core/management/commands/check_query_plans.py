@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory, force_authenticate
+from api.urls import router
+from core.query_plans import sequential_scans
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on every API viewset's list query and flag sequential scans "
+        "of tables above a row threshold"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold',
+            type=int,
+            default=1000,
+            help='Flag sequential scans of tables with more rows than this (default: 1000)'
+        )
+        parser.add_argument(
+            '--organization',
+            help='Also check the list queries filtered by this organization id'
+        )
+        parser.add_argument(
+            '--viewset',
+            action='append',
+            dest='viewsets',
+            help='Only check this router basename (repeatable)'
+        )
+
+    def list_queryset(self, viewset, prefix, params, user):
+        """The queryset the viewset's list action would paginate for `params`."""
+        request = APIRequestFactory().get(f'/api/{prefix}/', params)
+        force_authenticate(request, user=user)
+        view = viewset(action_map={'get': 'list'}, format_kwarg=None, args=(), kwargs={})
+        view.request = view.initialize_request(request)
+        queryset = view.filter_queryset(view.get_queryset())
+        page_size = view.paginator.get_page_size(view.request) if view.paginator else None
+        return queryset[:page_size] if page_size else queryset
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(is_superuser=True, is_active=True).first()
+        if user is None:
+            raise CommandError('A superuser is required to build the list queries.')
+
+        variants = [('', {})]
+        if options['organization']:
+            variants.append((f" (organization={options['organization']})", {'organization': options['organization']}))
+
+        row_counts = {}
+        flagged = 0
+        for prefix, viewset, basename in router.registry:
+            if options['viewsets'] and basename not in options['viewsets']:
+                continue
+            for label, params in variants:
+                queryset = self.list_queryset(viewset, prefix, params, user)
+                scans, plan = sequential_scans(queryset, options['threshold'], row_counts)
+                if scans:
+                    flagged += 1
+                    tables = ', '.join(f'{table} ({rows} rows)' for table, rows in scans.items())
+                    self.stdout.write(self.style.WARNING(f'{basename}{label}: sequential scan of {tables}'))
+                else:
+                    self.stdout.write(f'{basename}{label}: ok')
+                if options['verbosity'] > 1:
+                    self.stdout.write(plan)
+
+        if flagged:
+            raise CommandError(f"{flagged} list queries scan tables above {options['threshold']} rows")
+        self.stdout.write(self.style.SUCCESS('No sequential scans above the threshold'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from core.backup_health import run_monitor
+import time
+
+
+class Command(BaseCommand):
+    help = 'Flag overdue and failed backups, re-evaluating only those whose expected run window has elapsed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-evaluate every backup, not only those due for a check'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Backups evaluated per bulk update (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        counts = run_monitor(full=options['all'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Evaluated {counts['evaluated']} backups: {counts['ok']} ok, {counts['overdue']} overdue, "
+            f"{counts['failed']} failed, {counts['unknown']} unknown ({time.monotonic() - started:.2f}s)"
+        ))
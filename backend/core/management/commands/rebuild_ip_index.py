@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from core.ipam import rebuild_index
+import time
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the validated IP address index from device ip_address fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Devices processed per batch (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        counts = rebuild_index(batch_size=options['batch_size'])
+        summary = ', '.join(f'{count} {object_type}' for object_type, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {sum(counts.values())} addresses ({summary}) in {time.monotonic() - started:.2f}s"
+        ))
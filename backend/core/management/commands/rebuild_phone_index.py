@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from core.phone_index import rebuild_index
+import time
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the normalized phone number and extension index from VoIP services, assignments and contacts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Source rows processed per batch (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        counts = rebuild_index(batch_size=options['batch_size'])
+        summary = ', '.join(f'{count} from {source_type}' for source_type, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {sum(counts.values())} numbers and extensions ({summary}) "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from core.models import Organization
+from core.reconciliation import reconcile_organization
+import time
+
+
+class Command(BaseCommand):
+    help = 'Match RMM endpoints to documented endpoints and servers by serial, MAC and hostname'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'organization_id',
+            nargs='?',
+            type=str,
+            help='UUID of the organization to reconcile (default: all organizations)'
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Fill blank hardware fields on documented assets from RMM data'
+        )
+        parser.add_argument(
+            '--no-link',
+            action='store_true',
+            help='Report only; do not link RMM endpoints to documented assets'
+        )
+        parser.add_argument(
+            '--details',
+            action='store_true',
+            help='List unmatched assets'
+        )
+
+    def handle(self, *args, **options):
+        organizations = Organization.objects.all()
+        if options['organization_id']:
+            organizations = organizations.filter(id=options['organization_id'])
+            if not organizations.exists():
+                self.stdout.write(self.style.ERROR(f"Organization {options['organization_id']} not found"))
+                return
+
+        for org in organizations:
+            started = time.monotonic()
+            report = reconcile_organization(
+                org.id, backfill=options['backfill'], link=not options['no_link']
+            )
+            elapsed = time.monotonic() - started
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{org.name}: matched {len(report['matched'])}, "
+                f"RMM only {len(report['rmm_only'])}, "
+                f"documentation only {len(report['documentation_only'])}, "
+                f"linked {report['linked']}, backfilled {report['backfilled']} "
+                f"({elapsed:.2f}s)"
+            ))
+
+            if options['details']:
+                for item in report['rmm_only']:
+                    self.stdout.write(f"  RMM only: {item['name']} ({item['agent_id']})")
+                for item in report['documentation_only']:
+                    self.stdout.write(f"  Documentation only: {item['asset_name']} ({item['asset_type']})")
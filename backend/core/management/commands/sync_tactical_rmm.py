@@ -1,20 +1,63 @@
 from django.core.management.base import BaseCommand
+from django.utils import timezone
 from decouple import config
-from core.integrations.tactical_rmm import TacticalRMMClient
-from core.models import RMMEndpoint, Organization
+from core.integrations.tactical_rmm import TacticalRMMClient, RateLimiter
+from core.integrations.rmm_sync import (
+    sync_lock, sync_agents, sync_agent_details, run_source_sync, due_sources, DETAIL_RATE_LIMIT
+)
+from core.models import Organization, RMMSource
 import logging
+import signal
+import time
 
 logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
-    help = 'Sync endpoints from Tactical RMM to a specific organization'
+    help = (
+        'Sync endpoints from Tactical RMM. Pass an organization to sync once using the '
+        'TACTICAL_RMM_* settings, --source to sync one configured source, or --schedule '
+        'to keep syncing every active source on its own interval.'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
             'organization_id',
+            nargs='?',
             type=str,
-            help='UUID of the organization to sync to'
+            help='UUID of the organization to sync to (uses TACTICAL_RMM_API_KEY/TACTICAL_RMM_BASE_URL)'
+        )
+        parser.add_argument(
+            '--source',
+            type=str,
+            help='UUID of a configured RMM source to sync once'
+        )
+        parser.add_argument(
+            '--schedule',
+            action='store_true',
+            help='Run as a scheduler, syncing each active source when it is due'
+        )
+        parser.add_argument(
+            '--jitter',
+            type=float,
+            default=0.1,
+            help='Random delay added to each interval, as a fraction of it (default: 0.1)'
+        )
+        parser.add_argument(
+            '--poll',
+            type=int,
+            default=60,
+            help='Maximum seconds the scheduler sleeps before checking for due sources (default: 60)'
+        )
+        parser.add_argument(
+            '--details',
+            action='store_true',
+            help='Fetch per-agent software, patches and disks for agents whose summary changed'
+        )
+        parser.add_argument(
+            '--full-details',
+            action='store_true',
+            help='Fetch per-agent details for every agent, ignoring summary hashes'
         )
         parser.add_argument(
             '--dry-run',
@@ -23,9 +66,32 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        org_id = options['organization_id']
-        dry_run = options.get('dry_run', False)
+        # None leaves the choice to each source's fetch_details setting
+        self.details = True if options['details'] or options['full_details'] else None
+        self.incremental = not options['full_details']
+
+        if options['schedule']:
+            return self.run_scheduler(options['jitter'], options['poll'])
+
+        if options['source']:
+            try:
+                source = RMMSource.objects.select_related('organization').get(id=options['source'])
+            except RMMSource.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f"RMM source {options['source']} not found"))
+                return
+            self.report_run(source, run_source_sync(
+                source, jitter=options['jitter'], details=self.details, incremental=self.incremental
+            ))
+            return
+
+        if not options['organization_id']:
+            self.stdout.write(self.style.ERROR('Pass an organization_id, --source or --schedule'))
+            return
+
+        self.sync_organization(options['organization_id'], options.get('dry_run', False))
 
+    def sync_organization(self, org_id, dry_run):
+        """One-shot sync into an organization using credentials from the environment."""
         try:
             org = Organization.objects.get(id=org_id)
         except Organization.DoesNotExist:
@@ -43,11 +109,12 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS(f'Connecting to RMM at {base_url}...'))
 
-        client = TacticalRMMClient(api_key, base_url)
+        started_at = timezone.now()
+        client = TacticalRMMClient(api_key, base_url, rate_limiter=RateLimiter(DETAIL_RATE_LIMIT))
         result = client.sync_all_agents()
 
         if not result.get('success'):
-            self.stdout.write(self.style.ERROR('Failed to sync agents'))
+            self.stdout.write(self.style.ERROR(f"Failed to sync agents: {result.get('error', '')}"))
             return
 
         agents = result.get('agents', [])
@@ -55,42 +122,69 @@ class Command(BaseCommand):
             self.style.SUCCESS(f'Found {len(agents)} agents to sync to {org.name}')
         )
 
-        created = 0
-        updated = 0
-
-        for agent_data in agents:
-            if dry_run:
+        if dry_run:
+            for agent_data in agents:
                 self.stdout.write(f"  [DRY RUN] Would sync: {agent_data['name']}")
-                continue
-
-            _, created_flag = RMMEndpoint.objects.update_or_create(
-                agent_id=agent_data['agent_id'],
-                defaults={
-                    'organization': org,
-                    'name': agent_data['name'],
-                    'operating_system': agent_data['operating_system'],
-                    'cpu_model': agent_data['cpu_model'],
-                    'cpu_cores': agent_data['cpu_cores'],
-                    'ram_gb': agent_data['ram_gb'],
-                    'disk_total_gb': agent_data['disk_total_gb'],
-                    'disk_free_gb': agent_data['disk_free_gb'],
-                    'serial_number': agent_data['serial_number'],
-                    'logged_in_user': agent_data['logged_in_user'],
-                    'status': agent_data['status'],
-                    'last_seen': agent_data['last_seen'],
-                    'raw_rmm_data': agent_data['raw_rmm_data'],
-                }
-            )
+            return
 
-            if created_flag:
-                created += 1
-                self.stdout.write(f"  ✓ Created: {agent_data['name']}")
-            else:
-                updated += 1
-                self.stdout.write(f"  ✓ Updated: {agent_data['name']}")
+        with sync_lock(f'organization:{org.id}') as acquired:
+            if not acquired:
+                self.stdout.write(self.style.WARNING('Another sync for this organization is running; skipped'))
+                return
+            created, updated, stale = sync_agents(org, agents, started_at=started_at)
+            if self.details:
+                fetched, failed = sync_agent_details(org, agents, client, incremental=self.incremental)
+                self.stdout.write(f'Fetched details for {fetched} agents ({failed} failed)')
 
         self.stdout.write(
             self.style.SUCCESS(
-                f'\nSync complete! Created: {created}, Updated: {updated}'
+                f'\nSync complete! Created: {created}, Updated: {updated}, Marked stale: {stale}'
             )
-        )
\ No newline at end of file
+        )
+
+    def run_scheduler(self, jitter, poll):
+        """Loop forever, syncing each active source when its next_sync_at is due."""
+        stopping = []
+
+        def stop(signum, frame):
+            stopping.append(signum)
+            self.stdout.write(self.style.WARNING('Stopping scheduler after the current sync...'))
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(self.style.SUCCESS('RMM sync scheduler started'))
+        while not stopping:
+            for source in due_sources():
+                if stopping:
+                    break
+                self.report_run(source, run_source_sync(
+                    source, jitter=jitter, details=self.details, incremental=self.incremental
+                ))
+
+            next_due = RMMSource.objects.filter(
+                is_active=True, next_sync_at__isnull=False
+            ).order_by('next_sync_at').values_list('next_sync_at', flat=True).first()
+            sleep_for = poll
+            if next_due is not None:
+                sleep_for = min(poll, max(1, (next_due - timezone.now()).total_seconds()))
+
+            deadline = time.monotonic() + sleep_for
+            while not stopping and time.monotonic() < deadline:
+                time.sleep(min(1, deadline - time.monotonic()))
+
+        self.stdout.write(self.style.SUCCESS('RMM sync scheduler stopped'))
+
+    def report_run(self, source, run):
+        message = (
+            f'{source}: {run.status} in {run.duration_seconds:.1f}s '
+            f'(agents: {run.agents_total}, created: {run.created_count}, '
+            f'updated: {run.updated_count}, stale: {run.stale_count}, '
+            f'details: {run.details_fetched}, detail errors: {run.details_failed})'
+        )
+        if run.status == 'success':
+            self.stdout.write(self.style.SUCCESS(message))
+        elif run.status == 'skipped':
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.ERROR(f'{message}: {run.error}'))
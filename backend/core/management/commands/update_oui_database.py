@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from core.mac import OUI_DATABASE_PATH, OUI_REGISTRY_URL, OUIDatabase
+from pathlib import Path
+import os
+import requests
+import shutil
+import tempfile
+import time
+
+
+class Command(BaseCommand):
+    help = 'Download the IEEE OUI registry (or copy a local file) to OUI_DATABASE_PATH for MAC vendor lookups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            type=str,
+            default=OUI_REGISTRY_URL,
+            help=f'Registry to download (default: {OUI_REGISTRY_URL})'
+        )
+        parser.add_argument(
+            '--file',
+            type=str,
+            help='Use a local oui.csv, oui.txt or "XX:XX:XX Vendor" file instead of downloading'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        target = Path(OUI_DATABASE_PATH)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as temp:
+                if options['file']:
+                    with open(options['file'], 'rb') as source:
+                        shutil.copyfileobj(source, temp)
+                else:
+                    try:
+                        response = requests.get(options['url'], timeout=60, stream=True)
+                        response.raise_for_status()
+                    except requests.exceptions.RequestException as e:
+                        self.stdout.write(self.style.ERROR(f"Download failed: {e}"))
+                        return
+                    for chunk in response.iter_content(chunk_size=65536):
+                        temp.write(chunk)
+
+            database = OUIDatabase.from_file(temp_path)
+            if not len(database):
+                self.stdout.write(self.style.ERROR('No OUI assignments found; keeping the current database'))
+                return
+            os.replace(temp_path, target)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {len(database)} OUI assignments from {len(database.vendors)} vendors in {target} "
+            f"({time.monotonic() - started:.2f}s); restart workers to load them"
+        ))
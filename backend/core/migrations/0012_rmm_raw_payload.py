@@ -0,0 +1,77 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:11
+
+import hashlib
+import json
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_raw_data_to_payloads(apps, schema_editor):
+    """Copy inline raw_rmm_data into the compressed, deduplicated side table."""
+    RMMEndpoint = apps.get_model('core', 'RMMEndpoint')
+    RMMRawPayload = apps.get_model('core', 'RMMRawPayload')
+
+    batch = []
+    for endpoint in RMMEndpoint.objects.exclude(raw_rmm_data={}).only('id', 'raw_rmm_data').iterator(chunk_size=500):
+        raw = json.dumps(endpoint.raw_rmm_data, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+        content_hash = hashlib.sha256(raw).hexdigest()
+        RMMRawPayload.objects.bulk_create(
+            [RMMRawPayload(content_hash=content_hash, data=zlib.compress(raw), size=len(raw))],
+            ignore_conflicts=True,
+        )
+        endpoint.raw_payload_id = content_hash
+        batch.append(endpoint)
+        if len(batch) >= 500:
+            RMMEndpoint.objects.bulk_update(batch, ['raw_payload'])
+            batch = []
+    if batch:
+        RMMEndpoint.objects.bulk_update(batch, ['raw_payload'])
+
+
+def restore_raw_data_from_payloads(apps, schema_editor):
+    """Inline the side-table payloads back into raw_rmm_data."""
+    RMMEndpoint = apps.get_model('core', 'RMMEndpoint')
+
+    batch = []
+    for endpoint in RMMEndpoint.objects.filter(raw_payload__isnull=False).select_related('raw_payload').iterator(chunk_size=500):
+        endpoint.raw_rmm_data = json.loads(zlib.decompress(bytes(endpoint.raw_payload.data)).decode('utf-8'))
+        batch.append(endpoint)
+        if len(batch) >= 500:
+            RMMEndpoint.objects.bulk_update(batch, ['raw_rmm_data'])
+            batch = []
+    if batch:
+        RMMEndpoint.objects.bulk_update(batch, ['raw_rmm_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_rmmendpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RMMRawPayload',
+            fields=[
+                ('content_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('size', models.IntegerField(default=0, help_text='Uncompressed payload size in bytes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'rmm_raw_payloads',
+            },
+        ),
+        migrations.AddField(
+            model_name='rmmendpoint',
+            name='raw_payload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='endpoints', to='core.rmmrawpayload'),
+        ),
+        migrations.RunPython(move_raw_data_to_payloads, restore_raw_data_from_payloads),
+        migrations.RemoveField(
+            model_name='rmmendpoint',
+            name='raw_rmm_data',
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:12
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_rmm_raw_payload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rmmendpoint',
+            index=models.Index(fields=['status', 'last_seen'], name='rmm_endpoint_status_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rmmendpoint',
+            index=models.Index(fields=['organization', 'operating_system'], name='rmm_endpoint_org_os_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rmmendpoint',
+            index=models.Index(django.db.models.expressions.CombinedExpression(models.F('disk_total_gb'), '-', models.F('disk_free_gb')), name='rmm_endpoint_disk_used_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rmmendpoint',
+            index=models.Index(django.db.models.functions.comparison.Coalesce(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('disk_total_gb'), '-', models.F('disk_free_gb')), '*', models.Value(100.0)), '/', django.db.models.functions.comparison.NullIf(models.F('disk_total_gb'), models.Value(0.0))), models.Value(0.0)), name='rmm_endpoint_disk_usage_idx'),
+        ),
+    ]
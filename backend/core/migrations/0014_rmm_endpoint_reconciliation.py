@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_rmm_endpoint_disk_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rmmendpoint',
+            name='endpoint_user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='rmm_endpoints', to='core.endpointuser'),
+        ),
+        migrations.AddField(
+            model_name='rmmendpoint',
+            name='mac_address',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='rmmendpoint',
+            name='server',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='rmm_endpoints', to='core.server'),
+        ),
+    ]
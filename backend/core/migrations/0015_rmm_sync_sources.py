@@ -0,0 +1,88 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:18
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_rmm_endpoint_reconciliation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='rmmendpoint',
+            name='status',
+            field=models.CharField(choices=[('online', 'Online'), ('offline', 'Offline'), ('unknown', 'Unknown'), ('stale', 'Stale')], default='unknown', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='RMMSource',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('name', models.CharField(max_length=255)),
+                ('base_url', models.URLField(help_text='Tactical RMM API URL, e.g. https://api.rmm.example.com')),
+                ('api_key', models.CharField(max_length=255)),
+                ('sync_interval_minutes', models.PositiveIntegerField(default=60)),
+                ('is_active', models.BooleanField(default=True)),
+                ('next_sync_at', models.DateTimeField(blank=True, help_text='When the scheduler should sync next', null=True)),
+                ('last_sync_at', models.DateTimeField(blank=True, null=True)),
+                ('last_sync_status', models.CharField(blank=True, choices=[('success', 'Success'), ('failed', 'Failed'), ('skipped', 'Skipped')], max_length=20)),
+                ('last_error', models.TextField(blank=True)),
+                ('consecutive_failures', models.PositiveIntegerField(default=0)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('deleted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_deleted', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rmm_sources', to='core.organization')),
+            ],
+            options={
+                'db_table': 'rmm_sources',
+                'ordering': ['organization', 'name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='rmmendpoint',
+            name='source',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='endpoints', to='core.rmmsource'),
+        ),
+        migrations.CreateModel(
+            name='RMMSyncRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('success', 'Success'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='running', max_length=20)),
+                ('agents_total', models.IntegerField(default=0)),
+                ('created_count', models.IntegerField(default=0)),
+                ('updated_count', models.IntegerField(default=0)),
+                ('stale_count', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rmm_sync_runs', to='core.organization')),
+                ('source', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sync_runs', to='core.rmmsource')),
+            ],
+            options={
+                'db_table': 'rmm_sync_runs',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='rmmsource',
+            index=models.Index(fields=['is_active', 'next_sync_at'], name='rmm_source_due_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='rmmsource',
+            unique_together={('organization', 'name')},
+        ),
+        migrations.AddIndex(
+            model_name='rmmsyncrun',
+            index=models.Index(fields=['source', '-started_at'], name='rmm_sync_run_source_idx'),
+        ),
+    ]
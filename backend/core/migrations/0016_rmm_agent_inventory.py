@@ -0,0 +1,85 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_rmm_sync_sources'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rmmendpoint',
+            name='inventory_hash',
+            field=models.CharField(blank=True, help_text='Summary hash at the last per-agent detail fetch', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='rmmendpoint',
+            name='inventory_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rmmsource',
+            name='fetch_details',
+            field=models.BooleanField(default=False, help_text='Also fetch per-agent software, patches and disks'),
+        ),
+        migrations.AddField(
+            model_name='rmmsyncrun',
+            name='details_failed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='rmmsyncrun',
+            name='details_fetched',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='RMMDisk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('device', models.CharField(max_length=100)),
+                ('fstype', models.CharField(blank=True, max_length=50)),
+                ('total_gb', models.FloatField(default=0)),
+                ('free_gb', models.FloatField(default=0)),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='disks', to='core.rmmendpoint')),
+            ],
+            options={
+                'db_table': 'rmm_disks',
+                'indexes': [models.Index(fields=['endpoint'], name='rmm_disks_endpoin_1886c9_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RMMPatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kb', models.CharField(blank=True, max_length=50)),
+                ('title', models.CharField(max_length=500)),
+                ('severity', models.CharField(blank=True, max_length=50)),
+                ('installed', models.BooleanField(default=False)),
+                ('date_installed', models.DateTimeField(blank=True, null=True)),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='patches', to='core.rmmendpoint')),
+            ],
+            options={
+                'db_table': 'rmm_patches',
+                'indexes': [models.Index(fields=['endpoint', 'installed'], name='rmm_patches_endpoin_b7a4b5_idx'), models.Index(fields=['kb'], name='rmm_patches_kb_b9654d_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RMMSoftware',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('version', models.CharField(blank=True, max_length=100)),
+                ('publisher', models.CharField(blank=True, max_length=255)),
+                ('install_date', models.CharField(blank=True, max_length=50)),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='software', to='core.rmmendpoint')),
+            ],
+            options={
+                'db_table': 'rmm_software',
+                'indexes': [models.Index(fields=['endpoint'], name='rmm_softwar_endpoin_2d555d_idx'), models.Index(fields=['name', 'version'], name='rmm_softwar_name_d6787b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+from core.search import postgres_index_sql, postgres_drop_sql, sqlite_drop_sql, ensure_sqlite_indexes
+
+TABLES = ('documentations', 'configurations')
+
+
+def create_full_text_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        for table in TABLES:
+            for sql in postgres_index_sql(table):
+                schema_editor.execute(sql)
+    elif connection.vendor == 'sqlite':
+        ensure_sqlite_indexes(connection)
+
+
+def drop_full_text_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        for table in TABLES:
+            for sql in postgres_drop_sql(table):
+                schema_editor.execute(sql)
+    elif connection.vendor == 'sqlite':
+        for table in TABLES:
+            for sql in sqlite_drop_sql(table):
+                schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_rmm_agent_inventory'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_full_text_indexes, drop_full_text_indexes),
+    ]
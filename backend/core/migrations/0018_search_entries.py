@@ -0,0 +1,57 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core.search import postgres_index_sql, postgres_drop_sql, sqlite_drop_sql, ensure_sqlite_indexes
+
+TABLE = 'search_entries'
+
+
+def create_full_text_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        for sql in postgres_index_sql(TABLE):
+            schema_editor.execute(sql)
+    elif connection.vendor == 'sqlite':
+        ensure_sqlite_indexes(connection)
+
+
+def drop_full_text_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        for sql in postgres_drop_sql(TABLE):
+            schema_editor.execute(sql)
+    elif connection.vendor == 'sqlite':
+        for sql in sqlite_drop_sql(TABLE):
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(max_length=50)),
+                ('object_id', models.UUIDField()),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='core.organization')),
+            ],
+            options={
+                'verbose_name_plural': 'Search entries',
+                'db_table': 'search_entries',
+                'indexes': [models.Index(fields=['organization', 'object_type'], name='search_entr_organiz_f0f010_idx')],
+                'unique_together': {('object_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
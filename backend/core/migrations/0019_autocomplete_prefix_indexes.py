@@ -0,0 +1,43 @@
+from django.db import migrations
+
+from core.autocomplete import prefix_index_sql, prefix_index_drop_sql
+
+PREFIX_INDEXES = [
+    ('organizations', 'name'),
+    ('locations', 'name'),
+    ('contacts', 'first_name'),
+    ('contacts', 'last_name'),
+    ('contacts', 'email'),
+    ('network_devices', 'name'),
+    ('endpoint_users', 'name'),
+    ('endpoint_users', 'hostname'),
+    ('servers', 'name'),
+    ('servers', 'hostname'),
+    ('peripherals', 'name'),
+]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('postgresql', 'sqlite'):
+        return
+    for table, column in PREFIX_INDEXES:
+        schema_editor.execute(prefix_index_sql(table, column, vendor))
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    for table, column in PREFIX_INDEXES:
+        schema_editor.execute(prefix_index_drop_sql(table, column))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_search_entries'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:31
+
+from django.db import migrations, models
+
+from core.fuzzy import trigram_index_sql, trigram_index_drop_sql
+
+# (table, fuzzy field, columns joined into the indexed expression)
+TRIGRAM_INDEXES = [
+    ('network_devices', 'name', ['name']),
+    ('network_devices', 'serial_number', ['serial_number']),
+    ('endpoint_users', 'name', ['name']),
+    ('endpoint_users', 'hostname', ['hostname']),
+    ('endpoint_users', 'serial_number', ['serial_number']),
+    ('servers', 'name', ['name']),
+    ('servers', 'hostname', ['hostname']),
+    ('servers', 'serial_number', ['serial_number']),
+    ('peripherals', 'name', ['name']),
+    ('peripherals', 'serial_number', ['serial_number']),
+    ('contacts', 'name', ['first_name', 'last_name']),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, field, columns in TRIGRAM_INDEXES:
+        schema_editor.execute(trigram_index_sql(table, field, columns))
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, field, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(trigram_index_drop_sql(table, field))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_autocomplete_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FuzzyTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(max_length=50)),
+                ('object_id', models.UUIDField()),
+                ('field', models.CharField(max_length=50)),
+                ('trigram', models.CharField(max_length=3)),
+            ],
+            options={
+                'db_table': 'fuzzy_trigrams',
+                'indexes': [models.Index(fields=['object_type', 'trigram', 'object_id'], name='fuzzy_trigram_lookup_idx'), models.Index(fields=['object_id'], name='fuzzy_trigram_object_idx')],
+            },
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def normalize_tags(value):
+    names = {}
+    for raw in (value or '').split(','):
+        name = ' '.join(raw.lower().split())[:100]
+        if name:
+            names.setdefault(name, None)
+    return list(names)
+
+
+def populate_tags(apps, schema_editor):
+    Documentation = apps.get_model('core', 'Documentation')
+    Tag = apps.get_model('core', 'Tag')
+    DocumentationTag = Documentation.tag_set.through
+
+    doc_tags = {}
+    for doc_id, organization_id, tags in Documentation.objects.exclude(tags='').values_list(
+        'id', 'organization_id', 'tags'
+    ).iterator(chunk_size=BATCH_SIZE):
+        names = normalize_tags(tags)
+        if names:
+            doc_tags[doc_id] = (organization_id, names)
+
+    wanted = {(organization_id, name) for organization_id, names in doc_tags.values() for name in names}
+    Tag.objects.bulk_create(
+        [Tag(organization_id=organization_id, name=name) for organization_id, name in wanted],
+        batch_size=BATCH_SIZE, ignore_conflicts=True,
+    )
+    tag_ids = {
+        (organization_id, name): pk
+        for pk, organization_id, name in Tag.objects.values_list('id', 'organization_id', 'name')
+    }
+    DocumentationTag.objects.bulk_create(
+        [
+            DocumentationTag(documentation_id=doc_id, tag_id=tag_ids[(organization_id, name)])
+            for doc_id, (organization_id, names) in doc_tags.items() for name in names
+        ],
+        batch_size=BATCH_SIZE, ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_fuzzy_trigram_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='core.organization')),
+            ],
+            options={
+                'db_table': 'tags',
+                'ordering': ['name'],
+                'unique_together': {('organization', 'name')},
+            },
+        ),
+        migrations.AddField(
+            model_name='documentation',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, db_table='documentation_tags', related_name='documentations', to='core.tag'),
+        ),
+        migrations.RunPython(populate_tags, migrations.RunPython.noop),
+    ]
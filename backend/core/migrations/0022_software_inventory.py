@@ -0,0 +1,47 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_documentation_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SoftwareCatalogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Display name as first seen', max_length=255)),
+                ('normalized_name', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Software catalog entries',
+                'db_table': 'software_catalog',
+                'ordering': ['normalized_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SoftwareInstallation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(blank=True, max_length=100)),
+                ('version_key', models.CharField(blank=True, max_length=100)),
+                ('catalog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='installations', to='core.softwarecatalogentry')),
+                ('endpoint_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='software_installations', to='core.endpointuser')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='software_installations', to='core.organization')),
+                ('server', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='software_installations', to='core.server')),
+            ],
+            options={
+                'db_table': 'software_installations',
+                'indexes': [models.Index(fields=['catalog', 'version_key'], name='sw_install_catalog_version_idx'), models.Index(fields=['organization', 'catalog'], name='sw_install_org_catalog_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='softwareinstallation',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('endpoint_user__isnull', False), ('server__isnull', True)), models.Q(('endpoint_user__isnull', True), ('server__isnull', False)), _connector='OR'), name='sw_install_one_machine'),
+        ),
+    ]
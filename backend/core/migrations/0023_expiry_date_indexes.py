@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_software_inventory'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='endpointuser',
+            index=models.Index(fields=['warranty_expiry', 'organization'], name='endpoint_warranty_org_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['expiry_date', 'organization'], name='software_expiry_org_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voip',
+            index=models.Index(fields=['expiry_date', 'organization'], name='voip_expiry_org_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:46
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_due(apps, schema_editor):
+    # Existing backups have never been evaluated; the next monitor run picks them all up
+    Backup = apps.get_model('core', 'Backup')
+    Backup.objects.update(health_due_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_expiry_date_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backup',
+            name='health_checked_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='backup',
+            name='health_due_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the health status next needs re-evaluating', null=True),
+        ),
+        migrations.AddField(
+            model_name='backup',
+            name='health_status',
+            field=models.CharField(choices=[('ok', 'OK'), ('overdue', 'Overdue'), ('failed', 'Failed'), ('unknown', 'Unknown')], default='unknown', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='backup',
+            name='overdue_since',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='backup',
+            index=models.Index(fields=['health_due_at'], name='backup_health_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='backup',
+            index=models.Index(fields=['health_status', 'organization'], name='backup_health_org_idx'),
+        ),
+        migrations.RunPython(mark_due, migrations.RunPython.noop),
+    ]
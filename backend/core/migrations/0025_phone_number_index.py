@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_backup_health'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PhoneNumberEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('number', 'Phone number'), ('extension', 'Extension')], max_length=10)),
+                ('number', models.CharField(max_length=20)),
+                ('raw', models.CharField(blank=True, help_text='The text the number was parsed from', max_length=100)),
+                ('source_type', models.CharField(choices=[('voip', 'VoIP service'), ('voip_assignment', 'VoIP assignment'), ('contact', 'Contact')], max_length=20)),
+                ('source_id', models.UUIDField()),
+                ('field', models.CharField(max_length=30)),
+                ('contact', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='phone_entries', to='core.contact')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='phone_numbers', to='core.organization')),
+                ('voip', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='phone_entries', to='core.voip')),
+            ],
+            options={
+                'db_table': 'phone_numbers',
+                'indexes': [models.Index(fields=['kind', 'number'], name='phone_number_lookup_idx'), models.Index(fields=['organization', 'kind', 'number'], name='phone_number_org_idx'), models.Index(fields=['source_type', 'source_id'], name='phone_number_source_idx')],
+            },
+        ),
+    ]
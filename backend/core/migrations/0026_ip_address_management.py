@@ -0,0 +1,73 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:49
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+from core.ipam import inet_index_sql, inet_index_drop_sql
+
+
+def create_inet_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(inet_index_sql('ip_addresses'))
+
+
+def drop_inet_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(inet_index_drop_sql('ip_addresses'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_phone_number_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IPAddressEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(max_length=30)),
+                ('object_id', models.UUIDField()),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('address', models.GenericIPAddressField()),
+                ('address_key', models.CharField(max_length=32)),
+                ('version', models.PositiveSmallIntegerField()),
+                ('location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ip_addresses', to='core.location')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ip_addresses', to='core.organization')),
+            ],
+            options={
+                'db_table': 'ip_addresses',
+                'indexes': [models.Index(fields=['organization', 'address_key'], name='ip_address_org_key_idx'), models.Index(fields=['address_key'], name='ip_address_key_idx'), models.Index(fields=['object_type', 'object_id'], name='ip_address_object_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Subnet',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('network', models.CharField(help_text='CIDR, e.g. 10.20.0.0/24', max_length=50)),
+                ('vlan_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('gateway', models.GenericIPAddressField(blank=True, null=True)),
+                ('description', models.TextField(blank=True)),
+                ('start_key', models.CharField(editable=False, max_length=32)),
+                ('end_key', models.CharField(editable=False, max_length=32)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('deleted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_deleted', to=settings.AUTH_USER_MODEL)),
+                ('location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subnets', to='core.location')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subnets', to='core.organization')),
+            ],
+            options={
+                'db_table': 'subnets',
+                'ordering': ['organization', 'start_key'],
+                'indexes': [models.Index(fields=['organization', 'start_key'], name='subnet_org_start_idx'), models.Index(fields=['location', 'start_key'], name='subnet_location_start_idx')],
+            },
+        ),
+        migrations.RunPython(create_inet_index, drop_inet_index),
+    ]
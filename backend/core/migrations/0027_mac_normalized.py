@@ -0,0 +1,69 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:52
+
+import re
+
+from django.db import migrations, models
+
+
+MODELS = ('NetworkDevice', 'EndpointUser', 'Server', 'Peripheral', 'RMMEndpoint')
+BATCH_SIZE = 1000
+
+_NON_HEX = re.compile(r'[^0-9a-f]')
+
+
+def normalize_mac(value):
+    mac = _NON_HEX.sub('', (value or '').lower())
+    if len(mac) != 12 or mac in ('000000000000', 'ffffffffffff'):
+        return ''
+    return mac
+
+
+def populate_mac_normalized(apps, schema_editor):
+    for name in MODELS:
+        model = apps.get_model('core', name)
+        batch = []
+        for obj in model.objects.exclude(mac_address='').only('id', 'mac_address').iterator(chunk_size=BATCH_SIZE):
+            obj.mac_normalized = normalize_mac(obj.mac_address)
+            if obj.mac_normalized:
+                batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ['mac_normalized'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['mac_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_ip_address_management'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='endpointuser',
+            name='mac_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='networkdevice',
+            name='mac_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='peripheral',
+            name='mac_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='rmmendpoint',
+            name='mac_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='mac_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.RunPython(populate_mac_normalized, migrations.RunPython.noop),
+    ]
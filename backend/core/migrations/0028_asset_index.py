@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_mac_normalized'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(max_length=30)),
+                ('object_id', models.UUIDField()),
+                ('asset_id', models.UUIDField()),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('serial_number', models.CharField(blank=True, max_length=255)),
+                ('hostname', models.CharField(blank=True, max_length=255)),
+                ('mac_address', models.CharField(blank=True, max_length=12)),
+                ('location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='asset_index_entries', to='core.location')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asset_index_entries', to='core.organization')),
+            ],
+            options={
+                'db_table': 'asset_index',
+                'indexes': [models.Index(fields=['serial_number', 'organization'], name='asset_index_serial_idx'), models.Index(fields=['mac_address', 'organization'], name='asset_index_mac_idx'), models.Index(fields=['organization', 'hostname'], name='asset_index_org_hostname_idx'), models.Index(fields=['hostname'], name='asset_index_hostname_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='assetindexentry',
+            constraint=models.UniqueConstraint(fields=('object_type', 'object_id'), name='asset_index_object_uniq'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_asset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='backup',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'backup_type', 'name'], name='backup_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='configuration',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'config_type', 'name'], name='configuration_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'last_name', 'first_name'], name='contact_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentation',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['-created_at'], name='documentation_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentation',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', '-created_at'], name='documentation_live_org_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='endpointuser',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'device_type', 'name'], name='endpoint_user_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkdevice',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'device_type', 'name'], name='network_device_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordentry',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'name'], name='password_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordentry',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'category', 'name'], name='password_live_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='peripheral',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'device_type', 'name'], name='peripheral_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rmmendpoint',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['-last_sync'], name='rmm_endpoint_live_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'server_type', 'name'], name='server_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'software_type', 'name'], name='software_live_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voip',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organization', 'voip_type', 'name'], name='voip_live_order_idx'),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:59
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_live_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backup',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='configuration',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='contact',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='documentation',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='endpointuser',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='location',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='networkdevice',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='passwordentry',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='peripheral',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='rmmendpoint',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='rmmsource',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='server',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='software',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='softwareassignment',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='subnet',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='voip',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='voipassignment',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_deletion_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(max_length=50)),
+                ('object_id', models.UUIDField()),
+                ('organization_id', models.UUIDField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('data', models.BinaryField()),
+            ],
+            options={
+                'db_table': 'archived_rows',
+                'indexes': [models.Index(fields=['object_type', 'object_id'], name='archived_row_object_idx'), models.Index(fields=['organization_id', 'archived_at'], name='archived_row_org_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from core.search import rebuild_full_text_index
+
+
+def rebuild_documentation_index(apps, schema_editor):
+    # FULL_TEXT_INDEXES now includes the tags column
+    rebuild_full_text_index('documentations', schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_archived_rows'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_documentation_index, migrations.RunPython.noop),
+    ]
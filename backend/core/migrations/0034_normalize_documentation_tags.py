@@ -0,0 +1,38 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+MAX_LENGTH = 500
+
+
+def normalize_tags(value):
+    names = {}
+    for raw in (value or '').split(','):
+        name = ' '.join(raw.lower().split())[:100]
+        if name:
+            names.setdefault(name, None)
+    formatted = ', '.join(names)
+    return formatted if len(formatted) <= MAX_LENGTH else ','.join(names)
+
+
+def normalize_existing_tags(apps, schema_editor):
+    Documentation = apps.get_model('core', 'Documentation')
+    Tag = apps.get_model('core', 'Tag')
+
+    changed = []
+    for doc_id, tags in Documentation.objects.exclude(tags='').values_list('id', 'tags').iterator(chunk_size=BATCH_SIZE):
+        normalized = normalize_tags(tags)
+        if normalized != tags:
+            changed.append(Documentation(id=doc_id, tags=normalized))
+    Documentation.objects.bulk_update(changed, ['tags'], batch_size=BATCH_SIZE)
+    Tag.objects.filter(documentations__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_documentation_fts_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_existing_tags, migrations.RunPython.noop),
+    ]
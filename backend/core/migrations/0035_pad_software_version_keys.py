@@ -0,0 +1,42 @@
+import re
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+VERSION_PARTS = 6
+_DIGITS_RE = re.compile(r'\d+')
+
+
+def version_key(version):
+    parts = _DIGITS_RE.findall(version or '')[:VERSION_PARTS]
+    if not parts:
+        return ''
+    parts += ['0'] * (VERSION_PARTS - len(parts))
+    return '.'.join(f'{min(int(part), 99999999):08d}' for part in parts)
+
+
+def pad_version_keys(apps, schema_editor):
+    # Keys used to have as many parts as the version, so '120.0' sorted after '120'
+    SoftwareInstallation = apps.get_model('core', 'SoftwareInstallation')
+    changed = []
+    for pk, version, key in SoftwareInstallation.objects.exclude(version_key='').values_list(
+        'id', 'version', 'version_key'
+    ).iterator(chunk_size=BATCH_SIZE):
+        padded = version_key(version)
+        if padded != key:
+            changed.append(SoftwareInstallation(id=pk, version_key=padded))
+        if len(changed) >= BATCH_SIZE:
+            SoftwareInstallation.objects.bulk_update(changed, ['version_key'])
+            changed = []
+    SoftwareInstallation.objects.bulk_update(changed, ['version_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_normalize_documentation_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(pad_version_keys, migrations.RunPython.noop),
+    ]
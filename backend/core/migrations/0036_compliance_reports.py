@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:40
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_pad_software_version_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplianceReport',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='compliance_report', serialize=False, to='core.organization')),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('generated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'compliance_reports',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:59
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_compliance_reports'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='compliancereport',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='compliancereport',
+            name='data',
+            field=models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True),
+        ),
+        migrations.AlterField(
+            model_name='compliancereport',
+            name='generated_at',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
@@ -1,11 +1,23 @@
 from django.db import models
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce, NullIf
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
-import uuid
+import hashlib
+import json
+import zlib
+
+from .ids import uuid7
 
 User = get_user_model()
 
 
+# Condition of the partial indexes that back SoftDeleteManager querysets: every
+# default-manager query filters on it, so the indexes skip soft-deleted rows
+NOT_DELETED = Q(deleted_at__isnull=True)
+
+
 class SoftDeleteManager(models.Manager):
     """Manager to exclude soft-deleted records from default queryset."""
 
@@ -24,12 +36,14 @@ class SoftDeleteManager(models.Manager):
 
 class BaseModel(models.Model):
     """Abstract base model with common fields for all entities."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='%(class)s_created')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
     deleted_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='%(class)s_deleted')
+    # Shared by every row removed in one cascading soft delete (core.soft_delete)
+    deletion_batch = models.UUIDField(null=True, blank=True, db_index=True, editable=False)
 
     # Default manager - excludes deleted records
     objects = SoftDeleteManager()
@@ -54,7 +68,8 @@ class BaseModel(models.Model):
         """Restore a soft-deleted record."""
         self.deleted_at = None
         self.deleted_by = None
-        self.save(update_fields=['deleted_at', 'deleted_by', 'updated_at'])
+        self.deletion_batch = None
+        self.save(update_fields=['deleted_at', 'deleted_by', 'deletion_batch', 'updated_at'])
 
     @property
     def is_deleted(self):
@@ -122,6 +137,9 @@ class Contact(BaseModel):
     class Meta:
         ordering = ['organization', 'last_name', 'first_name']
         db_table = 'contacts'
+        indexes = [
+            models.Index(fields=['organization', 'last_name', 'first_name'], condition=NOT_DELETED, name='contact_live_order_idx'),
+        ]
         unique_together = ('organization', 'email')
 
     def __str__(self):
@@ -132,6 +150,20 @@ class Contact(BaseModel):
         return f"{self.first_name} {self.last_name}".strip()
 
 
+class Tag(models.Model):
+    """A normalized documentation tag, unique per organization."""
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='tags')
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ['name']
+        db_table = 'tags'
+        unique_together = ['organization', 'name']
+
+    def __str__(self):
+        return self.name
+
+
 class Documentation(BaseModel):
     """Documentation for IT infrastructure, configurations, and procedures."""
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='documentations')
@@ -150,12 +182,18 @@ class Documentation(BaseModel):
         default='other'
     )
     tags = models.CharField(max_length=500, blank=True, help_text='Comma-separated tags')
+    # Normalized copy of `tags`, kept in sync on save by core.tags
+    tag_set = models.ManyToManyField(Tag, blank=True, related_name='documentations', db_table='documentation_tags')
     is_published = models.BooleanField(default=False)
     version = models.IntegerField(default=1)
 
     class Meta:
         ordering = ['-created_at']
         db_table = 'documentations'
+        indexes = [
+            models.Index(fields=['-created_at'], condition=NOT_DELETED, name='documentation_live_created_idx'),
+            models.Index(fields=['organization', '-created_at'], condition=NOT_DELETED, name='documentation_live_org_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -184,6 +222,10 @@ class PasswordEntry(BaseModel):
     class Meta:
         ordering = ['organization', 'name']
         db_table = 'password_entries'
+        indexes = [
+            models.Index(fields=['organization', 'name'], condition=NOT_DELETED, name='password_live_order_idx'),
+            models.Index(fields=['organization', 'category', 'name'], condition=NOT_DELETED, name='password_live_category_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -213,6 +255,9 @@ class Configuration(BaseModel):
     class Meta:
         ordering = ['organization', 'config_type', 'name']
         db_table = 'configurations'
+        indexes = [
+            models.Index(fields=['organization', 'config_type', 'name'], condition=NOT_DELETED, name='configuration_live_order_idx'),
+        ]
         unique_together = ('organization', 'name')
 
     def __str__(self):
@@ -244,6 +289,7 @@ class NetworkDevice(BaseModel):
     model = models.CharField(max_length=255, blank=True)
     ip_address = models.CharField(max_length=50, blank=True)
     mac_address = models.CharField(max_length=50, blank=True)
+    mac_normalized = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     serial_number = models.CharField(max_length=255, blank=True)
 
     # Configuration
@@ -255,6 +301,9 @@ class NetworkDevice(BaseModel):
     class Meta:
         ordering = ['organization', 'device_type', 'name']
         db_table = 'network_devices'
+        indexes = [
+            models.Index(fields=['organization', 'device_type', 'name'], condition=NOT_DELETED, name='network_device_live_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_device_type_display()})"
@@ -293,6 +342,7 @@ class EndpointUser(BaseModel):
     # Network
     ip_address = models.CharField(max_length=50, blank=True)
     mac_address = models.CharField(max_length=50, blank=True)
+    mac_normalized = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     hostname = models.CharField(max_length=255, blank=True)
 
     # Other details
@@ -306,6 +356,10 @@ class EndpointUser(BaseModel):
     class Meta:
         ordering = ['organization', 'device_type', 'name']
         db_table = 'endpoint_users'
+        indexes = [
+            models.Index(fields=['warranty_expiry', 'organization'], name='endpoint_warranty_org_idx'),
+            models.Index(fields=['organization', 'device_type', 'name'], condition=NOT_DELETED, name='endpoint_user_live_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_device_type_display()})"
@@ -344,6 +398,7 @@ class Server(BaseModel):
     # Network
     ip_address = models.CharField(max_length=50, blank=True)
     mac_address = models.CharField(max_length=50, blank=True)
+    mac_normalized = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     hostname = models.CharField(max_length=255, blank=True)
 
     # Other details
@@ -355,6 +410,9 @@ class Server(BaseModel):
     class Meta:
         ordering = ['organization', 'server_type', 'name']
         db_table = 'servers'
+        indexes = [
+            models.Index(fields=['organization', 'server_type', 'name'], condition=NOT_DELETED, name='server_live_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_server_type_display()})"
@@ -382,6 +440,7 @@ class Peripheral(BaseModel):
     model = models.CharField(max_length=255, blank=True)
     ip_address = models.CharField(max_length=50, blank=True)
     mac_address = models.CharField(max_length=50, blank=True)
+    mac_normalized = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     serial_number = models.CharField(max_length=255, blank=True)
 
     # Other details
@@ -392,11 +451,107 @@ class Peripheral(BaseModel):
     class Meta:
         ordering = ['organization', 'device_type', 'name']
         db_table = 'peripherals'
+        indexes = [
+            models.Index(fields=['organization', 'device_type', 'name'], condition=NOT_DELETED, name='peripheral_live_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_device_type_display()})"
 
 
+class Subnet(BaseModel):
+    """A documented IP subnet, optionally tied to a location."""
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='subnets')
+    location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='subnets')
+    name = models.CharField(max_length=255, blank=True)
+    network = models.CharField(max_length=50, help_text='CIDR, e.g. 10.20.0.0/24')
+    vlan_id = models.PositiveIntegerField(null=True, blank=True)
+    gateway = models.GenericIPAddressField(null=True, blank=True)
+    description = models.TextField(blank=True)
+
+    # First and last address as sortable keys, maintained by core.ipam
+    start_key = models.CharField(max_length=32, editable=False)
+    end_key = models.CharField(max_length=32, editable=False)
+
+    class Meta:
+        ordering = ['organization', 'start_key']
+        db_table = 'subnets'
+        indexes = [
+            models.Index(fields=['organization', 'start_key'], name='subnet_org_start_idx'),
+            models.Index(fields=['location', 'start_key'], name='subnet_location_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.network})" if self.name else self.network
+
+
+class IPAddressEntry(models.Model):
+    """
+    A validated IP address found on a network device, endpoint, server or peripheral.
+
+    Derived from the device's ip_address text by core.ipam. `address` is an
+    inet column on PostgreSQL; `address_key` is the address as 32 hex digits
+    (IPv4 mapped into ::ffff:0:0/96), so subnet containment is a range scan on
+    any database.
+    """
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='ip_addresses')
+    location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='ip_addresses')
+    object_type = models.CharField(max_length=30)
+    object_id = models.UUIDField()
+    name = models.CharField(max_length=255, blank=True)
+    address = models.GenericIPAddressField()
+    address_key = models.CharField(max_length=32)
+    version = models.PositiveSmallIntegerField()
+
+    class Meta:
+        db_table = 'ip_addresses'
+        indexes = [
+            models.Index(fields=['organization', 'address_key'], name='ip_address_org_key_idx'),
+            models.Index(fields=['address_key'], name='ip_address_key_idx'),
+            models.Index(fields=['object_type', 'object_id'], name='ip_address_object_idx'),
+        ]
+
+    def __str__(self):
+        return self.address
+
+
+class AssetIndexEntry(models.Model):
+    """
+    Normalized identifiers of one device record, for lookup and duplicate detection.
+
+    Derived from NetworkDevice, EndpointUser, Server, Peripheral and RMMEndpoint
+    rows by core.asset_index. `asset_id` is the documented asset an RMM endpoint
+    was reconciled with (its own id otherwise), so a linked agent and its
+    documented endpoint or server count as one physical asset.
+    """
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='asset_index_entries')
+    location = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='asset_index_entries'
+    )
+    object_type = models.CharField(max_length=30)
+    object_id = models.UUIDField()
+    asset_id = models.UUIDField()
+    name = models.CharField(max_length=255, blank=True)
+    serial_number = models.CharField(max_length=255, blank=True)
+    hostname = models.CharField(max_length=255, blank=True)
+    mac_address = models.CharField(max_length=12, blank=True)
+
+    class Meta:
+        db_table = 'asset_index'
+        constraints = [
+            models.UniqueConstraint(fields=['object_type', 'object_id'], name='asset_index_object_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['serial_number', 'organization'], name='asset_index_serial_idx'),
+            models.Index(fields=['mac_address', 'organization'], name='asset_index_mac_idx'),
+            models.Index(fields=['organization', 'hostname'], name='asset_index_org_hostname_idx'),
+            models.Index(fields=['hostname'], name='asset_index_hostname_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.object_type}:{self.name}'
+
+
 class Software(BaseModel):
     """Software licenses and applications assigned to users."""
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='software')
@@ -443,6 +598,10 @@ class Software(BaseModel):
     class Meta:
         ordering = ['organization', 'software_type', 'name']
         db_table = 'software'
+        indexes = [
+            models.Index(fields=['expiry_date', 'organization'], name='software_expiry_org_idx'),
+            models.Index(fields=['organization', 'software_type', 'name'], condition=NOT_DELETED, name='software_live_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_software_type_display()})"
@@ -471,6 +630,82 @@ class SoftwareAssignment(BaseModel):
         return f"{self.software.name} -> {self.contact.full_name}"
 
 
+class SoftwareCatalogEntry(models.Model):
+    """A distinct installed software title, shared by all installations of it."""
+    name = models.CharField(max_length=255, help_text='Display name as first seen')
+    normalized_name = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        ordering = ['normalized_name']
+        db_table = 'software_catalog'
+        verbose_name_plural = 'Software catalog entries'
+
+    def __str__(self):
+        return self.name
+
+
+class SoftwareInstallation(models.Model):
+    """
+    A catalog title installed on one endpoint or server.
+
+    Derived from the machine's software_installed text by core.inventory.
+    version_key holds the numeric version parts zero-padded, to a fixed
+    number of parts, so versions compare correctly as strings.
+    """
+    catalog = models.ForeignKey(SoftwareCatalogEntry, on_delete=models.CASCADE, related_name='installations')
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='software_installations')
+    endpoint_user = models.ForeignKey(
+        EndpointUser, on_delete=models.CASCADE, null=True, blank=True, related_name='software_installations'
+    )
+    server = models.ForeignKey(
+        Server, on_delete=models.CASCADE, null=True, blank=True, related_name='software_installations'
+    )
+    version = models.CharField(max_length=100, blank=True)
+    version_key = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        db_table = 'software_installations'
+        indexes = [
+            models.Index(fields=['catalog', 'version_key'], name='sw_install_catalog_version_idx'),
+            models.Index(fields=['organization', 'catalog'], name='sw_install_org_catalog_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    models.Q(endpoint_user__isnull=False, server__isnull=True)
+                    | models.Q(endpoint_user__isnull=True, server__isnull=False)
+                ),
+                name='sw_install_one_machine',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.catalog.name} {self.version}".strip()
+
+
+class ComplianceReport(models.Model):
+    """
+    The last licence compliance report built for an organization.
+
+    Stored in the database rather than a per-process cache so every worker
+    serves the same report. A write that changes it clears `data` and bumps
+    `version` in the same transaction; a report is only stored over the
+    version it was built from (see core.compliance).
+    """
+    organization = models.OneToOneField(
+        Organization, on_delete=models.CASCADE, primary_key=True, related_name='compliance_report'
+    )
+    data = models.JSONField(encoder=DjangoJSONEncoder, null=True)
+    generated_at = models.DateTimeField(null=True)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'compliance_reports'
+
+    def __str__(self):
+        return f"Compliance report for {self.organization_id}"
+
+
 class Backup(BaseModel):
     """Backup solutions for servers, cloud services, and endpoints."""
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='backups')
@@ -513,6 +748,24 @@ class Backup(BaseModel):
         default='active'
     )
 
+    # Health, maintained by core.backup_health
+    health_status = models.CharField(
+        max_length=20,
+        choices=[
+            ('ok', 'OK'),
+            ('overdue', 'Overdue'),
+            ('failed', 'Failed'),
+            ('unknown', 'Unknown'),
+        ],
+        default='unknown',
+        editable=False,
+    )
+    overdue_since = models.DateTimeField(null=True, blank=True, editable=False)
+    health_checked_at = models.DateTimeField(null=True, blank=True, editable=False)
+    health_due_at = models.DateTimeField(
+        null=True, blank=True, editable=False, help_text='When the health status next needs re-evaluating'
+    )
+
     # Other details
     location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='backups')
     notes = models.TextField(blank=True)
@@ -521,6 +774,11 @@ class Backup(BaseModel):
     class Meta:
         ordering = ['organization', 'backup_type', 'name']
         db_table = 'backups'
+        indexes = [
+            models.Index(fields=['health_due_at'], name='backup_health_due_idx'),
+            models.Index(fields=['health_status', 'organization'], name='backup_health_org_idx'),
+            models.Index(fields=['organization', 'backup_type', 'name'], condition=NOT_DELETED, name='backup_live_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_backup_type_display()})"
@@ -574,6 +832,10 @@ class VoIP(BaseModel):
     class Meta:
         ordering = ['organization', 'voip_type', 'name']
         db_table = 'voip'
+        indexes = [
+            models.Index(fields=['expiry_date', 'organization'], name='voip_expiry_org_idx'),
+            models.Index(fields=['organization', 'voip_type', 'name'], condition=NOT_DELETED, name='voip_live_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_voip_type_display()})"
@@ -603,8 +865,189 @@ class VoIPAssignment(BaseModel):
     def __str__(self):
         return f"{self.voip.name} -> {self.contact.full_name}"
 
+
+class PhoneNumberEntry(models.Model):
+    """
+    A normalized phone number or extension found on a VoIP service, VoIP
+    assignment or contact.
+
+    Derived from the source's text fields by core.phone_index. Numbers are
+    stored in E.164 form (+15550100); extensions as bare digits.
+    """
+    KIND_CHOICES = [
+        ('number', 'Phone number'),
+        ('extension', 'Extension'),
+    ]
+    SOURCE_CHOICES = [
+        ('voip', 'VoIP service'),
+        ('voip_assignment', 'VoIP assignment'),
+        ('contact', 'Contact'),
+    ]
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='phone_numbers')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    number = models.CharField(max_length=20)
+    raw = models.CharField(max_length=100, blank=True, help_text='The text the number was parsed from')
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.UUIDField()
+    field = models.CharField(max_length=30)
+    voip = models.ForeignKey(VoIP, on_delete=models.CASCADE, null=True, blank=True, related_name='phone_entries')
+    contact = models.ForeignKey(Contact, on_delete=models.CASCADE, null=True, blank=True, related_name='phone_entries')
+
+    class Meta:
+        db_table = 'phone_numbers'
+        indexes = [
+            models.Index(fields=['kind', 'number'], name='phone_number_lookup_idx'),
+            models.Index(fields=['organization', 'kind', 'number'], name='phone_number_org_idx'),
+            models.Index(fields=['source_type', 'source_id'], name='phone_number_source_idx'),
+        ]
+
+    def __str__(self):
+        return self.number
+
+class RMMSource(BaseModel):
+    """A Tactical RMM instance synced into an organization on a schedule."""
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='rmm_sources')
+    name = models.CharField(max_length=255)
+    base_url = models.URLField(help_text='Tactical RMM API URL, e.g. https://api.rmm.example.com')
+    api_key = models.CharField(max_length=255)
+    sync_interval_minutes = models.PositiveIntegerField(default=60)
+    is_active = models.BooleanField(default=True)
+    fetch_details = models.BooleanField(
+        default=False, help_text='Also fetch per-agent software, patches and disks'
+    )
+
+    # Scheduling and run bookkeeping
+    next_sync_at = models.DateTimeField(null=True, blank=True, help_text='When the scheduler should sync next')
+    last_sync_at = models.DateTimeField(null=True, blank=True)
+    last_sync_status = models.CharField(
+        max_length=20,
+        choices=[
+            ('success', 'Success'),
+            ('failed', 'Failed'),
+            ('skipped', 'Skipped'),
+        ],
+        blank=True
+    )
+    last_error = models.TextField(blank=True)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    # Lease used as the sync lock on databases without advisory locks
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['organization', 'name']
+        db_table = 'rmm_sources'
+        unique_together = ('organization', 'name')
+        indexes = [
+            models.Index(fields=['is_active', 'next_sync_at'], name='rmm_source_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - {self.organization.name}"
+
+
+class RMMSyncRun(models.Model):
+    """History of RMM sync runs with timings and errors."""
+    source = models.ForeignKey(RMMSource, on_delete=models.CASCADE, null=True, blank=True, related_name='sync_runs')
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='rmm_sync_runs')
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('running', 'Running'),
+            ('success', 'Success'),
+            ('failed', 'Failed'),
+            ('skipped', 'Skipped'),
+        ],
+        default='running'
+    )
+    agents_total = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    stale_count = models.IntegerField(default=0)
+    details_fetched = models.IntegerField(default=0)
+    details_failed = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        db_table = 'rmm_sync_runs'
+        indexes = [
+            models.Index(fields=['source', '-started_at'], name='rmm_sync_run_source_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.organization_id} {self.started_at:%Y-%m-%d %H:%M} ({self.status})"
+
+
+class RMMRawPayloadManager(models.Manager):
+    """Manager for content-addressed RMM payloads."""
+
+    def store(self, payload):
+        """Store a payload (if not already present) and return its content hash."""
+        if not payload:
+            return None
+        content_hash, blob, size = RMMRawPayload.encode(payload)
+        self.bulk_create(
+            [RMMRawPayload(content_hash=content_hash, data=blob, size=size)],
+            ignore_conflicts=True,
+        )
+        return content_hash
+
+    def orphaned(self):
+        """Return payloads no longer referenced by any endpoint."""
+        return self.get_queryset().filter(endpoints__isnull=True)
+
+
+class RMMRawPayload(models.Model):
+    """Raw agent JSON from Tactical RMM, zlib-compressed and deduplicated by SHA-256."""
+    content_hash = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+    size = models.IntegerField(default=0, help_text='Uncompressed payload size in bytes')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = RMMRawPayloadManager()
+
+    class Meta:
+        db_table = 'rmm_raw_payloads'
+
+    def __str__(self):
+        return self.content_hash
+
+    @staticmethod
+    def encode(payload):
+        """Return (content_hash, compressed_blob, raw_size) for a JSON-serializable payload."""
+        raw = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+        return hashlib.sha256(raw).hexdigest(), zlib.compress(raw), len(raw)
+
+    def load(self):
+        """Decompress and decode the stored payload."""
+        return json.loads(zlib.decompress(bytes(self.data)).decode('utf-8'))
+
+
+# Disk usage expressions shared by RMMEndpointQuerySet annotations and the
+# matching expression indexes, so the planner can use the index for sorting
+DISK_USED_GB = F('disk_total_gb') - F('disk_free_gb')
+DISK_USAGE_PERCENT = Coalesce(
+    (F('disk_total_gb') - F('disk_free_gb')) * Value(100.0) / NullIf(F('disk_total_gb'), Value(0.0)),
+    Value(0.0),
+)
+
+
+class RMMEndpointQuerySet(models.QuerySet):
+    """QuerySet with database-side disk usage calculations."""
+
+    def with_disk_usage(self):
+        """Annotate disk_used (GB) and disk_usage (percent) so they can be filtered and sorted in SQL."""
+        return self.annotate(disk_used=DISK_USED_GB, disk_usage=DISK_USAGE_PERCENT)
+
+
 class RMMEndpoint(BaseModel):
     """Endpoint data synced from Tactical RMM"""
+    INACTIVE_STATUSES = ['offline', 'unknown', 'stale']
+
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='rmm_endpoints')
     location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='rmm_endpoints')
     
@@ -645,19 +1088,42 @@ class RMMEndpoint(BaseModel):
             ('online', 'Online'),
             ('offline', 'Offline'),
             ('unknown', 'Unknown'),
+            ('stale', 'Stale'),
         ],
         default='unknown'
     )
     
     # Identification
     serial_number = models.CharField(max_length=255, blank=True)
+    mac_address = models.CharField(max_length=50, blank=True)
+    mac_normalized = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
+
+    # Documented assets this endpoint was reconciled with
+    endpoint_user = models.ForeignKey(
+        EndpointUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='rmm_endpoints'
+    )
+    server = models.ForeignKey(
+        Server, on_delete=models.SET_NULL, null=True, blank=True, related_name='rmm_endpoints'
+    )
     
     # Sync tracking
+    source = models.ForeignKey(
+        RMMSource, on_delete=models.SET_NULL, null=True, blank=True, related_name='endpoints'
+    )
     last_seen = models.DateTimeField(null=True, blank=True, help_text='Last time seen in RMM')
     last_sync = models.DateTimeField(auto_now=True)
+    inventory_hash = models.CharField(
+        max_length=64, blank=True, help_text='Summary hash at the last per-agent detail fetch'
+    )
+    inventory_synced_at = models.DateTimeField(null=True, blank=True)
     
-    # Raw RMM data
-    raw_rmm_data = models.JSONField(default=dict, blank=True)
+    # Raw RMM data lives in a side table so listings only read the narrow row
+    raw_payload = models.ForeignKey(
+        RMMRawPayload, on_delete=models.SET_NULL, null=True, blank=True, related_name='endpoints'
+    )
+
+    objects = SoftDeleteManager.from_queryset(RMMEndpointQuerySet)()
+    all_objects = models.Manager.from_queryset(RMMEndpointQuerySet)()
     
     class Meta:
         ordering = ['-last_sync']
@@ -665,11 +1131,23 @@ class RMMEndpoint(BaseModel):
         indexes = [
             models.Index(fields=['organization', '-last_sync']),
             models.Index(fields=['status']),
+            models.Index(fields=['status', 'last_seen'], name='rmm_endpoint_status_seen_idx'),
+            models.Index(fields=['organization', 'operating_system'], name='rmm_endpoint_org_os_idx'),
+            models.Index(DISK_USED_GB, name='rmm_endpoint_disk_used_idx'),
+            models.Index(DISK_USAGE_PERCENT, name='rmm_endpoint_disk_usage_idx'),
+            models.Index(fields=['-last_sync'], condition=NOT_DELETED, name='rmm_endpoint_live_sync_idx'),
         ]
     
     def __str__(self):
         return f"{self.name} ({self.status})"
     
+    @property
+    def raw_rmm_data(self):
+        """Full agent payload, loaded from the side table on first access."""
+        if self.raw_payload_id is None:
+            return {}
+        return self.raw_payload.load()
+
     @property
     def disk_used_gb(self):
         return self.disk_total_gb - self.disk_free_gb
@@ -678,4 +1156,147 @@ class RMMEndpoint(BaseModel):
     def disk_usage_percent(self):
         if self.disk_total_gb > 0:
             return round((self.disk_used_gb / self.disk_total_gb) * 100, 2)
-        return 0
\ No newline at end of file
+        return 0
+
+
+class RMMSoftware(models.Model):
+    """Software installed on an RMM endpoint, as reported by the agent."""
+    endpoint = models.ForeignKey(RMMEndpoint, on_delete=models.CASCADE, related_name='software')
+    name = models.CharField(max_length=255)
+    version = models.CharField(max_length=100, blank=True)
+    publisher = models.CharField(max_length=255, blank=True)
+    install_date = models.CharField(max_length=50, blank=True)
+
+    class Meta:
+        db_table = 'rmm_software'
+        indexes = [
+            models.Index(fields=['endpoint']),
+            models.Index(fields=['name', 'version']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} {self.version}".strip()
+
+
+class RMMPatch(models.Model):
+    """Windows update state for an RMM endpoint."""
+    endpoint = models.ForeignKey(RMMEndpoint, on_delete=models.CASCADE, related_name='patches')
+    kb = models.CharField(max_length=50, blank=True)
+    title = models.CharField(max_length=500)
+    severity = models.CharField(max_length=50, blank=True)
+    installed = models.BooleanField(default=False)
+    date_installed = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'rmm_patches'
+        indexes = [
+            models.Index(fields=['endpoint', 'installed']),
+            models.Index(fields=['kb']),
+        ]
+
+    def __str__(self):
+        return self.kb or self.title
+
+
+class RMMDisk(models.Model):
+    """A disk or volume reported by an RMM endpoint."""
+    endpoint = models.ForeignKey(RMMEndpoint, on_delete=models.CASCADE, related_name='disks')
+    device = models.CharField(max_length=100)
+    fstype = models.CharField(max_length=50, blank=True)
+    total_gb = models.FloatField(default=0)
+    free_gb = models.FloatField(default=0)
+
+    class Meta:
+        db_table = 'rmm_disks'
+        indexes = [
+            models.Index(fields=['endpoint']),
+        ]
+
+    def __str__(self):
+        return self.device
+
+
+class SearchEntry(models.Model):
+    """
+    One row per searchable object in the unified search index.
+
+    Maintained by core.search_index; `body` holds pre-tokenized text so every
+    entity type is matched by the same full-text index.
+    """
+    object_type = models.CharField(max_length=50)
+    object_id = models.UUIDField()
+    organization = models.ForeignKey(
+        Organization, on_delete=models.CASCADE, null=True, blank=True, related_name='search_entries'
+    )
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_entries'
+        unique_together = ['object_type', 'object_id']
+        indexes = [
+            models.Index(fields=['organization', 'object_type']),
+        ]
+        verbose_name_plural = 'Search entries'
+
+    def __str__(self):
+        return f"{self.object_type}: {self.title}"
+
+
+class FuzzyTrigram(models.Model):
+    """
+    Trigram postings for fuzzy search on databases without pg_trgm.
+
+    One row per (object, field, trigram); maintained by core.fuzzy and only
+    written on non-PostgreSQL databases.
+    """
+    object_type = models.CharField(max_length=50)
+    object_id = models.UUIDField()
+    field = models.CharField(max_length=50)
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        db_table = 'fuzzy_trigrams'
+        indexes = [
+            models.Index(fields=['object_type', 'trigram', 'object_id'], name='fuzzy_trigram_lookup_idx'),
+            models.Index(fields=['object_id'], name='fuzzy_trigram_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.object_type}.{self.field}: {self.trigram!r}"
+
+
+class ArchivedRow(models.Model):
+    """
+    A soft-deleted row moved out of its table by the retention job.
+
+    Column values are kept as zlib-compressed JSON (see core.retention);
+    object_type uses the same names as the trash.
+    """
+    object_type = models.CharField(max_length=50)
+    object_id = models.UUIDField()
+    organization_id = models.UUIDField(null=True, blank=True)
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.BinaryField()
+
+    class Meta:
+        db_table = 'archived_rows'
+        indexes = [
+            models.Index(fields=['object_type', 'object_id'], name='archived_row_object_idx'),
+            models.Index(fields=['organization_id', 'archived_at'], name='archived_row_org_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.object_type}: {self.object_id}"
+
+    @staticmethod
+    def encode(values):
+        """Compressed JSON for a row's {column: value} dict."""
+        return zlib.compress(json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8'))
+
+    def load(self):
+        """The archived {column: value} dict, values as JSON types."""
+        return json.loads(zlib.decompress(bytes(self.data)).decode('utf-8'))
@@ -0,0 +1,36 @@
+"""Query parameter parsing shared by the API views."""
+import uuid
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def parse_uuid(value):
+    """UUID from a parameter value, None when blank; ValueError when malformed."""
+    if value in (None, ''):
+        return None
+    return uuid.UUID(str(value))
+
+
+def uuid_param(request, name, required=False):
+    """
+    (UUID or None, error Response or None) for the `name` parameter.
+
+    POST bodies are read too when the query string lacks it. A malformed id is
+    always an error; a missing one only when `required`.
+    """
+    value = request.query_params.get(name)
+    if value is None and request.method != 'GET' and isinstance(request.data, dict):
+        value = request.data.get(name)
+    try:
+        parsed = parse_uuid(value)
+    except ValueError:
+        return None, Response({'detail': f'Invalid {name}.'}, status=status.HTTP_400_BAD_REQUEST)
+    if parsed is None and required:
+        return None, Response({'detail': f'{name} is required.'}, status=status.HTTP_400_BAD_REQUEST)
+    return parsed, None
+
+
+def organization_id_param(request, required=False):
+    """uuid_param() for the organization_id parameter."""
+    return uuid_param(request, 'organization_id', required=required)
@@ -0,0 +1,327 @@
+"""
+Phone number and extension index for reverse lookup.
+
+VoIP.phone_numbers / VoIP.extensions are comma-separated text and
+VoIPAssignment.phone_number, Contact.phone and Contact.mobile are free text.
+On every save they are parsed into PhoneNumberEntry rows (numbers in E.164,
+extensions as digits), so "who owns this number" is one indexed equality
+lookup. The rebuild_phone_index command refills the table in bulk.
+
+Numbers written without a country code are read as national numbers of the
+organization's country, falling back to PHONE_DEFAULT_COUNTRY_CODE. Changing
+an organization's country re-indexes its numbers under the new calling code.
+"""
+import re
+
+from decouple import config
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_save, post_delete, pre_save
+
+from .models import Contact, Organization, PhoneNumberEntry, VoIP, VoIPAssignment
+from .soft_delete import chunked, soft_delete_changed
+
+DEFAULT_COUNTRY_CODE = config('PHONE_DEFAULT_COUNTRY_CODE', default='1')
+BATCH_SIZE = 1000
+MAX_EXTENSION_LENGTH = 6
+# Largest extension range ("100-199") expanded into individual extensions
+MAX_EXTENSION_RANGE = 1000
+
+# Organization.country (lower-cased name or ISO code) -> calling code
+COUNTRY_CODES = {
+    'us': '1', 'usa': '1', 'united states': '1', 'united states of america': '1', 'ca': '1', 'canada': '1',
+    'gb': '44', 'uk': '44', 'united kingdom': '44', 'ie': '353', 'ireland': '353',
+    'de': '49', 'germany': '49', 'at': '43', 'austria': '43', 'ch': '41', 'switzerland': '41',
+    'fr': '33', 'france': '33', 'be': '32', 'belgium': '32', 'nl': '31', 'netherlands': '31',
+    'lu': '352', 'luxembourg': '352', 'es': '34', 'spain': '34', 'pt': '351', 'portugal': '351',
+    'it': '39', 'italy': '39', 'se': '46', 'sweden': '46', 'no': '47', 'norway': '47',
+    'dk': '45', 'denmark': '45', 'fi': '358', 'finland': '358', 'pl': '48', 'poland': '48',
+    'au': '61', 'australia': '61', 'nz': '64', 'new zealand': '64', 'za': '27', 'south africa': '27',
+    'in': '91', 'india': '91', 'sg': '65', 'singapore': '65', 'jp': '81', 'japan': '81',
+    'mx': '52', 'mexico': '52', 'br': '55', 'brazil': '55',
+}
+
+# source_type -> model and the (field, kind) pairs it contributes
+SOURCES = {
+    'voip': {'model': VoIP, 'fields': [('phone_numbers', 'number'), ('extensions', 'extension')]},
+    'voip_assignment': {'model': VoIPAssignment, 'fields': [('phone_number', 'number'), ('extension', 'extension')]},
+    'contact': {'model': Contact, 'fields': [('phone', 'number'), ('mobile', 'number')]},
+}
+SOURCE_TYPES = {spec['model']: source_type for source_type, spec in SOURCES.items()}
+
+_ITEM_SPLIT_RE = re.compile(r'[,;/\n]+')
+# Trailing extension on a number: "555-0100 x12", "ext. 12"
+_NUMBER_EXTENSION_RE = re.compile(r'\s*(?:x|ext\.?|extension|#)\s*\d+\s*$', re.IGNORECASE)
+_EXTENSION_RANGE_RE = re.compile(r'^(\d+)\s*(?:-|to|\.\.)\s*(\d+)$')
+_NON_DIGIT_RE = re.compile(r'\D')
+# Trunk prefix kept after a country code: "+44 (0) 20 7946 0958"
+_TRUNK_RE = re.compile(r'\(\s*0\s*\)')
+
+
+def country_code(country):
+    return COUNTRY_CODES.get(' '.join((country or '').lower().split()), DEFAULT_COUNTRY_CODE)
+
+
+def normalize_number(raw, default_code=DEFAULT_COUNTRY_CODE):
+    """E.164 form of a phone number ('+12125550100'), or '' if it can't be one."""
+    text = _NUMBER_EXTENSION_RE.sub('', (raw or '').strip())
+    if text.startswith(('+', '00')):
+        text = _TRUNK_RE.sub('', text)
+    digits = _NON_DIGIT_RE.sub('', text)
+    if not digits:
+        return ''
+    if text.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif default_code == '1' and digits.startswith('011'):
+        digits = digits[3:]
+    elif default_code == '1':
+        # NANP: 10 digits without the 1, or 11 with it
+        if not (len(digits) == 11 and digits.startswith('1')):
+            digits = '1' + digits
+    else:
+        digits = default_code + digits.lstrip('0')
+    if not 7 <= len(digits) <= 15 or digits.startswith('0'):
+        return ''
+    if digits.startswith('1') and len(digits) != 11:
+        # NANP numbers always have 10 national digits; local 7-digit numbers lack the area code
+        return ''
+    return '+' + digits
+
+
+def normalize_extension(raw):
+    digits = _NON_DIGIT_RE.sub('', raw or '')
+    return digits if 1 <= len(digits) <= MAX_EXTENSION_LENGTH else ''
+
+
+def parse_numbers(text, default_code=DEFAULT_COUNTRY_CODE):
+    """[(e164, raw)] from separated text, de-duplicated."""
+    numbers = {}
+    for raw in _ITEM_SPLIT_RE.split(text or ''):
+        number = normalize_number(raw, default_code)
+        if number:
+            numbers.setdefault(number, raw.strip()[:100])
+    return list(numbers.items())
+
+
+def parse_extensions(text):
+    """[(extension, raw)] from separated text; "100-109" ranges are expanded."""
+    extensions = {}
+    for raw in _ITEM_SPLIT_RE.split(text or ''):
+        raw = raw.strip()
+        match = _EXTENSION_RANGE_RE.match(raw)
+        if match and len(match.group(1)) == len(match.group(2)):
+            low, high = int(match.group(1)), int(match.group(2))
+            if 0 <= high - low < MAX_EXTENSION_RANGE:
+                for value in range(low, high + 1):
+                    extensions.setdefault(str(value).zfill(len(match.group(1))), raw[:100])
+                continue
+        for part in raw.split():
+            extension = normalize_extension(part)
+            if extension:
+                extensions.setdefault(extension, raw[:100])
+    return list(extensions.items())
+
+
+def _entries(source_type, obj, organization_id, default_code):
+    entries = []
+    for field, kind in SOURCES[source_type]['fields']:
+        value = getattr(obj, field)
+        parsed = parse_numbers(value, default_code) if kind == 'number' else parse_extensions(value)
+        entries.extend(
+            PhoneNumberEntry(
+                organization_id=organization_id, kind=kind, number=number, raw=raw,
+                source_type=source_type, source_id=obj.pk, field=field,
+                voip_id=obj.pk if source_type == 'voip' else getattr(obj, 'voip_id', None),
+                contact_id=obj.pk if source_type == 'contact' else getattr(obj, 'contact_id', None),
+            )
+            for number, raw in parsed
+        )
+    return entries
+
+
+def _organization_ids(source_type, objects):
+    """{object pk: organization id}; assignments take their VoIP service's organization."""
+    if source_type != 'voip_assignment':
+        return {obj.pk: obj.organization_id for obj in objects}
+    voip_orgs = dict(VoIP.all_objects.filter(
+        pk__in={obj.voip_id for obj in objects}
+    ).values_list('pk', 'organization_id'))
+    return {obj.pk: voip_orgs.get(obj.voip_id) for obj in objects}
+
+
+def sync_sources(source_type, objects):
+    """
+    Replace the index rows of `objects` (instances of one source model) from their text.
+
+    Soft-deleted sources are left without rows. Returns the number of rows written.
+    """
+    organizations = _organization_ids(source_type, objects)
+    codes = {
+        pk: country_code(country)
+        for pk, country in Organization.all_objects.filter(
+            pk__in=set(organizations.values())
+        ).values_list('pk', 'country')
+    }
+    entries = []
+    for obj in objects:
+        organization_id = organizations[obj.pk]
+        if obj.deleted_at is None and organization_id:
+            entries.extend(_entries(source_type, obj, organization_id, codes.get(organization_id, DEFAULT_COUNTRY_CODE)))
+    with transaction.atomic():
+        PhoneNumberEntry.objects.filter(source_type=source_type, source_id__in=[obj.pk for obj in objects]).delete()
+        PhoneNumberEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+    return len(entries)
+
+
+def index_source(sender, instance, created, update_fields=None, **kwargs):
+    source_type = SOURCE_TYPES[sender]
+    fields = {field for field, _ in SOURCES[source_type]['fields']}
+    if update_fields and not {'deleted_at', 'organization', 'voip', 'contact', *fields}.intersection(update_fields):
+        return
+    sync_sources(source_type, [instance])
+    if source_type == 'voip':
+        # Assignments are indexed under their service's organization
+        sync_sources('voip_assignment', list(VoIPAssignment.all_objects.filter(voip_id=instance.pk)))
+
+
+def unindex_source(sender, instance, **kwargs):
+    PhoneNumberEntry.objects.filter(source_type=SOURCE_TYPES[sender], source_id=instance.pk).delete()
+
+
+def resync_sources(sender, pks, deleted, **kwargs):
+    source_type = SOURCE_TYPES[sender]
+    for chunk in chunked(pks, BATCH_SIZE):
+        if deleted:
+            PhoneNumberEntry.objects.filter(source_type=source_type, source_id__in=chunk).delete()
+            continue
+        sync_sources(source_type, list(sender.all_objects.filter(pk__in=chunk)))
+
+
+def reindex_organization(organization_id):
+    """Rebuild the rows of every source in one organization. Returns the number of rows written."""
+    written = 0
+    for source_type, spec in SOURCES.items():
+        organization = 'voip__organization_id' if source_type == 'voip_assignment' else 'organization_id'
+        pks = list(spec['model'].all_objects.filter(**{organization: organization_id}).values_list('pk', flat=True))
+        for chunk in chunked(pks, BATCH_SIZE):
+            written += sync_sources(source_type, list(spec['model'].all_objects.filter(pk__in=chunk)))
+    return written
+
+
+def remember_country(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or (update_fields and 'country' not in update_fields):
+        return
+    instance._indexed_country = Organization.all_objects.filter(pk=instance.pk).values_list('country', flat=True).first()
+
+
+def reindex_on_country_change(sender, instance, created, **kwargs):
+    if not hasattr(instance, '_indexed_country'):
+        return
+    old = instance.__dict__.pop('_indexed_country')
+    if country_code(old) != country_code(instance.country):
+        reindex_organization(instance.pk)
+
+
+def connect_signals():
+    for source_type, spec in SOURCES.items():
+        post_save.connect(index_source, sender=spec['model'], dispatch_uid=f'phone-index-save-{source_type}')
+        post_delete.connect(unindex_source, sender=spec['model'], dispatch_uid=f'phone-index-delete-{source_type}')
+        soft_delete_changed.connect(resync_sources, sender=spec['model'], dispatch_uid=f'phone-index-cascade-{source_type}')
+    pre_save.connect(remember_country, sender=Organization, dispatch_uid='phone-index-country')
+    post_save.connect(reindex_on_country_change, sender=Organization, dispatch_uid='phone-index-country-save')
+
+
+def rebuild_index(batch_size=BATCH_SIZE):
+    """Rebuild every source's rows. Returns {source_type: rows written}."""
+    counts = {}
+    for source_type, spec in SOURCES.items():
+        fields = [field for field, _ in spec['fields']]
+        extra = ['voip_id', 'contact_id'] if source_type == 'voip_assignment' else ['organization_id']
+        queryset = spec['model'].all_objects.order_by('pk').only('id', 'deleted_at', *extra, *fields)
+        written = 0
+        batch = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                written += sync_sources(source_type, batch)
+                batch = []
+        if batch:
+            written += sync_sources(source_type, batch)
+        counts[source_type] = written
+    return counts
+
+
+def _owners(entries):
+    return [
+        {
+            'number': entry.number,
+            'kind': entry.kind,
+            'source_type': entry.source_type,
+            'source_id': entry.source_id,
+            'field': entry.field,
+            'raw': entry.raw,
+            'organization_id': entry.organization_id,
+            'organization_name': entry.organization.name,
+            'contact_id': entry.contact_id,
+            'contact_name': entry.contact.full_name if entry.contact_id else None,
+            'voip_id': entry.voip_id,
+            'voip_name': entry.voip.name if entry.voip_id else None,
+        }
+        for entry in entries
+    ]
+
+
+def reverse_lookup(number=None, extension=None, organization_id=None):
+    """
+    Owners of a phone number (any organization unless given) or of an
+    extension within one organization.
+    """
+    if number is not None:
+        queryset = PhoneNumberEntry.objects.filter(kind='number', number=number)
+        if organization_id:
+            queryset = queryset.filter(organization_id=organization_id)
+    else:
+        queryset = PhoneNumberEntry.objects.filter(
+            organization_id=organization_id, kind='extension', number=extension
+        )
+    return _owners(queryset.select_related('organization', 'contact', 'voip').order_by('source_type', 'field'))
+
+
+def extension_conflicts(organization_id=None):
+    """
+    Extensions in use by more than one contact or listed by more than one
+    VoIP service in the same organization, each with all its owners.
+    """
+    groups = PhoneNumberEntry.objects.filter(kind='extension')
+    if organization_id:
+        groups = groups.filter(organization_id=organization_id)
+    groups = groups.values('organization_id', 'number').annotate(
+        contacts=Count('contact_id', distinct=True, filter=Q(source_type='voip_assignment')),
+        services=Count('voip_id', distinct=True),
+    ).filter(Q(contacts__gt=1) | Q(services__gt=1)).order_by('organization_id', 'number')
+    conflicts = {(row['organization_id'], row['number']): row for row in groups}
+    if not conflicts:
+        return []
+
+    owners = {}
+    entries = PhoneNumberEntry.objects.filter(
+        kind='extension',
+        organization_id__in={organization for organization, _ in conflicts},
+        number__in={number for _, number in conflicts},
+    ).select_related('organization', 'contact', 'voip').order_by('source_type', 'field')
+    for owner in _owners(entries):
+        key = (owner['organization_id'], owner['number'])
+        if key in conflicts:
+            owners.setdefault(key, []).append(owner)
+    return [
+        {
+            'organization_id': organization,
+            'extension': number,
+            'contacts': row['contacts'],
+            'services': row['services'],
+            'owners': owners.get((organization, number), []),
+        }
+        for (organization, number), row in conflicts.items()
+    ]
@@ -0,0 +1,63 @@
+"""
+Query plan inspection.
+
+Runs EXPLAIN on a queryset and reports the tables read with a full
+sequential scan, together with the table's row count, so list queries that
+outgrow their indexes show up before they get slow. Works on PostgreSQL
+("Seq Scan on ...") and SQLite ("SCAN ..." without an index).
+"""
+import re
+
+from django.db import connection
+
+_POSTGRES_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+# "SCAN endpoint_users", "SCAN TABLE endpoint_users AS U0"; "SCAN ... USING INDEX" walks an index
+_SQLITE_SCAN_RE = re.compile(r'\bSCAN (?:TABLE )?(\w+)(?: AS \w+)?(.*)$')
+
+
+def explain(queryset):
+    """The database's plan for a queryset as text."""
+    return queryset.explain()
+
+
+def scanned_tables(plan, vendor=None):
+    """Tables read with a sequential scan in an EXPLAIN output, in plan order."""
+    vendor = vendor or connection.vendor
+    tables = []
+    for line in plan.splitlines():
+        if vendor == 'postgresql':
+            match = _POSTGRES_SCAN_RE.search(line)
+            table = match.group(1) if match else None
+        else:
+            match = _SQLITE_SCAN_RE.search(line)
+            table = match.group(1) if match and 'USING' not in match.group(2) else None
+        if table and table not in tables:
+            tables.append(table)
+    return tables
+
+
+def table_rows(table):
+    """Row count of a table: the planner's estimate on PostgreSQL, an exact count elsewhere."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+        else:
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+        row = cursor.fetchone()
+    return max(int(row[0]), 0) if row else 0
+
+
+def sequential_scans(queryset, threshold=0, row_counts=None):
+    """
+    ({table: rows}, plan) for the tables a queryset scans sequentially that
+    hold more than `threshold` rows. `row_counts` caches counts across calls.
+    """
+    row_counts = {} if row_counts is None else row_counts
+    plan = explain(queryset)
+    scans = {}
+    for table in scanned_tables(plan):
+        if table not in row_counts:
+            row_counts[table] = table_rows(table)
+        if row_counts[table] > threshold:
+            scans[table] = row_counts[table]
+    return scans, plan
@@ -0,0 +1,211 @@
+"""
+Reconciliation between RMM endpoints and documented assets.
+
+Each organization is reconciled with a fixed number of queries: one read per
+model, hash indexes built in memory on serial number, MAC address and hostname,
+and bulk writes for links and back-filled hardware fields.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .bulk import bulk_update_values
+from .compliance import invalidate as invalidate_compliance
+from .asset_index import normalize_hostname, normalize_serial
+from .mac import normalize_mac
+from .models import RMMEndpoint, EndpointUser, Server
+from .soft_delete import soft_delete_changed
+
+# Match keys in priority order
+MATCH_KEYS = ('serial_number', 'mac_address', 'hostname')
+
+BATCH_SIZE = 1000
+
+# Documented asset models, the RMMEndpoint FK that links to them, and the
+# fields read to build their indexes
+DOCUMENTED_MODELS = (
+    (EndpointUser, 'endpoint_user'),
+    (Server, 'server'),
+)
+ASSET_FIELDS = (
+    'id', 'organization_id', 'name', 'hostname', 'serial_number', 'mac_address',
+    'cpu', 'ram', 'storage', 'operating_system',
+)
+RMM_FIELDS = (
+    'id', 'organization_id', 'agent_id', 'name', 'serial_number', 'mac_address',
+    'cpu_model', 'cpu_cores', 'ram_gb', 'disk_total_gb', 'operating_system',
+    'endpoint_user_id', 'server_id',
+)
+
+
+def _asset_keys(asset):
+    """Yield (key_type, normalized_value) pairs for a documented asset."""
+    yield 'serial_number', normalize_serial(asset.serial_number)
+    yield 'mac_address', normalize_mac(asset.mac_address)
+    yield 'hostname', normalize_hostname(asset.hostname)
+    # Devices are often documented by hostname in the name field only
+    yield 'hostname', normalize_hostname(asset.name)
+
+
+def _rmm_keys(endpoint):
+    yield 'serial_number', normalize_serial(endpoint.serial_number)
+    yield 'mac_address', normalize_mac(endpoint.mac_address)
+    yield 'hostname', normalize_hostname(endpoint.name)
+
+
+def build_index(assets):
+    """Build {key_type: {normalized_value: asset}} hash indexes; ambiguous values are dropped."""
+    index = {key: {} for key in MATCH_KEYS}
+    ambiguous = {key: set() for key in MATCH_KEYS}
+    for asset in assets:
+        for key, value in _asset_keys(asset):
+            if not value or value in ambiguous[key]:
+                continue
+            existing = index[key].get(value)
+            if existing is not None and existing is not asset:
+                # Two assets share the identifier, so it cannot decide a match
+                del index[key][value]
+                ambiguous[key].add(value)
+            else:
+                index[key][value] = asset
+    return index
+
+
+def backfill_values(endpoint, asset):
+    """Return {field: value} for blank hardware fields on `asset` that RMM can fill."""
+    candidates = {
+        'cpu': endpoint.cpu_model,
+        'ram': f'{endpoint.ram_gb:g}GB' if endpoint.ram_gb else '',
+        'storage': f'{endpoint.disk_total_gb:g}GB' if endpoint.disk_total_gb else '',
+        'operating_system': endpoint.operating_system if endpoint.operating_system != 'Unknown' else '',
+        'serial_number': normalize_serial(endpoint.serial_number) and endpoint.serial_number.strip(),
+        'mac_address': endpoint.mac_address if normalize_mac(endpoint.mac_address) else '',
+        'hostname': endpoint.name if endpoint.name != 'Unknown' else '',
+    }
+    values = {
+        field: value for field, value in candidates.items()
+        if value and not getattr(asset, field)
+    }
+    if 'mac_address' in values:
+        # Bulk updates skip the pre_save hook that keeps the canonical column
+        values['mac_normalized'] = normalize_mac(values['mac_address'])
+    return values
+
+
+def reconcile_organization(organization_id, backfill=False, link=True):
+    """
+    Reconcile RMM endpoints of one organization against EndpointUser and Server rows.
+
+    Returns a report dict with matched, rmm_only and documentation_only lists.
+    When `link` is set, matched endpoints get their endpoint_user/server FK set;
+    when `backfill` is set, blank hardware fields on documented assets are filled
+    from RMM data. All writes are bulk updates in a single transaction.
+    """
+    assets = []
+    asset_model = {}
+    for model, link_field in DOCUMENTED_MODELS:
+        rows = list(model.objects.filter(organization_id=organization_id).only(*ASSET_FIELDS))
+        for asset in rows:
+            asset_model[asset.pk] = (model, link_field)
+        assets.extend(rows)
+    index = build_index(assets)
+
+    endpoints = list(
+        RMMEndpoint.objects.filter(organization_id=organization_id).only(*RMM_FIELDS).order_by()
+    )
+
+    matched = []
+    rmm_only = []
+    claimed = set()
+    linked_endpoints = []
+    updated_assets = {model: {} for model, _ in DOCUMENTED_MODELS}
+    updated_fields = {model: set() for model, _ in DOCUMENTED_MODELS}
+
+    for endpoint in endpoints:
+        asset = None
+        matched_on = None
+        for key, value in _rmm_keys(endpoint):
+            candidate = index[key].get(value) if value else None
+            if candidate is not None and candidate.pk not in claimed:
+                asset, matched_on = candidate, key
+                break
+
+        if asset is None:
+            rmm_only.append({'id': endpoint.pk, 'agent_id': endpoint.agent_id, 'name': endpoint.name})
+            continue
+
+        claimed.add(asset.pk)
+        model, link_field = asset_model[asset.pk]
+        matched.append({
+            'rmm_endpoint_id': endpoint.pk,
+            'rmm_name': endpoint.name,
+            'asset_type': link_field,
+            'asset_id': asset.pk,
+            'asset_name': asset.name,
+            'matched_on': matched_on,
+        })
+
+        if link:
+            other_field = 'server_id' if link_field == 'endpoint_user' else 'endpoint_user_id'
+            if getattr(endpoint, f'{link_field}_id') != asset.pk or getattr(endpoint, other_field) is not None:
+                setattr(endpoint, f'{link_field}_id', asset.pk)
+                setattr(endpoint, other_field, None)
+                linked_endpoints.append(endpoint)
+
+        if backfill:
+            values = backfill_values(endpoint, asset)
+            if values:
+                for field, value in values.items():
+                    setattr(asset, field, value)
+                updated_assets[model][asset.pk] = asset
+                updated_fields[model].update(values)
+
+    documentation_only = [
+        {'asset_type': asset_model[asset.pk][1], 'asset_id': asset.pk, 'asset_name': asset.name}
+        for asset in assets if asset.pk not in claimed
+    ]
+
+    now = timezone.now()
+    with transaction.atomic():
+        bulk_update_values(
+            RMMEndpoint,
+            {
+                endpoint.pk: {'endpoint_user': endpoint.endpoint_user_id, 'server': endpoint.server_id, 'updated_at': now}
+                for endpoint in linked_endpoints
+            },
+            ['endpoint_user', 'server', 'updated_at'],
+            batch_size=BATCH_SIZE,
+        )
+        backfilled = 0
+        for model, rows in updated_assets.items():
+            if not rows:
+                continue
+            fields = sorted(updated_fields[model] | {'updated_at'})
+            for asset in rows.values():
+                asset.updated_at = now
+            backfilled += bulk_update_values(
+                model,
+                {pk: {field: getattr(asset, field) for field in fields} for pk, asset in rows.items()},
+                fields,
+                batch_size=BATCH_SIZE,
+            )
+        # Bulk updates skip the save signals that maintain the derived indexes
+        # (asset, search, fuzzy, ...); they resync written rows on this signal
+        if linked_endpoints:
+            soft_delete_changed.send(
+                sender=RMMEndpoint, pks=[endpoint.pk for endpoint in linked_endpoints], deleted=False
+            )
+        for model, rows in updated_assets.items():
+            if rows:
+                soft_delete_changed.send(sender=model, pks=list(rows), deleted=False)
+    if linked_endpoints:
+        # Linked agents stop counting as RMM-only installs
+        invalidate_compliance(organization_id)
+
+    return {
+        'organization_id': organization_id,
+        'matched': matched,
+        'rmm_only': rmm_only,
+        'documentation_only': documentation_only,
+        'linked': len(linked_endpoints),
+        'backfilled': backfilled,
+    }
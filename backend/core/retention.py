@@ -0,0 +1,169 @@
+"""
+Retention for soft-deleted rows.
+
+Soft-deleted rows stay in their tables until an administrator purges them,
+and every live query and index pays for them. apply_policy() removes rows
+that have been in the trash longer than their type's retention period,
+either archiving them first (compressed JSON in archived_rows) or deleting
+them outright, in bounded batches: each batch is its own short transaction,
+so locks are held for one batch only and the job can be paused between
+batches or stopped at a deadline.
+
+Rows that a purge would take live rows down with (an organization whose
+contacts were restored individually) are held back and reported instead.
+
+Policies default to TRASH_RETENTION_DAYS and TRASH_RETENTION_ACTION; the
+TRASH_RETENTION setting overrides single types, e.g.
+``TRASH_RETENTION=rmm_endpoint:7:purge,documentation:365``.
+"""
+import time
+from datetime import timedelta
+
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import ArchivedRow, BaseModel
+from .query_plans import table_rows
+from .soft_delete import cascade_order, cascade_relations, purge_plan, purge_rows
+from .tags import delete_orphaned_tags
+from .trash import TRASH_MODELS
+
+ACTIONS = ('archive', 'purge', 'keep')
+DEFAULT_DAYS = config('TRASH_RETENTION_DAYS', default=90, cast=int)
+DEFAULT_ACTION = config('TRASH_RETENTION_ACTION', default='archive')
+OVERRIDES = config('TRASH_RETENTION', default='', cast=Csv())
+BATCH_SIZE = 500
+
+# Types whose default does not fit; TRASH_RETENTION still wins
+POLICIES = {
+    # Recreated by the next RMM sync, nothing worth archiving
+    'rmm_endpoint': (30, 'purge'),
+}
+
+OBJECT_TYPES = {spec['model']: object_type for object_type, spec in TRASH_MODELS.items()}
+
+
+def policies():
+    """{type: (days, action)} for every trash type."""
+    result = {object_type: POLICIES.get(object_type, (DEFAULT_DAYS, DEFAULT_ACTION)) for object_type in TRASH_MODELS}
+    for override in OVERRIDES:
+        parts = override.strip().split(':')
+        try:
+            object_type, days = parts[0], int(parts[1])
+            action = parts[2] if len(parts) > 2 else result[object_type][1]
+        except (IndexError, KeyError, ValueError):
+            raise ImproperlyConfigured(f'Invalid TRASH_RETENTION entry {override!r}; expected type:days[:action].')
+        result[object_type] = (days, action)
+    for object_type, (days, action) in result.items():
+        if action not in ACTIONS or days < 0:
+            raise ImproperlyConfigured(f'Invalid retention policy for {object_type}: {days} days, {action!r}.')
+    return result
+
+
+def leaf_first(object_types):
+    """Types ordered so rows are handled before the rows they cascade from, and keep their own policy."""
+    return sorted(object_types, key=lambda object_type: len(cascade_order(TRASH_MODELS[object_type]['model'])))
+
+
+def _live_dependents(model):
+    """Condition matching rows of `model` whose purge would cascade to a live row."""
+    condition = Q()
+    for child, field in cascade_relations(model):
+        children = child.all_objects.filter(**{field: OuterRef('pk')})
+        condition |= Exists(children.filter(Q(deleted_at__isnull=True) | _live_dependents(child)))
+    return condition
+
+
+def expired(object_type, cutoff):
+    """(rows due for removal, rows held back by live dependents) deleted before `cutoff`."""
+    model = TRASH_MODELS[object_type]['model']
+    rows = model.objects.deleted().filter(deleted_at__lt=cutoff)
+    condition = _live_dependents(model)
+    if not condition:
+        return rows, rows.none()
+    return rows.exclude(condition), rows.filter(condition)
+
+
+def table_size(table):
+    """Bytes used by a table and its indexes, or None where the database cannot tell."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s::regclass)', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT SUM(pgsize) FROM dbstat WHERE name = %s OR name IN "
+                "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                [table, table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def archive_rows(model, queryset):
+    """Copy the rows of `queryset` into archived_rows. Returns the number archived."""
+    object_type = OBJECT_TYPES[model]
+    rows = [
+        ArchivedRow(
+            object_type=object_type,
+            object_id=values['id'],
+            organization_id=values['id'] if model is TRASH_MODELS['organization']['model'] else values.get('organization_id'),
+            deleted_at=values['deleted_at'],
+            data=ArchivedRow.encode(values),
+        )
+        for values in queryset.values()
+    ]
+    ArchivedRow.objects.bulk_create(rows)
+    return len(rows)
+
+
+def apply_policy(object_type, days, action, batch_size=BATCH_SIZE, pause=0.0, deadline=None, now=None):
+    """
+    Archive or purge `object_type` rows deleted more than `days` ago.
+
+    Stops early once time.monotonic() passes `deadline`. Returns a report dict:
+    removed, archived, cascaded ({model_name: rows}), held, batches,
+    reclaimed_bytes (estimated from the table's size per row) and stopped.
+    """
+    model = TRASH_MODELS[object_type]['model']
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    report = {
+        'action': action, 'days': days, 'removed': 0, 'archived': 0, 'cascaded': {},
+        'held': 0, 'batches': 0, 'reclaimed_bytes': None, 'stopped': False,
+    }
+    if action == 'keep':
+        return report
+
+    table = model._meta.db_table
+    size, rows_before = table_size(table), table_rows(table)
+    due, held = expired(object_type, cutoff)
+    while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            report['stopped'] = True
+            break
+        with transaction.atomic():
+            pks = list(due.values_list('pk', flat=True).order_by('deleted_at')[:batch_size])
+            if not pks:
+                break
+            if action == 'archive':
+                for current, queryset, field in purge_plan(model, pks):
+                    if field is None and issubclass(current, BaseModel):
+                        report['archived'] += archive_rows(current, queryset)
+            counts = purge_rows(model, pks)
+            if counts.get('documentation'):
+                delete_orphaned_tags()
+        report['batches'] += 1
+        report['removed'] += counts.pop(model._meta.model_name, 0)
+        for name, count in counts.items():
+            report['cascaded'][name] = report['cascaded'].get(name, 0) + count
+        if pause:
+            time.sleep(pause)
+
+    report['held'] = held.count()
+    if size and rows_before:
+        report['reclaimed_bytes'] = size * report['removed'] // rows_before
+    return report
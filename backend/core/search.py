@@ -0,0 +1,248 @@
+"""
+Full-text search over large text columns.
+
+PostgreSQL keeps a generated, weighted ``search_vector`` tsvector column with a
+GIN index on each indexed table. SQLite (development) keeps an external-content
+FTS5 table maintained by triggers. Both are updated by the database on every
+write, so saves only re-index the changed row.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, TextField
+from django.db.models.expressions import RawSQL
+
+# db_table -> weighted columns (weights A-D, highest first), the column used for
+# snippets, and optionally the PostgreSQL text search config / FTS5 tokenizer
+FULL_TEXT_INDEXES = {
+    'documentations': {
+        'columns': [('title', 'A'), ('content', 'B'), ('tags', 'B')],
+        'snippet_column': 'content',
+    },
+    'configurations': {
+        'columns': [('name', 'A'), ('description', 'B'), ('content', 'C')],
+        'snippet_column': 'content',
+    },
+    # Unified cross-entity index; its text is pre-tokenized by core.search_index
+    'search_entries': {
+        'columns': [('title', 'A'), ('body', 'B')],
+        'snippet_column': 'body',
+        'config': 'simple',
+        'tokenize': 'unicode61',
+    },
+}
+
+# BM25 column weights used on SQLite, mirroring the PostgreSQL weights
+SQLITE_WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 2.0, 'D': 1.0}
+
+SNIPPET_START = '<mark>'
+SNIPPET_STOP = '</mark>'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_indexed(model):
+    return model._meta.db_table in FULL_TEXT_INDEXES
+
+
+def search_terms(query):
+    """Split free text into word tokens; punctuation never reaches the query parser."""
+    return _TOKEN_RE.findall(query or '')[:16]
+
+
+def _qn(name):
+    return connection.ops.quote_name(name)
+
+
+class ExactTerm(str):
+    """A query token matched as a whole token rather than as a prefix."""
+
+
+def _ts_query(terms):
+    """tsquery / FTS5 MATCH expression for the given tokens, prefix-matching all but ExactTerm ones."""
+    if connection.vendor == 'postgresql':
+        return ' & '.join(term if isinstance(term, ExactTerm) else f'{term}:*' for term in terms)
+    return ' '.join(f'"{term}"' if isinstance(term, ExactTerm) else f'"{term}"*' for term in terms)
+
+
+def _fts_table(table):
+    return f'{table}_fts'
+
+
+def _ts_config(table):
+    return FULL_TEXT_INDEXES[table].get('config', 'english')
+
+
+def match_expression(model, terms):
+    """PostgreSQL: boolean expression selecting rows whose search_vector matches all terms."""
+    table = model._meta.db_table
+    sql = f"{_qn(table)}.search_vector @@ to_tsquery('{_ts_config(table)}', %s)"
+    return RawSQL(sql, [_ts_query(terms)], output_field=BooleanField())
+
+
+def rank_expression(model, terms):
+    """PostgreSQL: relevance score (higher is better) for rows selected by match_expression()."""
+    table = model._meta.db_table
+    sql = f"ts_rank_cd({_qn(table)}.search_vector, to_tsquery('{_ts_config(table)}', %s))"
+    return RawSQL(sql, [_ts_query(terms)], output_field=FloatField())
+
+
+def snippet_expression(model, terms, words=24):
+    """PostgreSQL: highlighted excerpt of the snippet column around the matched terms."""
+    table = model._meta.db_table
+    column = FULL_TEXT_INDEXES[table]['snippet_column']
+    config = _ts_config(table)
+    options = f'StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxWords={words}, MinWords={words // 2}'
+    sql = f"ts_headline('{config}', {_qn(table)}.{_qn(column)}, to_tsquery('{config}', %s), %s)"
+    return RawSQL(sql, [_ts_query(terms), options], output_field=TextField())
+
+
+def _sqlite_join(queryset, terms):
+    """
+    SQLite: join the FTS5 table on rowid and select its bm25 rank.
+
+    A join lets the MATCH drive the query once; correlated per-row subqueries
+    would re-run the full-text query for every matching row.
+    """
+    table = queryset.model._meta.db_table
+    fts = _qn(_fts_table(table))
+    weights = ', '.join(str(SQLITE_WEIGHTS[weight]) for _, weight in FULL_TEXT_INDEXES[table]['columns'])
+    return queryset.extra(
+        tables=[_fts_table(table)],
+        where=[f'{fts}.rowid = {_qn(table)}.rowid', f'{fts} MATCH %s'],
+        params=[_ts_query(terms)],
+        select={'search_rank': f'-bm25({fts}, {weights})'},
+    )
+
+
+def _sqlite_snippet(queryset, words=24):
+    table = queryset.model._meta.db_table
+    spec = FULL_TEXT_INDEXES[table]
+    column_index = [name for name, _ in spec['columns']].index(spec['snippet_column'])
+    fts = _qn(_fts_table(table))
+    return queryset.extra(
+        select={'search_snippet': f"snippet({fts}, {column_index}, %s, %s, '…', {words})"},
+        select_params=[SNIPPET_START, SNIPPET_STOP],
+    )
+
+
+def full_text_filter(queryset, query, terms=None):
+    """Restrict `queryset` to rows matching `query`, annotated with search_rank."""
+    terms = terms if terms is not None else search_terms(query)
+    if not terms:
+        return queryset.none()
+    if connection.vendor != 'postgresql':
+        return _sqlite_join(queryset, terms)
+    model = queryset.model
+    return queryset.filter(match_expression(model, terms)).annotate(
+        search_rank=rank_expression(model, terms)
+    )
+
+
+def ranked_search(queryset, query, terms=None):
+    """Matching rows ordered by relevance, annotated with search_rank and search_snippet."""
+    terms = terms if terms is not None else search_terms(query)
+    if not terms:
+        return queryset.none()
+    queryset = full_text_filter(queryset, query, terms)
+    if connection.vendor != 'postgresql':
+        return _sqlite_snippet(queryset).order_by('-search_rank')
+    return queryset.annotate(
+        search_snippet=snippet_expression(queryset.model, terms)
+    ).order_by('-search_rank')
+
+
+# ---------------------------------------------------------------------------
+# Index DDL (shared by the migration and the SQLite post_migrate repair)
+# ---------------------------------------------------------------------------
+
+def postgres_index_sql(table):
+    columns = FULL_TEXT_INDEXES[table]['columns']
+    config = _ts_config(table)
+    vector = ' || '.join(
+        f"setweight(to_tsvector('{config}', coalesce({_qn(column)}, '')), '{weight}')"
+        for column, weight in columns
+    )
+    return [
+        f'ALTER TABLE {_qn(table)} ADD COLUMN IF NOT EXISTS search_vector tsvector '
+        f'GENERATED ALWAYS AS ({vector}) STORED',
+        f'CREATE INDEX IF NOT EXISTS {_qn(table + "_search_vector_idx")} ON {_qn(table)} USING gin (search_vector)',
+    ]
+
+
+def postgres_drop_sql(table):
+    return [
+        f'DROP INDEX IF EXISTS {_qn(table + "_search_vector_idx")}',
+        f'ALTER TABLE {_qn(table)} DROP COLUMN IF EXISTS search_vector',
+    ]
+
+
+def sqlite_index_sql(table):
+    fts = _fts_table(table)
+    tokenize = FULL_TEXT_INDEXES[table].get('tokenize', 'porter unicode61')
+    columns = [column for column, _ in FULL_TEXT_INDEXES[table]['columns']]
+    cols = ', '.join(_qn(column) for column in columns)
+    new_values = ', '.join(f'new.{_qn(column)}' for column in columns)
+    old_values = ', '.join(f'old.{_qn(column)}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {_qn(fts)} ({_qn(fts)}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values});"
+    )
+    insert_new = f'INSERT INTO {_qn(fts)} (rowid, {cols}) VALUES (new.rowid, {new_values});'
+    return [
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {_qn(fts)} USING fts5({cols}, '
+        f"content={_qn(table)}, content_rowid='rowid', tokenize='{tokenize}')",
+        f'CREATE TRIGGER IF NOT EXISTS {_qn(fts + "_ai")} AFTER INSERT ON {_qn(table)} BEGIN {insert_new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {_qn(fts + "_ad")} AFTER DELETE ON {_qn(table)} BEGIN {delete_old} END',
+        f'CREATE TRIGGER IF NOT EXISTS {_qn(fts + "_au")} AFTER UPDATE OF {cols} ON {_qn(table)} '
+        f'BEGIN {delete_old} {insert_new} END',
+    ]
+
+
+def sqlite_drop_sql(table):
+    fts = _fts_table(table)
+    return [
+        f'DROP TRIGGER IF EXISTS {_qn(fts + suffix)}' for suffix in ('_ai', '_ad', '_au')
+    ] + [f'DROP TABLE IF EXISTS {_qn(fts)}']
+
+
+def rebuild_full_text_index(table, using_connection=None):
+    """Drop and recreate one table's full-text index, e.g. after its columns changed."""
+    conn = using_connection or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for sql in postgres_drop_sql(table) + postgres_index_sql(table):
+                cursor.execute(sql)
+        elif conn.vendor == 'sqlite':
+            for sql in sqlite_drop_sql(table) + sqlite_index_sql(table):
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {_qn(_fts_table(table))} ({_qn(_fts_table(table))}) VALUES ('rebuild')")
+
+
+def ensure_sqlite_indexes(using_connection=None):
+    """
+    (Re)create SQLite FTS5 tables and triggers, rebuilding any that were missing
+    or index other columns than FULL_TEXT_INDEXES lists.
+
+    Django rebuilds SQLite tables for many ALTER operations, which drops their
+    triggers, so this runs after every migrate.
+    """
+    conn = using_connection or connection
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        existing_tables = set(conn.introspection.table_names(cursor))
+        for table in FULL_TEXT_INDEXES:
+            if table not in existing_tables:
+                continue
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s AND name LIKE %s",
+                [table, f'{_fts_table(table)}_%'],
+            )
+            triggers = cursor.fetchone()[0]
+            cursor.execute(f'PRAGMA table_info({_qn(_fts_table(table))})')
+            columns = [row[1] for row in cursor.fetchall()]
+            if triggers == 3 and columns == [column for column, _ in FULL_TEXT_INDEXES[table]['columns']]:
+                continue
+            for sql in sqlite_drop_sql(table) + sqlite_index_sql(table):
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {_qn(_fts_table(table))} ({_qn(_fts_table(table))}) VALUES ('rebuild')")
@@ -0,0 +1,287 @@
+"""
+Unified cross-entity search index.
+
+Every searchable object has one SearchEntry row with its type, organization,
+title, a short subtitle and pre-tokenized text, all covered by the
+search_entries full-text index (see core.search). Entries are written by
+post_save/post_delete signals: soft-deleted objects are dropped from the
+index and restored ones re-added. Queryset.update() and bulk_create() bypass
+the signals, so run the rebuild_search_index command after bulk imports.
+"""
+import re
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .models import (
+    Organization, Location, Contact, Documentation, PasswordEntry, Configuration,
+    NetworkDevice, EndpointUser, Server, Peripheral, Software, Backup, VoIP,
+    RMMEndpoint, SearchEntry,
+)
+from .search import ExactTerm, full_text_filter
+from .soft_delete import chunked, soft_delete_changed
+
+# object_type -> model, display label, and the fields making up the title,
+# subtitle and indexed text. Secrets (passwords, licence keys) are never indexed.
+SEARCHABLE_MODELS = {
+    'organization': {
+        'model': Organization, 'label': 'Organizations',
+        'title': ['name'], 'subtitle': ['city', 'country'],
+        'text': ['description', 'email', 'phone', 'website', 'address', 'city', 'country'],
+    },
+    'location': {
+        'model': Location, 'label': 'Locations',
+        'title': ['name'], 'subtitle': ['city', 'country'],
+        'text': ['description', 'address', 'city', 'postal_code', 'phone'],
+    },
+    'contact': {
+        'model': Contact, 'label': 'Contacts',
+        'title': ['first_name', 'last_name'], 'subtitle': ['title', 'email'],
+        'text': ['email', 'phone', 'mobile', 'title'],
+    },
+    'documentation': {
+        'model': Documentation, 'label': 'Documentation',
+        'title': ['title'], 'subtitle': ['category'],
+        'text': ['category', 'tags', 'content'],
+    },
+    'password': {
+        'model': PasswordEntry, 'label': 'Passwords',
+        'title': ['name'], 'subtitle': ['username'],
+        'text': ['username', 'url', 'category'],
+    },
+    'configuration': {
+        'model': Configuration, 'label': 'Configurations',
+        'title': ['name'], 'subtitle': ['config_type', 'version'],
+        'text': ['config_type', 'version', 'description'],
+    },
+    'network_device': {
+        'model': NetworkDevice, 'label': 'Network Devices',
+        'title': ['name'], 'subtitle': ['manufacturer', 'model'],
+        'text': [
+            'device_type', 'manufacturer', 'model', 'ip_address', 'mac_address',
+            'serial_number', 'firmware_version', 'internet_provider',
+        ],
+    },
+    'endpoint_user': {
+        'model': EndpointUser, 'label': 'Endpoints',
+        'title': ['name'], 'subtitle': ['hostname', 'ip_address'],
+        'text': [
+            'device_type', 'manufacturer', 'model', 'operating_system', 'ip_address',
+            'mac_address', 'hostname', 'serial_number',
+        ],
+    },
+    'server': {
+        'model': Server, 'label': 'Servers',
+        'title': ['name'], 'subtitle': ['hostname', 'ip_address'],
+        'text': [
+            'server_type', 'role', 'manufacturer', 'model', 'operating_system', 'ip_address',
+            'mac_address', 'hostname', 'serial_number',
+        ],
+    },
+    'peripheral': {
+        'model': Peripheral, 'label': 'Peripherals',
+        'title': ['name'], 'subtitle': ['manufacturer', 'model'],
+        'text': ['device_type', 'manufacturer', 'model', 'ip_address', 'mac_address', 'serial_number'],
+    },
+    'software': {
+        'model': Software, 'label': 'Software',
+        'title': ['name'], 'subtitle': ['vendor', 'version'],
+        'text': ['software_type', 'vendor', 'version', 'license_type'],
+    },
+    'backup': {
+        'model': Backup, 'label': 'Backups',
+        'title': ['name'], 'subtitle': ['vendor', 'backup_type'],
+        'text': ['backup_type', 'vendor', 'frequency', 'storage_location', 'target_systems'],
+    },
+    'voip': {
+        'model': VoIP, 'label': 'VoIP',
+        'title': ['name'], 'subtitle': ['vendor'],
+        'text': ['voip_type', 'vendor', 'phone_numbers', 'extensions'],
+    },
+    'rmm_endpoint': {
+        'model': RMMEndpoint, 'label': 'RMM Endpoints',
+        'title': ['name'], 'subtitle': ['operating_system'],
+        'text': ['operating_system', 'serial_number', 'mac_address', 'logged_in_user', 'cpu_model'],
+    },
+}
+
+OBJECT_TYPES = {spec['model']: object_type for object_type, spec in SEARCHABLE_MODELS.items()}
+
+# Long free text (documentation bodies) is truncated before tokenizing
+MAX_TEXT_CHARS = 20000
+MAX_QUERY_TERMS = 16
+REBUILD_BATCH_SIZE = 1000
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+# Dotted, dashed or colon-separated identifiers: IPs, MACs, serials, hostnames
+_IDENTIFIER_RE = re.compile(r'\w+(?:[.:/-]\w+)+', re.UNICODE)
+# Separators are spelled out inside identifier tokens so both tokenizers keep
+# them as one word; "x" is escaped first, which keeps the encoding unambiguous
+_SEPARATOR_CODES = {'x': 'xx', '.': 'xd', ':': 'xc', '/': 'xs', '-': 'xh'}
+_SEPARATOR_RE = re.compile(r'[x.:/-]')
+_EDGE_PUNCTUATION_RE = re.compile(r'^\W+|\W+$', re.UNICODE)
+
+
+def identifier_token(identifier):
+    """Single index token for a lower-cased identifier (``10.0.4.12`` -> ``10xd0xd4xd12``)."""
+    return _SEPARATOR_RE.sub(lambda match: _SEPARATOR_CODES[match.group()], identifier)
+
+
+def tokenize(*values):
+    """
+    Lower-cased, de-duplicated tokens for the index.
+
+    Identifiers are indexed both as their parts and as one token keeping their
+    separators, so a full IP, MAC or serial query matches that identifier only.
+    """
+    tokens = {}
+    for value in values:
+        text = str(value or '').lower()
+        for identifier in _IDENTIFIER_RE.findall(text):
+            tokens.setdefault(identifier_token(identifier), None)
+        for word in _WORD_RE.findall(text):
+            tokens.setdefault(word, None)
+    return ' '.join(tokens)
+
+
+def query_terms(query):
+    """
+    Split a search query the same way tokenize() splits indexed text.
+
+    Words are prefix-matched; identifiers must match a whole indexed
+    identifier, so 10.0.4.12 does not also find 10.0.4.120 or 10.0.41.2.
+    """
+    terms = []
+    for chunk in (query or '').lower().split():
+        chunk = _EDGE_PUNCTUATION_RE.sub('', chunk)
+        if _IDENTIFIER_RE.fullmatch(chunk):
+            terms.append(ExactTerm(identifier_token(chunk)))
+        else:
+            terms.extend(_WORD_RE.findall(chunk))
+    return terms[:MAX_QUERY_TERMS]
+
+
+def _join(obj, fields, separator):
+    return separator.join(str(value) for value in (getattr(obj, field) for field in fields) if value)
+
+
+def build_entry(object_type, obj):
+    """Unsaved SearchEntry for `obj`."""
+    spec = SEARCHABLE_MODELS[object_type]
+    title = _join(obj, spec['title'], ' ') or str(obj)
+    text = [str(getattr(obj, field) or '')[:MAX_TEXT_CHARS] for field in spec['text']]
+    return SearchEntry(
+        object_type=object_type,
+        object_id=obj.pk,
+        organization_id=obj.pk if object_type == 'organization' else obj.organization_id,
+        title=title[:255],
+        subtitle=_join(obj, spec['subtitle'], ' · ')[:255],
+        body=tokenize(title, *text),
+    )
+
+
+def save_entries(entries):
+    """Insert or update entries in one statement per batch."""
+    return SearchEntry.objects.bulk_create(
+        entries,
+        batch_size=REBUILD_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['object_type', 'object_id'],
+        update_fields=['organization', 'title', 'subtitle', 'body', 'updated_at'],
+    )
+
+
+def _indexed_fields(object_type):
+    spec = SEARCHABLE_MODELS[object_type]
+    return {'deleted_at', 'organization', *spec['title'], *spec['subtitle'], *spec['text']}
+
+
+def index_object(sender, instance, update_fields=None, **kwargs):
+    object_type = OBJECT_TYPES.get(sender)
+    if object_type is None:
+        return
+    if update_fields and not _indexed_fields(object_type).intersection(update_fields):
+        return
+    if instance.deleted_at is not None:
+        SearchEntry.objects.filter(object_type=object_type, object_id=instance.pk).delete()
+    else:
+        save_entries([build_entry(object_type, instance)])
+
+
+def unindex_object(sender, instance, **kwargs):
+    object_type = OBJECT_TYPES.get(sender)
+    if object_type is not None:
+        SearchEntry.objects.filter(object_type=object_type, object_id=instance.pk).delete()
+
+
+def reindex_objects(sender, pks, deleted, **kwargs):
+    object_type = OBJECT_TYPES.get(sender)
+    if object_type is None:
+        return
+    for chunk in chunked(pks, REBUILD_BATCH_SIZE):
+        if deleted:
+            SearchEntry.objects.filter(object_type=object_type, object_id__in=chunk).delete()
+        else:
+            save_entries([build_entry(object_type, obj) for obj in sender.objects.filter(pk__in=chunk)])
+
+
+def connect_signals():
+    for object_type, spec in SEARCHABLE_MODELS.items():
+        post_save.connect(index_object, sender=spec['model'], dispatch_uid=f'search-index-save-{object_type}')
+        post_delete.connect(unindex_object, sender=spec['model'], dispatch_uid=f'search-index-delete-{object_type}')
+        soft_delete_changed.connect(reindex_objects, sender=spec['model'], dispatch_uid=f'search-index-cascade-{object_type}')
+
+
+def rebuild_index(object_types=None, batch_size=REBUILD_BATCH_SIZE):
+    """Rebuild entries for the given types (default all). Returns {object_type: count}."""
+    counts = {}
+    for object_type in object_types or SEARCHABLE_MODELS:
+        model = SEARCHABLE_MODELS[object_type]['model']
+        count = 0
+        with transaction.atomic():
+            SearchEntry.objects.filter(object_type=object_type).delete()
+            batch = []
+            for obj in model.objects.order_by().iterator(chunk_size=batch_size):
+                batch.append(build_entry(object_type, obj))
+                if len(batch) >= batch_size:
+                    SearchEntry.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                SearchEntry.objects.bulk_create(batch)
+                count += len(batch)
+        counts[object_type] = count
+    return counts
+
+
+def global_search(query, organization_id=None, object_types=None, limit=50):
+    """
+    Best `limit` entries across all types for `query`, ranked in one indexed query.
+
+    Entries of soft-deleted organizations are excluded.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    queryset = SearchEntry.objects.filter(organization__deleted_at__isnull=True)
+    if organization_id:
+        queryset = queryset.filter(organization_id=organization_id)
+    if object_types:
+        queryset = queryset.filter(object_type__in=object_types)
+    queryset = full_text_filter(queryset, query, terms).select_related('organization')
+    return list(queryset.order_by('-search_rank', 'title')[:limit])
+
+
+def group_results(entries):
+    """Group ranked entries by type; groups are ordered by their best hit."""
+    groups = {}
+    for entry in entries:
+        group = groups.get(entry.object_type)
+        if group is None:
+            group = groups[entry.object_type] = {
+                'type': entry.object_type,
+                'label': SEARCHABLE_MODELS[entry.object_type]['label'],
+                'results': [],
+            }
+        group['results'].append(entry)
+    return list(groups.values())
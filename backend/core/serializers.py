@@ -1,10 +1,262 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db import models
+from django.db.models import Q
+from django.db.models.signals import pre_save
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
 from .models import (
     Organization, Location, Contact, Documentation,
-    PasswordEntry, Configuration, NetworkDevice, EndpointUser, Server, Peripheral, Software, SoftwareAssignment, Backup, VoIP, VoIPAssignment
+    PasswordEntry, Configuration, NetworkDevice, EndpointUser, Server, Peripheral, Software, SoftwareAssignment, Backup, VoIP, VoIPAssignment, RMMEndpoint,
+    SearchEntry, SoftwareCatalogEntry, SoftwareInstallation, Subnet, IPAddressEntry
 )
+from .ipam import parse_network, usable_hosts
+from .mac import get_database as get_oui_database
+from .bulk import bulk_update_values
+from .soft_delete import soft_delete_changed
 from users.serializers import UserSerializer
 
+BULK_BATCH_SIZE = 1000
+
+
+class _PrefetchedQueryset:
+    """
+    Stands in for a related field's queryset while a list is validated:
+    every referenced row is fetched with one IN query up front, and get(pk=...)
+    answers from memory instead of querying once per item.
+    """
+
+    def __init__(self, queryset, values):
+        self.pk_field = queryset.model._meta.pk
+        self.does_not_exist = queryset.model.DoesNotExist
+        keys = set()
+        for value in values:
+            try:
+                keys.add(self.pk_field.to_python(value))
+            except (DjangoValidationError, AttributeError, TypeError, ValueError):
+                continue
+        self.rows = queryset.in_bulk(keys)
+
+    def get(self, pk):
+        try:
+            key = self.pk_field.to_python(pk)
+        except (AttributeError, TypeError):
+            raise TypeError
+        if key not in self.rows:
+            raise self.does_not_exist
+        return self.rows[key]
+
+
+class _RequiredFieldsOnly:
+    """
+    Stands in for a UniqueTogetherValidator while a list is validated: it
+    still requires the fields, but uniqueness is checked for the whole list
+    at once (BulkListSerializer._unique_errors) instead of item by item.
+    """
+    requires_context = True
+
+    def __init__(self, validator):
+        self.validator = validator
+
+    def __call__(self, attrs, serializer):
+        self.validator.enforce_required_fields(attrs, serializer)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validates and saves a list of items in one pass for the bulk endpoints.
+
+    Each item is validated against its own instance (for updates), related
+    primary keys are resolved with one query per field, and rows are written
+    with bulk_create() or one UPDATE ... FROM VALUES per batch. Model pre_save
+    receivers run in memory; derived indexes are updated through
+    soft_delete_changed. A child serializer can list write-only fields in
+    `bulk_related_fields`; they are kept off the model and handed to its
+    bulk_save_related([(instance, {field: value}), ...]) after the write.
+
+    unique_together is checked on the final values of the whole list: two
+    items with the same key are an error even though neither exists yet, and
+    rows being updated in the same request (e.g. two contacts swapping
+    emails) do not conflict with their own old values.
+    """
+
+    def _prefetch_relations(self, data):
+        swapped = []
+        for field in self.child.fields.values():
+            if field.read_only:
+                continue
+            relation = getattr(field, 'child_relation', field)
+            if not isinstance(relation, serializers.PrimaryKeyRelatedField) or relation.pk_field is not None:
+                continue
+            values = []
+            for item in data:
+                value = item.get(field.field_name) if isinstance(item, dict) else None
+                values.extend(value if isinstance(value, list) else [value])
+            swapped.append((relation, relation.queryset))
+            relation.queryset = _PrefetchedQueryset(relation.get_queryset(), [v for v in values if v is not None])
+        return swapped
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({'non_field_errors': ['Expected a list of items.']}, code='not_a_list')
+        swapped = self._prefetch_relations(data)
+        validators = self.child.validators
+        self.child.validators = [
+            _RequiredFieldsOnly(validator) if isinstance(validator, UniqueTogetherValidator) else validator
+            for validator in validators
+        ]
+        ret, errors = [], []
+        try:
+            for index, item in enumerate(data):
+                self.child.instance = self.instance[index] if self.instance is not None else None
+                try:
+                    ret.append(self.child.run_validation(item))
+                    errors.append({})
+                except serializers.ValidationError as exc:
+                    ret.append(None)
+                    errors.append(exc.detail)
+        finally:
+            self.child.instance = None
+            self.child.validators = validators
+            for relation, queryset in swapped:
+                relation.queryset = queryset
+        for index, error in enumerate(self._unique_errors(ret)):
+            if error and not errors[index]:
+                errors[index] = error
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return ret
+
+    def _unique_errors(self, items):
+        """
+        Per-item errors ({} when fine) for unique_together clashes among the
+        validated `items` (None for items that failed) and with rows outside
+        the list. Deleted rows count: the database constraint covers them too.
+        """
+        errors = [{} for _ in items]
+        batch_pks = [instance.pk for instance in self.instance] if self.instance is not None else []
+        for validator in self.child.validators:
+            if not isinstance(validator, UniqueTogetherValidator):
+                continue
+            sources = [self.child.fields[name].source for name in validator.fields]
+            model = validator.queryset.model
+            attnames = [model._meta.get_field(source).attname for source in sources]
+            message = validator.message.format(field_names=', '.join(validator.fields))
+            first = {}
+            for index, attrs in enumerate(items):
+                if attrs is None:
+                    continue
+                instance = self.instance[index] if self.instance is not None else None
+                key = tuple(
+                    getattr(attrs[source], 'pk', attrs[source]) if source in attrs
+                    else getattr(instance, attname, None)
+                    for source, attname in zip(sources, attnames)
+                )
+                if None in key:
+                    continue
+                if key in first:
+                    errors[index] = {'non_field_errors': [f'{message} Item {first[key]} has the same values.']}
+                else:
+                    first[key] = index
+            keys = list(first)
+            for start in range(0, len(keys), BULK_BATCH_SIZE):
+                condition = Q()
+                for key in keys[start:start + BULK_BATCH_SIZE]:
+                    condition |= Q(**dict(zip(attnames, key)))
+                taken = model._base_manager.filter(condition).exclude(pk__in=batch_pks).values_list(*attnames)
+                for key in taken:
+                    if tuple(key) in first:
+                        errors[first[tuple(key)]] = {'non_field_errors': [message]}
+        return errors
+
+    def _release_unique_keys(self, model, pairs, befores):
+        """
+        Move rows taking over another row's unique_together key in this list
+        (two contacts swapping emails) onto a placeholder key first: unique
+        constraints are checked row by row, so the swap would collide halfway
+        through one UPDATE. The placeholder is the row's pk in the key's first
+        text field; keys without one are written as they are.
+        """
+        for names in model._meta.unique_together:
+            key_fields = [model._meta.get_field(name) for name in names]
+            placeholder = next((
+                field for field in key_fields
+                if isinstance(field, models.CharField) and (field.max_length or 36) >= 36
+            ), None)
+            if placeholder is None:
+                continue
+            old_keys = {tuple(before[field.name] for field in key_fields) for before in befores}
+            moving = {
+                instance.pk: {placeholder.name: str(instance.pk)}
+                for (instance, _), before in zip(pairs, befores)
+                if tuple(getattr(instance, field.attname) for field in key_fields) in old_keys
+                and any(getattr(instance, field.attname) != before[field.name] for field in key_fields)
+            }
+            bulk_update_values(model, moving, [placeholder.name], batch_size=BULK_BATCH_SIZE)
+
+    def save(self, **kwargs):
+        """
+        save(), with a unique violation that slipped past validation (a
+        concurrent write) raised as per-item ValidationErrors instead.
+        """
+        try:
+            return super().save(**kwargs)
+        except IntegrityError:
+            errors = self._unique_errors(self.validated_data)
+            if not any(errors):
+                errors = [{'non_field_errors': ['Conflicts with existing data.']} for _ in errors]
+            raise serializers.ValidationError(errors)
+
+    def _split_related(self, attrs):
+        names = getattr(self.child, 'bulk_related_fields', ())
+        return {name: attrs.pop(name) for name in names if name in attrs}
+
+    def _saved(self, model, pairs):
+        if hasattr(self.child, 'bulk_save_related'):
+            self.child.bulk_save_related(pairs)
+        soft_delete_changed.send(sender=model, pks=[instance.pk for instance, _ in pairs], deleted=False)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        pairs = []
+        for attrs in validated_data:
+            related = self._split_related(attrs)
+            instance = model(**attrs)
+            pre_save.send(sender=model, instance=instance, raw=False, using=None, update_fields=None)
+            pairs.append((instance, related))
+        with transaction.atomic():
+            model.objects.bulk_create([instance for instance, _ in pairs], batch_size=BULK_BATCH_SIZE)
+            self._saved(model, pairs)
+        return [instance for instance, _ in pairs]
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        concrete = [field for field in model._meta.concrete_fields if not field.primary_key]
+        now = timezone.now()
+        pairs, befores, fields = [], [], {'updated_at'}
+        for instance, attrs in zip(instances, validated_data):
+            related = self._split_related(attrs)
+            before = {field.name: getattr(instance, field.attname) for field in concrete}
+            befores.append(before)
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+            instance.updated_at = now
+            pre_save.send(sender=model, instance=instance, raw=False, using=None, update_fields=set(attrs))
+            fields.update(field.name for field in concrete if getattr(instance, field.attname) != before[field.name])
+            pairs.append((instance, related))
+        fields = [field for field in concrete if field.name in fields]
+        with transaction.atomic():
+            self._release_unique_keys(model, pairs, befores)
+            bulk_update_values(
+                model,
+                {instance.pk: {field.name: getattr(instance, field.attname) for field in fields} for instance, _ in pairs},
+                [field.name for field in fields],
+                batch_size=BULK_BATCH_SIZE,
+            )
+            self._saved(model, pairs)
+        return instances
+
 
 class OrganizationSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
@@ -70,6 +322,34 @@ class DocumentationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by']
 
 
+class SearchResultSerializer(serializers.ModelSerializer):
+    """Base for compact full-text search hits with relevance and highlighted excerpt."""
+    organization_name = serializers.CharField(source='organization.name', read_only=True)
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+    snippet = serializers.CharField(source='search_snippet', read_only=True)
+
+
+class DocumentationSearchResultSerializer(SearchResultSerializer):
+    class Meta:
+        model = Documentation
+        fields = [
+            'id', 'organization', 'organization_name', 'title', 'category',
+            'tags', 'is_published', 'updated_at', 'rank', 'snippet'
+        ]
+
+
+class SearchEntrySerializer(serializers.ModelSerializer):
+    """A global search hit: the indexed object's id, type and display fields."""
+    id = serializers.UUIDField(source='object_id', read_only=True)
+    type = serializers.CharField(source='object_type', read_only=True)
+    organization_name = serializers.CharField(source='organization.name', read_only=True, default=None)
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+
+    class Meta:
+        model = SearchEntry
+        fields = ['id', 'type', 'title', 'subtitle', 'organization', 'organization_name', 'rank']
+
+
 class PasswordEntrySerializer(serializers.ModelSerializer):
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     created_by = UserSerializer(read_only=True)
@@ -100,7 +380,24 @@ class ConfigurationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by']
 
 
-class NetworkDeviceSerializer(serializers.ModelSerializer):
+class ConfigurationSearchResultSerializer(SearchResultSerializer):
+    class Meta:
+        model = Configuration
+        fields = [
+            'id', 'organization', 'organization_name', 'name', 'config_type',
+            'version', 'is_active', 'updated_at', 'rank', 'snippet'
+        ]
+
+
+class MACVendorMixin(serializers.Serializer):
+    """Adds the OUI vendor of the canonical MAC address."""
+    mac_vendor = serializers.SerializerMethodField()
+
+    def get_mac_vendor(self, obj):
+        return get_oui_database().vendor(obj.mac_normalized)
+
+
+class NetworkDeviceSerializer(MACVendorMixin, serializers.ModelSerializer):
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     location_name = serializers.CharField(source='location.name', read_only=True, allow_null=True)
     created_by = UserSerializer(read_only=True)
@@ -111,14 +408,14 @@ class NetworkDeviceSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'organization', 'organization_name', 'name', 'device_type',
             'internet_provider', 'internet_speed', 'manufacturer', 'model',
-            'ip_address', 'mac_address', 'serial_number', 'firmware_version',
+            'ip_address', 'mac_address', 'mac_vendor', 'serial_number', 'firmware_version',
             'location', 'location_name', 'notes', 'is_active', 'created_by',
             'created_at', 'updated_at', 'deleted_at', 'deleted_by'
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by']
 
 
-class EndpointUserSerializer(serializers.ModelSerializer):
+class EndpointUserSerializer(MACVendorMixin, serializers.ModelSerializer):
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     location_name = serializers.CharField(source='location.name', read_only=True, allow_null=True)
     assigned_to_name = serializers.CharField(source='assigned_to.full_name', read_only=True, allow_null=True)
@@ -131,7 +428,7 @@ class EndpointUserSerializer(serializers.ModelSerializer):
             'id', 'organization', 'organization_name', 'name', 'device_type',
             'assigned_to', 'assigned_to_name', 'manufacturer', 'model', 'cpu',
             'ram', 'storage', 'gpu', 'operating_system', 'software_installed',
-            'ip_address', 'mac_address', 'hostname', 'serial_number',
+            'ip_address', 'mac_address', 'mac_vendor', 'hostname', 'serial_number',
             'purchase_date', 'warranty_expiry', 'location', 'location_name',
             'notes', 'is_active', 'created_by', 'created_at', 'updated_at',
             'deleted_at', 'deleted_by'
@@ -139,7 +436,7 @@ class EndpointUserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by']
 
 
-class ServerSerializer(serializers.ModelSerializer):
+class ServerSerializer(MACVendorMixin, serializers.ModelSerializer):
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     location_name = serializers.CharField(source='location.name', read_only=True, allow_null=True)
     created_by = UserSerializer(read_only=True)
@@ -151,14 +448,14 @@ class ServerSerializer(serializers.ModelSerializer):
             'id', 'organization', 'organization_name', 'name', 'server_type',
             'role', 'manufacturer', 'model', 'cpu', 'ram', 'storage',
             'operating_system', 'software_installed', 'ip_address', 'mac_address',
-            'hostname', 'serial_number', 'location', 'location_name', 'notes',
+            'mac_vendor', 'hostname', 'serial_number', 'location', 'location_name', 'notes',
             'is_active', 'created_by', 'created_at', 'updated_at',
             'deleted_at', 'deleted_by'
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by']
 
 
-class PeripheralSerializer(serializers.ModelSerializer):
+class PeripheralSerializer(MACVendorMixin, serializers.ModelSerializer):
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     location_name = serializers.CharField(source='location.name', read_only=True, allow_null=True)
     created_by = UserSerializer(read_only=True)
@@ -168,7 +465,7 @@ class PeripheralSerializer(serializers.ModelSerializer):
         model = Peripheral
         fields = [
             'id', 'organization', 'organization_name', 'name', 'device_type',
-            'manufacturer', 'model', 'ip_address', 'mac_address', 'serial_number',
+            'manufacturer', 'model', 'ip_address', 'mac_address', 'mac_vendor', 'serial_number',
             'location', 'location_name', 'notes', 'is_active', 'created_by',
             'created_at', 'updated_at', 'deleted_at', 'deleted_by'
         ]
@@ -215,6 +512,24 @@ class SoftwareSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by']
 
+    # Kept off the model by BulkListSerializer and handed to bulk_save_related()
+    bulk_related_fields = ['assigned_contact_ids']
+
+    def bulk_save_related(self, pairs):
+        """Replace the assignments of bulk-saved items that were given assigned_contact_ids."""
+        request = self.context.get('request')
+        user = request.user if request else None
+        changed = [(software, related['assigned_contact_ids']) for software, related in pairs if 'assigned_contact_ids' in related]
+        if not changed:
+            return
+        SoftwareAssignment.objects.filter(software__in=[software for software, _ in changed]).delete()
+        assignments = SoftwareAssignment.objects.bulk_create([
+            SoftwareAssignment(software=software, contact=contact, created_by=user)
+            for software, contacts in changed
+            for contact in contacts
+        ])
+        soft_delete_changed.send(sender=SoftwareAssignment, pks=[assignment.pk for assignment in assignments], deleted=False)
+
     def create(self, validated_data):
         contact_ids = validated_data.pop('assigned_contact_ids', [])
         software = Software.objects.create(**validated_data)
@@ -268,6 +583,7 @@ class BackupSerializer(serializers.ModelSerializer):
             'id', 'organization', 'organization_name', 'name', 'backup_type',
             'vendor', 'frequency', 'retention_period', 'storage_location', 'storage_capacity',
             'target_systems', 'last_backup_date', 'next_backup_date', 'backup_status',
+            'health_status', 'overdue_since', 'health_checked_at',
             'location', 'location_name', 'notes', 'is_active',
             'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by'
         ]
@@ -315,6 +631,24 @@ class VoIPSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by']
 
+    # Kept off the model by BulkListSerializer and handed to bulk_save_related()
+    bulk_related_fields = ['assigned_contact_ids']
+
+    def bulk_save_related(self, pairs):
+        """Replace the assignments of bulk-saved items that were given assigned_contact_ids."""
+        request = self.context.get('request')
+        user = request.user if request else None
+        changed = [(voip, related['assigned_contact_ids']) for voip, related in pairs if 'assigned_contact_ids' in related]
+        if not changed:
+            return
+        VoIPAssignment.objects.filter(voip__in=[voip for voip, _ in changed]).delete()
+        assignments = VoIPAssignment.objects.bulk_create([
+            VoIPAssignment(voip=voip, contact=contact, created_by=user)
+            for voip, contacts in changed
+            for contact in contacts
+        ])
+        soft_delete_changed.send(sender=VoIPAssignment, pks=[assignment.pk for assignment in assignments], deleted=False)
+
     def create(self, validated_data):
         contact_ids = validated_data.pop('assigned_contact_ids', [])
         voip = VoIP.objects.create(**validated_data)
@@ -354,3 +688,93 @@ class VoIPSerializer(serializers.ModelSerializer):
                 )
 
         return instance
+
+
+class RMMEndpointSerializer(MACVendorMixin, serializers.ModelSerializer):
+    organization_name = serializers.CharField(source='organization.name', read_only=True)
+    location_name = serializers.CharField(source='location.name', read_only=True, allow_null=True)
+    disk_used_gb = serializers.FloatField(read_only=True)
+    disk_usage_percent = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RMMEndpoint
+        fields = [
+            'id', 'organization', 'organization_name', 'location', 'location_name',
+            'agent_id', 'name', 'device_type', 'cpu_model', 'cpu_cores', 'ram_gb',
+            'disk_total_gb', 'disk_free_gb', 'disk_used_gb', 'disk_usage_percent',
+            'operating_system', 'logged_in_user', 'status', 'serial_number',
+            'mac_address', 'mac_vendor', 'last_seen', 'last_sync', 'created_at', 'updated_at', 'deleted_at'
+        ]
+        read_only_fields = fields
+
+
+class RMMEndpointDetailSerializer(RMMEndpointSerializer):
+    """Detail representation including the raw agent payload from the side table."""
+    raw_rmm_data = serializers.JSONField(read_only=True)
+
+    class Meta(RMMEndpointSerializer.Meta):
+        fields = RMMEndpointSerializer.Meta.fields + ['raw_rmm_data']
+        read_only_fields = fields
+
+
+class SoftwareCatalogEntrySerializer(serializers.ModelSerializer):
+    install_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = SoftwareCatalogEntry
+        fields = ['id', 'name', 'normalized_name', 'install_count']
+
+
+class SoftwareInstallationSerializer(serializers.ModelSerializer):
+    software_name = serializers.CharField(source='catalog.name', read_only=True)
+    endpoint_user_name = serializers.CharField(source='endpoint_user.name', read_only=True, default=None)
+    server_name = serializers.CharField(source='server.name', read_only=True, default=None)
+
+    class Meta:
+        model = SoftwareInstallation
+        fields = [
+            'id', 'catalog', 'software_name', 'version', 'organization',
+            'endpoint_user', 'endpoint_user_name', 'server', 'server_name'
+        ]
+
+
+class SubnetSerializer(serializers.ModelSerializer):
+    organization_name = serializers.CharField(source='organization.name', read_only=True)
+    location_name = serializers.CharField(source='location.name', read_only=True, allow_null=True)
+    size = serializers.SerializerMethodField()
+    used = serializers.IntegerField(read_only=True, default=None)
+    created_by = UserSerializer(read_only=True)
+    deleted_by = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Subnet
+        fields = [
+            'id', 'organization', 'organization_name', 'location', 'location_name',
+            'name', 'network', 'vlan_id', 'gateway', 'description', 'size', 'used',
+            'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by'
+        ]
+        read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'deleted_at', 'deleted_by']
+
+    def get_size(self, obj):
+        return usable_hosts(parse_network(obj.network))
+
+    def validate_network(self, value):
+        try:
+            return str(parse_network(value))
+        except ValueError:
+            raise serializers.ValidationError('Enter a valid network in CIDR notation, e.g. 10.20.0.0/24.')
+
+    def validate(self, attrs):
+        network = attrs.get('network', getattr(self.instance, 'network', None))
+        gateway = attrs.get('gateway', getattr(self.instance, 'gateway', None))
+        if network and gateway:
+            gateway, network = parse_network(gateway), parse_network(network)
+            if gateway.version != network.version or not gateway.subnet_of(network):
+                raise serializers.ValidationError({'gateway': 'Gateway must be inside the network.'})
+        return attrs
+
+
+class IPAddressEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = IPAddressEntry
+        fields = ['id', 'address', 'version', 'object_type', 'object_id', 'name', 'organization', 'location']
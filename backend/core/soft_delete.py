@@ -0,0 +1,293 @@
+"""
+Cascading soft delete and restore.
+
+BaseModel.delete() only marks its own row. cascade_soft_delete() follows the
+relations a hard delete would cascade along (ForeignKey on_delete=CASCADE
+between BaseModel subclasses) and marks every live descendant with one
+UPDATE per model, all stamped with the same deletion_batch id.
+cascade_restore() walks the same graph back through rows of that batch only,
+so rows deleted separately before or after stay deleted.
+
+Bulk UPDATEs skip post_save, so soft_delete_changed is sent once per model
+with the affected primary keys; the derived indexes listen to it to drop or
+re-add those rows.
+
+restore_rows() and purge_rows() act on an explicit set of deleted rows (the
+trash). Restoring is cascade_restore() for each row, grouped by deletion
+batch; a row whose parent is still deleted is refused with ParentDeleted, as
+it would come back pointing at a row the API no longer shows. Purging deletes with one statement per model and relation, through
+subqueries, instead of loading rows the way QuerySet.delete() does.
+"""
+from functools import lru_cache
+
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .ids import uuid7
+from .models import BaseModel
+
+BATCH_SIZE = 1000
+
+# Sent with pks=[...] and deleted=True/False after rows of `sender` were written
+# without post_save: by a cascade, a restore or a bulk API write (deleted=False)
+soft_delete_changed = Signal()
+
+
+class ParentDeleted(ValueError):
+    """Rows of `model` (pks) cannot be restored while a parent they cascade from is deleted."""
+
+    def __init__(self, model, pks):
+        name = model._meta.verbose_name if len(pks) == 1 else model._meta.verbose_name_plural
+        super().__init__(f'Cannot restore {len(pks)} {name} while the items they belong to are deleted; restore those first.')
+        self.model = model
+        self.pks = pks
+
+
+def chunked(pks, size=BATCH_SIZE):
+    for start in range(0, len(pks), size):
+        yield pks[start:start + size]
+
+
+@lru_cache(maxsize=None)
+def cascade_relations(model):
+    """(child model, foreign key name) pairs a soft delete of `model` cascades to."""
+    return tuple(
+        (relation.related_model, relation.field.name)
+        for relation in model._meta.related_objects
+        if relation.on_delete is models.CASCADE
+        and not relation.many_to_many
+        and issubclass(relation.related_model, BaseModel)
+    )
+
+
+@lru_cache(maxsize=None)
+def cascade_order(model):
+    """`model` and every model reachable from it, each after all the models cascading to it."""
+    reachable = [model]
+    for current in reachable:
+        for child, _ in cascade_relations(current):
+            if child not in reachable:
+                reachable.append(child)
+    incoming = {current: 0 for current in reachable}
+    for current in reachable:
+        for child, _ in cascade_relations(current):
+            incoming[child] += 1
+    order = []
+    ready = [model]
+    while ready:
+        current = ready.pop(0)
+        order.append(current)
+        for child, _ in cascade_relations(current):
+            incoming[child] -= 1
+            if incoming[child] == 0:
+                ready.append(child)
+    return tuple(order)
+
+
+@lru_cache(maxsize=None)
+def cascade_parents(model):
+    """Foreign key names of `model` whose soft delete cascades to it."""
+    return tuple(
+        field.name
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.ForeignKey)
+        and field.remote_field.on_delete is models.CASCADE
+        and issubclass(field.related_model, BaseModel)
+    )
+
+
+def deleted_parents(model, pks):
+    """The pks among `pks` with a parent (cascade_parents) that is soft-deleted."""
+    condition = models.Q()
+    for field in cascade_parents(model):
+        condition |= models.Q(**{f'{field}__deleted_at__isnull': False})
+    if not condition:
+        return []
+    return list(model.all_objects.filter(condition, pk__in=pks).values_list('pk', flat=True))
+
+
+def _reached_from(model, order, batch):
+    """Condition matching rows of `model` whose parent in `order` carries `batch`."""
+    condition = models.Q()
+    for parent in order[:order.index(model)]:
+        for child, field in cascade_relations(parent):
+            if child is model:
+                condition |= models.Q(**{f'{field}__in': parent.all_objects.filter(deletion_batch=batch).values('pk')})
+    return condition
+
+
+def _notify(changed, deleted):
+    for model, pks in changed.items():
+        soft_delete_changed.send(sender=model, pks=pks, deleted=deleted)
+
+
+def _counts(changed):
+    return {model._meta.model_name: len(pks) for model, pks in changed.items()}
+
+
+def cascade_soft_delete(instance, user=None):
+    """
+    Soft-delete `instance` and every live row that cascades from it.
+
+    Returns (deletion_batch, {model_name: rows deleted}).
+    """
+    batch, counts, now = _cascade_soft_delete(type(instance), [instance.pk], user)
+    instance.deleted_at, instance.deleted_by, instance.deletion_batch = now, user, batch
+    return batch, counts
+
+
+def cascade_soft_delete_many(model, pks, user=None):
+    """cascade_soft_delete() for many live rows of `model` at once, all in one deletion batch."""
+    batch, counts, _ = _cascade_soft_delete(model, pks, user)
+    return batch, counts
+
+
+def _cascade_soft_delete(model, pks, user):
+    order = cascade_order(model)
+    batch = uuid7()
+    now = timezone.now()
+    changed = {}
+    with transaction.atomic():
+        for current in order:
+            rows = current.objects.filter(pk__in=pks) if current is model else current.objects.filter(
+                _reached_from(current, order, batch)
+            )
+            if rows.update(deleted_at=now, deleted_by=user, deletion_batch=batch, updated_at=now):
+                changed[current] = list(
+                    current.all_objects.filter(deletion_batch=batch).values_list('pk', flat=True)
+                )
+        _notify(changed, deleted=True)
+    return batch, _counts(changed), now
+
+
+def cascade_restore(instance):
+    """
+    Restore `instance` and the rows its deletion cascaded to.
+
+    Rows of the same batch are first re-stamped with a fresh marker, walking
+    down from `instance`, so restoring one branch of a larger deletion leaves
+    the rest of it deleted. Raises ParentDeleted if a parent of `instance` is
+    still deleted. Returns {model_name: rows restored}.
+    """
+    model = type(instance)
+    if deleted_parents(model, [instance.pk]):
+        raise ParentDeleted(model, [instance.pk])
+    if instance.deletion_batch is None:
+        instance.restore()
+        return {model._meta.model_name: 1}
+
+    with transaction.atomic():
+        changed = _cascade_restore(model, {instance.deletion_batch: [instance.pk]})
+        _notify(changed, deleted=False)
+    instance.deleted_at, instance.deleted_by, instance.deletion_batch = None, None, None
+    return _counts(changed)
+
+
+def restore_rows(model, pks):
+    """
+    cascade_restore() for many soft-deleted rows of `model` at once.
+
+    Rows are grouped by deletion batch, with one marking UPDATE per model and
+    batch and one restoring UPDATE per model. Raises ParentDeleted, restoring
+    nothing, if any row's parent is still deleted. Returns {model_name: rows restored}.
+    """
+    with transaction.atomic():
+        rows = model.all_objects.filter(pk__in=pks, deleted_at__isnull=False)
+        blocked = deleted_parents(model, rows.values('pk'))
+        if blocked:
+            raise ParentDeleted(model, blocked)
+        batches = {}
+        for pk, batch in rows.values_list('pk', 'deletion_batch'):
+            batches.setdefault(batch, []).append(pk)
+        changed = _cascade_restore(model, batches)
+        _notify(changed, deleted=False)
+    return _counts(changed)
+
+
+def _cascade_restore(model, batches):
+    """Restore {deletion_batch: [pk, ...]} rows of `model` and their cascade. Returns {model: restored pks}."""
+    order = cascade_order(model)
+    markers = []
+    for batch, pks in batches.items():
+        marker = uuid7()
+        markers.append(marker)
+        if batch is None:
+            # Deleted on its own: nothing cascaded from it
+            model.all_objects.filter(pk__in=pks).update(deletion_batch=marker)
+            continue
+        for current in order:
+            rows = current.all_objects.filter(deletion_batch=batch)
+            rows = rows.filter(pk__in=pks) if current is model else rows.filter(
+                _reached_from(current, order, marker)
+            )
+            rows.update(deletion_batch=marker)
+    now = timezone.now()
+    changed = {}
+    for current in order:
+        rows = current.all_objects.filter(deletion_batch__in=markers)
+        restored = list(rows.values_list('pk', flat=True))
+        if restored:
+            rows.update(deleted_at=None, deleted_by=None, deletion_batch=None, updated_at=now)
+            changed[current] = restored
+    return changed
+
+
+@lru_cache(maxsize=None)
+def _dependents(model):
+    """(model, foreign key name, on_delete) for every relation pointing at `model`, m2m through tables included."""
+    return tuple(
+        (field.related_model, field.field.name, field.on_delete)
+        for field in model._meta.get_fields(include_hidden=True)
+        if field.auto_created and not field.concrete and (field.one_to_one or field.one_to_many)
+    )
+
+
+def _purge_steps(model, rows, steps):
+    """Append (model, queryset, field to null or None to delete) steps, dependents before `rows`."""
+    for related_model, field, on_delete in _dependents(model):
+        dependents = related_model._base_manager.filter(**{f'{field}__in': rows.values('pk')})
+        if on_delete is models.CASCADE:
+            _purge_steps(related_model, dependents, steps)
+        elif on_delete is models.SET_NULL:
+            steps.append((related_model, dependents, field))
+        elif on_delete is not models.DO_NOTHING:
+            raise ValueError(f'Cannot purge {model.__name__}: {related_model.__name__}.{field} is not CASCADE or SET_NULL')
+    steps.append((model, rows, None))
+    return steps
+
+
+def purge_plan(model, pks):
+    """
+    Steps purge_rows() takes for the given soft-deleted rows, in order:
+    (model, queryset, None) to delete, (model, queryset, field) to null a reference.
+    """
+    return _purge_steps(model, model.all_objects.filter(pk__in=pks, deleted_at__isnull=False), [])
+
+
+def purge_rows(model, pks):
+    """
+    Permanently delete the given soft-deleted rows of `model` and everything
+    a hard delete would cascade to. Returns {model_name: rows deleted}.
+    """
+    with transaction.atomic():
+        steps = purge_plan(model, pks)
+        # Purged rows left the derived indexes when they were soft-deleted;
+        # live rows caught by the cascade still have entries to drop.
+        live = {}
+        for current, queryset, field in steps:
+            if field is None and current is not model and issubclass(current, BaseModel):
+                live_pks = list(queryset.filter(deleted_at__isnull=True).values_list('pk', flat=True))
+                if live_pks:
+                    live.setdefault(current, []).extend(live_pks)
+        _notify(live, deleted=True)
+        counts = {}
+        for current, queryset, field in steps:
+            if field is not None:
+                queryset.update(**{field: None})
+                continue
+            deleted = queryset._raw_delete(queryset.db)
+            if deleted:
+                name = current._meta.model_name
+                counts[name] = counts.get(name, 0) + deleted
+    return counts
@@ -0,0 +1,139 @@
+"""
+Normalized documentation tags.
+
+Documentation.tags stays the comma-separated field the API reads and writes.
+On every save it is normalized (trimmed, lower-cased, de-duplicated) and its
+names are mirrored into per-organization Tag rows linked through the
+documentation_tags table, which backs exact tag filtering and tag counts.
+Tags no document links to any more are deleted.
+"""
+import math
+
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import Documentation, Tag
+from .soft_delete import soft_delete_changed
+
+MAX_TAG_LENGTH = 100
+
+DocumentationTag = Documentation.tag_set.through
+
+
+def parse_tags(value):
+    """Normalized, de-duplicated tag names from a comma-separated string, in input order."""
+    names = {}
+    for raw in (value or '').split(','):
+        name = ' '.join(raw.lower().split())[:MAX_TAG_LENGTH]
+        if name:
+            names.setdefault(name, None)
+    return list(names)
+
+
+def get_or_create_tags(organization_id, names):
+    """Tag rows for `names` in one organization, creating missing ones in bulk."""
+    if not names:
+        return []
+    Tag.objects.bulk_create(
+        [Tag(organization_id=organization_id, name=name) for name in names], ignore_conflicts=True
+    )
+    return list(Tag.objects.filter(organization_id=organization_id, name__in=names))
+
+
+def format_tags(names, max_length=None):
+    """The canonical comma-separated form of parsed tag names."""
+    value = ', '.join(names)
+    if max_length and len(value) > max_length:
+        # Never longer than the input parse_tags() was given
+        value = ','.join(names)
+    return value
+
+
+def delete_orphaned_tags(tag_ids=None, organization_ids=None):
+    """Delete tags no documentation links to, optionally only among the given tags or organizations."""
+    tags = Tag.objects.filter(documentations__isnull=True)
+    if tag_ids is not None:
+        tags = tags.filter(pk__in=tag_ids)
+    if organization_ids is not None:
+        tags = tags.filter(organization_id__in=organization_ids)
+    return tags.delete()[0]
+
+
+def sync_tags(documentation):
+    """Point documentation.tag_set at the tags named in documentation.tags, dropping tags left unused."""
+    tags = get_or_create_tags(documentation.organization_id, parse_tags(documentation.tags))
+    removed = set(documentation.tag_set.values_list('pk', flat=True)) - {tag.pk for tag in tags}
+    documentation.tag_set.set(tags)
+    if removed:
+        delete_orphaned_tags(tag_ids=removed)
+
+
+def normalize_documentation_tags(sender, instance, **kwargs):
+    instance.tags = format_tags(parse_tags(instance.tags), Documentation._meta.get_field('tags').max_length)
+
+
+def sync_documentation_tags(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and not {'tags', 'organization'}.intersection(update_fields):
+        return
+    if created and not instance.tags:
+        return
+    sync_tags(instance)
+
+
+def resync_tags(sender, pks, deleted, **kwargs):
+    if deleted:
+        return
+    for documentation in Documentation.all_objects.filter(pk__in=pks).only('id', 'organization_id', 'tags'):
+        sync_tags(documentation)
+
+
+def drop_documentation_tags(sender, instance, **kwargs):
+    # Link rows are gone by now; only this organization can have lost its last use of a tag
+    delete_orphaned_tags(organization_ids=[instance.organization_id])
+
+
+def connect_signals():
+    pre_save.connect(normalize_documentation_tags, sender=Documentation, dispatch_uid='documentation-tags-normalize')
+    post_save.connect(sync_documentation_tags, sender=Documentation, dispatch_uid='documentation-tags')
+    post_delete.connect(drop_documentation_tags, sender=Documentation, dispatch_uid='documentation-tags-delete')
+    soft_delete_changed.connect(resync_tags, sender=Documentation, dispatch_uid='documentation-tags-bulk')
+
+
+def tagged_any(queryset, names):
+    """Documentation carrying at least one of the tags."""
+    return queryset.filter(
+        id__in=DocumentationTag.objects.filter(tag__name__in=names).values('documentation_id')
+    )
+
+
+def tagged_all(queryset, names):
+    """Documentation carrying every one of the tags."""
+    return queryset.filter(
+        id__in=DocumentationTag.objects.filter(tag__name__in=names).values('documentation_id').annotate(
+            matched=Count('tag_id')
+        ).filter(matched=len(names)).values('documentation_id')
+    )
+
+
+def tag_counts(queryset, limit=None):
+    """[{'name', 'count'}] over the given documentation, most used first, in one grouped query."""
+    counts = DocumentationTag.objects.filter(documentation__in=queryset.order_by().values('id')).values(
+        'tag__name'
+    ).annotate(count=Count('documentation_id')).order_by('-count', 'tag__name')
+    if limit:
+        counts = counts[:limit]
+    return [{'name': row['tag__name'], 'count': row['count']} for row in counts]
+
+
+def tag_cloud(queryset, limit=100, levels=5):
+    """tag_counts() plus a 1..`levels` weight on a log scale, sorted by name."""
+    counts = tag_counts(queryset, limit=limit)
+    if not counts:
+        return []
+    low = math.log(counts[-1]['count'])
+    high = math.log(counts[0]['count'])
+    spread = high - low
+    for item in counts:
+        position = (math.log(item['count']) - low) / spread if spread else 1.0
+        item['weight'] = 1 + round(position * (levels - 1))
+    return sorted(counts, key=lambda item: item['name'])
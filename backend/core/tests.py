@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .backup_health import parse_frequency
+from .integrations.rmm_sync import sync_agents
+from .models import Organization, RMMEndpoint
+
+
+def agent(agent_id, **overrides):
+    data = {
+        'agent_id': agent_id, 'name': f'host-{agent_id}', 'operating_system': 'Windows 11',
+        'cpu_model': '', 'cpu_cores': 4, 'ram_gb': 16, 'disk_total_gb': 500, 'disk_free_gb': 250,
+        'serial_number': '', 'mac_address': '', 'logged_in_user': '', 'status': 'online',
+        'last_seen': timezone.now(), 'raw_rmm_data': {'agent_id': agent_id},
+    }
+    data.update(overrides)
+    return data
+
+
+class SyncAgentsTests(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Acme')
+
+    def test_trashed_endpoint_is_skipped(self):
+        sync_agents(self.organization, [agent('a1'), agent('a2')])
+        RMMEndpoint.objects.get(agent_id='a1').delete()
+
+        created, updated, _ = sync_agents(self.organization, [agent('a1', name='renamed'), agent('a2')])
+
+        self.assertEqual((created, updated), (0, 1))
+        endpoint = RMMEndpoint.all_objects.get(agent_id='a1')
+        self.assertTrue(endpoint.is_deleted)
+        self.assertEqual(endpoint.name, 'host-a1')
+        self.assertEqual(RMMEndpoint.all_objects.filter(agent_id='a1').count(), 1)
+
+    def test_restored_endpoint_syncs_again(self):
+        sync_agents(self.organization, [agent('a1')])
+        endpoint = RMMEndpoint.objects.get(agent_id='a1')
+        endpoint.delete()
+        endpoint.restore()
+
+        created, updated, _ = sync_agents(self.organization, [agent('a1', name='renamed')])
+
+        self.assertEqual((created, updated), (0, 1))
+        self.assertEqual(RMMEndpoint.objects.get(agent_id='a1').name, 'renamed')
+
+
+class ParseFrequencyTests(SimpleTestCase):
+    def test_intervals(self):
+        cases = {
+            'Daily': timedelta(days=1),
+            'Every 4 hours': timedelta(hours=4),
+            'twice a day': timedelta(hours=12),
+            'once an hour': timedelta(hours=1),
+            '3 times a week': timedelta(weeks=1) / 3,
+            'Daily (30 day retention)': timedelta(days=1),
+        }
+        for text, interval in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_frequency(text), interval)
+
+    def test_clock_times_are_ignored(self):
+        cases = {
+            'Daily at 2am': timedelta(days=1),
+            '3am daily': timedelta(days=1),
+            'Weekly on Sunday at 2am': timedelta(weeks=1),
+            'Daily 2:00 AM': timedelta(days=1),
+            'Nightly at 11 p.m.': timedelta(days=1),
+            'Daily 23:30': timedelta(days=1),
+            'every 12 hours starting 6am': timedelta(hours=12),
+        }
+        for text, interval in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_frequency(text), interval)
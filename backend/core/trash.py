@@ -0,0 +1,207 @@
+"""
+Unified trash: soft-deleted rows of every BaseModel subclass in one list.
+
+Rows are compact (type, id, label, deleted_by, deleted_at) and ordered by
+deleted_at, newest first, then type and id so rows deleted together by one
+cascade still page in a stable order. Pages are keyset-paginated: the cursor
+is the sort key of the last row, so every page costs the same however deep it
+is. Each type contributes one SELECT on its deleted_at index; where the
+database allows LIMIT inside UNION ALL (PostgreSQL) the branches run as a
+single query, elsewhere they run one by one and are merged here.
+"""
+import base64
+import json
+import uuid
+
+from django.db import connection, transaction
+from django.db.models import CharField, F, Q, Value
+from django.db.models.functions import Concat, Trim
+from django.utils.dateparse import parse_datetime
+
+from .models import (
+    Organization, Location, Contact, Documentation, PasswordEntry, Configuration,
+    NetworkDevice, EndpointUser, Server, Peripheral, Subnet, Software, SoftwareAssignment,
+    Backup, VoIP, VoIPAssignment, RMMSource, RMMEndpoint, User,
+)
+from .soft_delete import ParentDeleted, cascade_order, purge_rows, restore_rows
+from .tags import delete_orphaned_tags
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+# Upper bound on items in one bulk restore or purge request
+MAX_BULK_ITEMS = 1000
+
+
+def _joined(*fields):
+    parts = []
+    for field in fields:
+        parts.extend([Value(' '), field] if parts else [field])
+    return Trim(Concat(*parts, output_field=CharField()))
+
+
+# type -> model, label expression and the lookup reaching the organization
+TRASH_MODELS = {
+    'organization': {'model': Organization, 'label': F('name'), 'organization': 'pk'},
+    'location': {'model': Location, 'label': F('name'), 'organization': 'organization'},
+    'contact': {'model': Contact, 'label': _joined('first_name', 'last_name'), 'organization': 'organization'},
+    'documentation': {'model': Documentation, 'label': F('title'), 'organization': 'organization'},
+    'password': {'model': PasswordEntry, 'label': F('name'), 'organization': 'organization'},
+    'configuration': {'model': Configuration, 'label': F('name'), 'organization': 'organization'},
+    'network_device': {'model': NetworkDevice, 'label': F('name'), 'organization': 'organization'},
+    'endpoint_user': {'model': EndpointUser, 'label': F('name'), 'organization': 'organization'},
+    'server': {'model': Server, 'label': F('name'), 'organization': 'organization'},
+    'peripheral': {'model': Peripheral, 'label': F('name'), 'organization': 'organization'},
+    'subnet': {'model': Subnet, 'label': _joined('name', 'network'), 'organization': 'organization'},
+    'software': {'model': Software, 'label': F('name'), 'organization': 'organization'},
+    'software_assignment': {
+        'model': SoftwareAssignment,
+        'label': _joined('software__name', Value('->'), 'contact__first_name', 'contact__last_name'),
+        'organization': 'software__organization',
+    },
+    'backup': {'model': Backup, 'label': F('name'), 'organization': 'organization'},
+    'voip': {'model': VoIP, 'label': F('name'), 'organization': 'organization'},
+    'voip_assignment': {
+        'model': VoIPAssignment,
+        'label': _joined('voip__name', Value('->'), 'contact__first_name', 'contact__last_name'),
+        'organization': 'voip__organization',
+    },
+    'rmm_source': {'model': RMMSource, 'label': F('name'), 'organization': 'organization'},
+    'rmm_endpoint': {'model': RMMEndpoint, 'label': F('name'), 'organization': 'organization'},
+}
+
+COLUMNS = ['type', 'id', 'label', 'deleted_by_id', 'deleted_at']
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(row):
+    key = [row['deleted_at'].isoformat(), row['type'], str(row['id'])]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(deleted_at, type, id) from a cursor made by encode_cursor()."""
+    try:
+        deleted_at, object_type, object_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        deleted_at = parse_datetime(deleted_at)
+        object_id = uuid.UUID(object_id)
+    except (TypeError, ValueError):
+        raise InvalidCursor('Invalid cursor.')
+    if deleted_at is None or object_type not in TRASH_MODELS:
+        raise InvalidCursor('Invalid cursor.')
+    return deleted_at, object_type, object_id
+
+
+def _after(object_type, cursor):
+    """Rows of `object_type` sorting after `cursor` in (deleted_at desc, type, id desc) order."""
+    deleted_at, cursor_type, cursor_id = cursor
+    if object_type < cursor_type:
+        return Q(deleted_at__lt=deleted_at)
+    if object_type > cursor_type:
+        return Q(deleted_at__lte=deleted_at)
+    return Q(deleted_at__lt=deleted_at) | Q(deleted_at=deleted_at, pk__lt=cursor_id)
+
+
+def _branch(object_type, organization_id, cursor, limit):
+    spec = TRASH_MODELS[object_type]
+    queryset = spec['model'].objects.deleted()
+    if organization_id:
+        queryset = queryset.filter(**{spec['organization']: organization_id})
+    if cursor:
+        queryset = queryset.filter(_after(object_type, cursor))
+    return queryset.annotate(
+        type=Value(object_type, output_field=CharField()),
+        label=spec['label'],
+    ).values(*COLUMNS).order_by('-deleted_at', '-pk')[:limit]
+
+
+def _sort(rows):
+    """Sort rows newest first, then by type, then by id descending (stable sorts, least significant key first)."""
+    rows.sort(key=lambda row: row['id'], reverse=True)
+    rows.sort(key=lambda row: row['type'])
+    rows.sort(key=lambda row: row['deleted_at'], reverse=True)
+
+
+def _deleted_by_names(rows):
+    ids = {row['deleted_by_id'] for row in rows if row['deleted_by_id']}
+    users = User.objects.filter(pk__in=ids).only('email', 'first_name', 'last_name')
+    return {user.pk: user.full_name for user in users}
+
+
+def trash_page(organization_id=None, object_types=None, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    One page of the trash: {'results': [row, ...], 'next': cursor or None}.
+
+    `cursor` is the value returned as 'next' by the previous page.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    branches = [_branch(object_type, organization_id, after, limit + 1) for object_type in object_types or TRASH_MODELS]
+    if connection.features.supports_slicing_ordering_in_compound and len(branches) > 1:
+        rows = list(branches[0].union(*branches[1:], all=True).order_by('-deleted_at', 'type', '-id')[:limit + 1])
+    else:
+        rows = [row for branch in branches for row in branch]
+    for row in rows:
+        # UNION ALL hands back raw values on some backends
+        row['id'] = row['id'] if isinstance(row['id'], uuid.UUID) else uuid.UUID(str(row['id']))
+    _sort(rows)
+    page, more = rows[:limit], len(rows) > limit
+
+    names = _deleted_by_names(page)
+    results = [
+        {
+            'type': row['type'],
+            'id': row['id'],
+            'label': row['label'] or '',
+            'deleted_by': names.get(row['deleted_by_id']),
+            'deleted_at': row['deleted_at'],
+        }
+        for row in page
+    ]
+    return {'results': results, 'next': encode_cursor(page[-1]) if more else None}
+
+
+def _grouped(items):
+    pks = {}
+    for object_type, object_id in items:
+        pks.setdefault(object_type, []).append(object_id)
+    return pks
+
+
+def _ancestors(object_type):
+    """Number of trash types whose deletion cascades to `object_type`."""
+    model = TRASH_MODELS[object_type]['model']
+    return sum(1 for spec in TRASH_MODELS.values() if spec['model'] is not model and model in cascade_order(spec['model']))
+
+
+def restore_items(items):
+    """
+    Restore (type, id) pairs and what their deletion cascaded to, all or none.
+
+    Parent types go first, so a contact listed with its organization comes
+    back once the organization has. Raises ParentDeleted when an item's parent
+    is still deleted. Returns {model_name: rows restored}.
+    """
+    counts = {}
+    with transaction.atomic():
+        for object_type, pks in sorted(_grouped(items).items(), key=lambda group: _ancestors(group[0])):
+            for name, count in restore_rows(TRASH_MODELS[object_type]['model'], pks).items():
+                counts[name] = counts.get(name, 0) + count
+    return counts
+
+
+def trash_type(model):
+    """The TRASH_MODELS type of `model`."""
+    return next(object_type for object_type, spec in TRASH_MODELS.items() if spec['model'] is model)
+
+
+def purge_items(items):
+    """Permanently delete (type, id) pairs and their cascade. Returns {model_name: rows deleted}."""
+    counts = {}
+    for object_type, pks in _grouped(items).items():
+        for name, count in purge_rows(TRASH_MODELS[object_type]['model'], pks).items():
+            counts[name] = counts.get(name, 0) + count
+    if counts.get('documentation'):
+        delete_orphaned_tags()
+    return counts
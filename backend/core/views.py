@@ -1,31 +1,77 @@
-from rest_framework import viewsets, status
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q, Count, Sum
 from django.http import HttpResponse
 import csv
 import io
+import uuid
 from .models import (
-    Organization, Location, Contact, Documentation,
-    PasswordEntry, Configuration, NetworkDevice, EndpointUser, Server, Peripheral, Software, Backup, VoIP
+    BaseModel, Organization, Location, Contact, Documentation,
+    PasswordEntry, Configuration, NetworkDevice, EndpointUser, Server, Peripheral, Software, Backup, VoIP,
+    RMMEndpoint, SoftwareCatalogEntry, SoftwareInstallation, Subnet, IPAddressEntry
 )
 from .serializers import (
     OrganizationSerializer, LocationSerializer, ContactSerializer,
     DocumentationSerializer, PasswordEntrySerializer, ConfigurationSerializer,
-    NetworkDeviceSerializer, EndpointUserSerializer, ServerSerializer, PeripheralSerializer, SoftwareSerializer, BackupSerializer, VoIPSerializer
+    NetworkDeviceSerializer, EndpointUserSerializer, ServerSerializer, PeripheralSerializer, SoftwareSerializer, BackupSerializer, VoIPSerializer,
+    RMMEndpointSerializer, RMMEndpointDetailSerializer,
+    DocumentationSearchResultSerializer, ConfigurationSearchResultSerializer,
+    SoftwareCatalogEntrySerializer, SoftwareInstallationSerializer, SubnetSerializer, IPAddressEntrySerializer,
+    BulkListSerializer
 )
+from .filters import (
+    RMMEndpointFilter, DocumentationFilter, SoftwareInstallationFilter, IPAddressEntryFilter, FullTextSearchFilter
+)
+from .search import ranked_search
+from .reconciliation import reconcile_organization
+from .compliance import compliance_report
+from .backup_health import at_risk as backups_at_risk
+from .ipam import with_utilization, location_utilization, ip_conflicts, in_network, parse_network
+from .tags import tag_cloud as build_tag_cloud
+from .soft_delete import ParentDeleted, cascade_soft_delete, cascade_soft_delete_many, cascade_restore
+from .params import organization_id_param, uuid_param
+
+
+class FullTextSearchViewSetMixin:
+    """Index-backed `?search=` plus a ranked `search` action with highlighted snippets."""
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
+    search_result_serializer_class = None
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Ranked full-text search: ?q=<terms>, optionally with the viewset's filters."""
+        query = request.query_params.get('q', '').strip()
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        # No terms give an empty page of the same shape
+        results = ranked_search(queryset, query)
+
+        page = self.paginate_queryset(results)
+        if page is not None:
+            serializer = self.search_result_serializer_class(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.search_result_serializer_class(results, many=True)
+        return Response(serializer.data)
 
 
 class SoftDeleteViewSetMixin:
     """Mixin to add soft delete functionality to ViewSets."""
 
     def destroy(self, request, *args, **kwargs):
-        """Override destroy to perform soft delete instead of hard delete."""
+        """Soft delete the item and every item that belongs to it (e.g. an organization's devices)."""
         instance = self.get_object()
-        instance.delete(user=request.user)
+        batch, counts = cascade_soft_delete(instance, user=request.user)
         return Response(
-            {'detail': 'Item moved to deleted items. You can restore it from the Deleted Items section.'},
+            {
+                'detail': 'Item moved to deleted items. You can restore it from the Deleted Items section.',
+                'deletion_batch': batch,
+                'deleted': counts,
+            },
             status=status.HTTP_200_OK
         )
 
@@ -41,10 +87,13 @@ class SoftDeleteViewSetMixin:
                     {'detail': 'Item is not deleted.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            instance.restore()
+            try:
+                counts = cascade_restore(instance)
+            except ParentDeleted as e:
+                return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             serializer = self.get_serializer(instance)
             return Response(
-                {'detail': 'Item restored successfully.', 'data': serializer.data},
+                {'detail': 'Item restored successfully.', 'data': serializer.data, 'restored': counts},
                 status=status.HTTP_200_OK
             )
         except model_class.DoesNotExist:
@@ -96,7 +145,188 @@ class SoftDeleteViewSetMixin:
             )
 
 
-class OrganizationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class BatchRetrieveViewSetMixin:
+    """
+    Mixin adding <prefix>/batch/ to fetch many items by id in one query.
+
+    Ids come from ?ids=a,b,c or, for long lists, a POST body {"ids": [...]}.
+    Results follow the requested order (duplicates once); ids that do not
+    exist or are not visible (e.g. deleted) are listed in "missing".
+    """
+    batch_max_ids = 1000
+
+    def batch_queryset(self):
+        """get_queryset() with created_by joined for serializers that nest it."""
+        queryset = self.get_queryset()
+        if issubclass(queryset.model, BaseModel):
+            queryset = queryset.select_related('created_by')
+        return queryset
+
+    @action(detail=False, methods=['get', 'post'], url_path='batch')
+    def batch(self, request):
+        """Items for ?ids= or {"ids": [...]}, in the requested order."""
+        if request.method == 'POST':
+            ids = request.data.get('ids') if isinstance(request.data, dict) else None
+            if not isinstance(ids, list):
+                return Response({'detail': 'Expected {"ids": [...]}.'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            ids = [value for param in request.query_params.getlist('ids') for value in param.split(',') if value.strip()]
+        if not ids:
+            return Response({'detail': 'ids is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.batch_max_ids:
+            return Response(
+                {'detail': f'At most {self.batch_max_ids} ids per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.batch_queryset()
+        pk_field = queryset.model._meta.pk
+        pks, invalid = [], []
+        for value in ids:
+            # Only strings and integers: to_python() would truncate 1.5 to 1
+            # and accept True as 1
+            if isinstance(value, str):
+                value = value.strip()
+            elif not isinstance(value, int) or isinstance(value, bool):
+                invalid.append(value)
+                continue
+            try:
+                pk = pk_field.to_python(value)
+            except DjangoValidationError:
+                pk = None
+            if pk is None:
+                invalid.append(value)
+            elif pk not in pks:
+                pks.append(pk)
+        if invalid:
+            return Response({'detail': 'Invalid ids.', 'invalid': invalid}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = queryset.in_bulk(pks)
+        serializer = self.get_serializer([rows[pk] for pk in pks if pk in rows], many=True)
+        return Response({
+            'count': len(rows),
+            'results': serializer.data,
+            'missing': [pk for pk in pks if pk not in rows],
+        })
+
+
+class BulkViewSetMixin:
+    """
+    Mixin adding list-style bulk endpoints at <prefix>/bulk/.
+
+    - POST: create from a list of objects
+    - PATCH: partially update a list of objects, each with its "id"
+    - DELETE: soft delete {"ids": [...]} with their cascade, as one deletion batch
+
+    Each request is validated in one pass and written in one transaction:
+    either every item succeeds or nothing is written and the response lists
+    the errors per item, in input order.
+    """
+    bulk_max_items = 5000
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        context = self.get_serializer_context()
+        child = self.get_serializer_class()(partial=kwargs.get('partial', False), context=context)
+        return BulkListSerializer(*args, child=child, context=context, **kwargs)
+
+    def bulk_response(self, instances, status_code):
+        """Items re-read through get_queryset() (for annotations and joins), in input order."""
+        rows = self.get_queryset().select_related('created_by').in_bulk([instance.pk for instance in instances])
+        serializer = self.get_serializer([rows[instance.pk] for instance in instances], many=True)
+        return Response({'count': len(instances), 'results': serializer.data}, status=status_code)
+
+    def check_bulk_size(self, items):
+        if not isinstance(items, list) or not items:
+            return Response({'detail': 'Expected a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {'detail': f'At most {self.bulk_max_items} items per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return None
+
+    def bulk_instances(self, items):
+        """(instances in input order, per-item errors or None) for items carrying an "id"."""
+        ids, errors = [], []
+        for item in items:
+            try:
+                ids.append(uuid.UUID(str(item.get('id') if isinstance(item, dict) else item)))
+                errors.append({})
+            except ValueError:
+                ids.append(None)
+                errors.append({'id': ['A valid id is required.']})
+        rows = self.get_queryset().in_bulk([pk for pk in ids if pk])
+        for index, pk in enumerate(ids):
+            if pk and pk not in rows:
+                errors[index] = {'id': ['Not found.']}
+        if len(set(ids)) != len(ids):
+            seen = set()
+            for index, pk in enumerate(ids):
+                if pk in seen and not errors[index]:
+                    errors[index] = {'id': ['Duplicate id.']}
+                seen.add(pk)
+        if any(errors):
+            return None, errors
+        return [rows[pk] for pk in ids], None
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """Create many items; the response lists them in input order."""
+        error = self.check_bulk_size(request.data)
+        if error:
+            return error
+        serializer = self.get_bulk_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'detail': 'Validation failed.', 'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            instances = serializer.save(created_by=request.user)
+        except serializers.ValidationError as e:
+            return Response({'detail': 'Validation failed.', 'errors': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        return self.bulk_response(instances, status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Partially update many items, each identified by its "id"."""
+        error = self.check_bulk_size(request.data)
+        if error:
+            return error
+        instances, errors = self.bulk_instances(request.data)
+        if errors:
+            return Response({'detail': 'Validation failed.', 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_bulk_serializer(instances, data=request.data, partial=True)
+        if not serializer.is_valid():
+            return Response({'detail': 'Validation failed.', 'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            serializer.save()
+        except serializers.ValidationError as e:
+            return Response({'detail': 'Validation failed.', 'errors': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        return self.bulk_response(instances, status.HTTP_200_OK)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        """Soft delete many items and everything that belongs to them."""
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        error = self.check_bulk_size(ids)
+        if error:
+            return error
+        instances, errors = self.bulk_instances(ids)
+        if errors:
+            return Response({'detail': 'Validation failed.', 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        batch, counts = cascade_soft_delete_many(
+            self.get_queryset().model, [instance.pk for instance in instances], user=request.user
+        )
+        return Response(
+            {
+                'detail': f'{len(instances)} items moved to deleted items.',
+                'deletion_batch': batch,
+                'deleted': counts,
+                'ids': [instance.pk for instance in instances],
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class OrganizationViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Organization CRUD operations."""
     serializer_class = OrganizationSerializer
     permission_classes = [IsAuthenticated]
@@ -137,7 +367,7 @@ class OrganizationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         })
 
 
-class LocationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class LocationViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Location CRUD operations."""
     serializer_class = LocationSerializer
     permission_classes = [IsAuthenticated]
@@ -162,7 +392,7 @@ class LocationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
 
-class ContactViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class ContactViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Contact CRUD operations."""
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticated]
@@ -295,12 +525,12 @@ class ContactViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
             )
 
 
-class DocumentationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class DocumentationViewSet(BatchRetrieveViewSetMixin, FullTextSearchViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Documentation CRUD operations."""
     serializer_class = DocumentationSerializer
+    search_result_serializer_class = DocumentationSearchResultSerializer
     permission_classes = [IsAuthenticated]
-    filterset_fields = ['organization', 'category', 'is_published']
-    search_fields = ['title', 'content', 'tags']
+    filterset_class = DocumentationFilter
     ordering_fields = ['title', 'created_at', 'category']
     ordering = ['-created_at']
 
@@ -324,6 +554,16 @@ class DocumentationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         documentation.save()
         return Response({'status': 'documentation unpublished'})
 
+    @action(detail=False, methods=['get'])
+    def tag_cloud(self, request):
+        """Tag usage counts with 1-5 cloud weights; accepts the list filters (e.g. ?organization=)."""
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 100)), 1), 500)
+        except ValueError:
+            limit = 100
+        return Response(build_tag_cloud(queryset, limit=limit))
+
     @action(detail=False, methods=['get'])
     def by_organization(self, request):
         org_id = request.query_params.get('organization_id')
@@ -334,7 +574,7 @@ class DocumentationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
 
-class PasswordEntryViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class PasswordEntryViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for PasswordEntry CRUD operations."""
     serializer_class = PasswordEntrySerializer
     permission_classes = [IsAuthenticated]
@@ -359,12 +599,12 @@ class PasswordEntryViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
 
-class ConfigurationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class ConfigurationViewSet(BatchRetrieveViewSetMixin, FullTextSearchViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Configuration CRUD operations."""
     serializer_class = ConfigurationSerializer
+    search_result_serializer_class = ConfigurationSearchResultSerializer
     permission_classes = [IsAuthenticated]
     filterset_fields = ['organization', 'config_type', 'is_active']
-    search_fields = ['name', 'description', 'content']
     ordering_fields = ['name', 'config_type', 'created_at']
     ordering = ['organization', 'config_type', 'name']
 
@@ -384,7 +624,7 @@ class ConfigurationViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
 
-class NetworkDeviceViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class NetworkDeviceViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for NetworkDevice CRUD operations."""
     serializer_class = NetworkDeviceSerializer
     permission_classes = [IsAuthenticated]
@@ -409,7 +649,7 @@ class NetworkDeviceViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
 
-class EndpointUserViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class EndpointUserViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for EndpointUser CRUD operations."""
     serializer_class = EndpointUserSerializer
     permission_classes = [IsAuthenticated]
@@ -434,7 +674,7 @@ class EndpointUserViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
 
-class ServerViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class ServerViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Server CRUD operations."""
     serializer_class = ServerSerializer
     permission_classes = [IsAuthenticated]
@@ -459,7 +699,7 @@ class ServerViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
 
-class PeripheralViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class PeripheralViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Peripheral CRUD operations."""
     serializer_class = PeripheralSerializer
     permission_classes = [IsAuthenticated]
@@ -484,7 +724,7 @@ class PeripheralViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
 
-class SoftwareViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class SoftwareViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Software CRUD operations."""
     serializer_class = SoftwareSerializer
     permission_classes = [IsAuthenticated]
@@ -516,14 +756,34 @@ class SoftwareViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
             return Response(serializer.data)
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['get'])
+    def compliance(self, request):
+        """
+        Licence compliance for one organization: over-assigned licences,
+        unused seats and installs not covered by a licence.
+
+        The report is cached until the organization's licences, assignments
+        or inventory change; ?refresh=true recomputes it.
+        """
+        org_id, error = organization_id_param(request, required=True)
+        if error:
+            return error
+        if not Organization.objects.filter(id=org_id).exists():
+            return Response(
+                {'detail': 'Organization not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        refresh = request.query_params.get('refresh', '').lower() in ('1', 'true', 'yes')
+        return Response(compliance_report(org_id, refresh=refresh))
 
-class BackupViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+
+class BackupViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Backup CRUD operations."""
     serializer_class = BackupSerializer
     permission_classes = [IsAuthenticated]
-    filterset_fields = ['organization', 'backup_type', 'backup_status', 'location', 'is_active']
+    filterset_fields = ['organization', 'backup_type', 'backup_status', 'health_status', 'location', 'is_active']
     search_fields = ['name', 'vendor', 'target_systems', 'storage_location']
-    ordering_fields = ['name', 'backup_type', 'last_backup_date', 'created_at']
+    ordering_fields = ['name', 'backup_type', 'last_backup_date', 'overdue_since', 'created_at']
     ordering = ['organization', 'backup_type', 'name']
 
     def get_queryset(self):
@@ -541,8 +801,23 @@ class BackupViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
             return Response(serializer.data)
         return Response([], status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['get'])
+    def at_risk(self, request):
+        """Overdue and failed backups, longest overdue first; ?organization_id= narrows to one client."""
+        org_id, error = organization_id_param(request)
+        if error:
+            return error
+        backups = backups_at_risk(org_id).select_related('organization', 'location')
+
+        page = self.paginate_queryset(backups)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(backups, many=True)
+        return Response(serializer.data)
+
 
-class VoIPViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+class VoIPViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for VoIP CRUD operations."""
     serializer_class = VoIPSerializer
     permission_classes = [IsAuthenticated]
@@ -573,3 +848,208 @@ class VoIPViewSet(SoftDeleteViewSetMixin, viewsets.ModelViewSet):
             serializer = self.get_serializer(voip, many=True)
             return Response(serializer.data)
         return Response([], status=status.HTTP_400_BAD_REQUEST)
+
+
+class RMMEndpointViewSet(BatchRetrieveViewSetMixin, SoftDeleteViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Endpoints synced from Tactical RMM: read-only, except that an endpoint can
+    be moved to the trash (and restored or purged) like other items. The sync
+    leaves trashed endpoints alone until they are restored.
+    """
+    permission_classes = [IsAuthenticated]
+    filterset_class = RMMEndpointFilter
+    search_fields = ['name', 'serial_number', 'logged_in_user', 'operating_system']
+    ordering_fields = ['name', 'status', 'last_seen', 'last_sync', 'ram_gb', 'disk_free_gb', 'disk_used', 'disk_usage']
+    ordering = ['-last_sync']
+
+    def get_queryset(self):
+        return RMMEndpoint.objects.with_disk_usage().select_related('organization', 'location')
+
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return RMMEndpointDetailSerializer
+        return RMMEndpointSerializer
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """Fleet status counts, OS distribution and capacity totals from a single grouped query."""
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        rows = queryset.values('operating_system').annotate(
+            total=Count('id'),
+            online=Count('id', filter=Q(status='online')),
+            offline=Count('id', filter=Q(status='offline')),
+            unknown=Count('id', filter=Q(status='unknown')),
+            stale=Count('id', filter=Q(status='stale')),
+            ram_gb=Sum('ram_gb'),
+            disk_total_gb=Sum('disk_total_gb'),
+            disk_free_gb=Sum('disk_free_gb'),
+        ).order_by('-total')
+
+        status_counts = {'online': 0, 'offline': 0, 'unknown': 0, 'stale': 0}
+        os_distribution = []
+        totals = {'endpoints': 0, 'ram_gb': 0.0, 'disk_total_gb': 0.0, 'disk_free_gb': 0.0}
+        for row in rows:
+            for key in status_counts:
+                status_counts[key] += row[key]
+            os_distribution.append({'operating_system': row['operating_system'], 'count': row['total']})
+            totals['endpoints'] += row['total']
+            totals['ram_gb'] += row['ram_gb'] or 0
+            totals['disk_total_gb'] += row['disk_total_gb'] or 0
+            totals['disk_free_gb'] += row['disk_free_gb'] or 0
+
+        totals = {key: round(value, 2) for key, value in totals.items()}
+        totals['disk_used_gb'] = round(totals['disk_total_gb'] - totals['disk_free_gb'], 2)
+        return Response({
+            'status_counts': status_counts,
+            'os_distribution': os_distribution,
+            'capacity': totals,
+        })
+
+    @action(detail=False, methods=['get', 'post'])
+    def reconcile(self, request):
+        """
+        Match RMM endpoints against documented endpoints and servers.
+
+        GET returns the report only; POST also links matches and, with
+        backfill=true, fills blank hardware fields on documented assets.
+        """
+        org_id, error = organization_id_param(request, required=True)
+        if error:
+            return error
+        if not Organization.objects.filter(id=org_id).exists():
+            return Response(
+                {'detail': 'Organization not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if request.method == 'POST':
+            backfill = str(request.data.get('backfill', '')).lower() in ('1', 'true', 'yes')
+            report = reconcile_organization(org_id, backfill=backfill, link=True)
+        else:
+            report = reconcile_organization(org_id, backfill=False, link=False)
+        return Response(report)
+
+
+class SoftwareCatalogViewSet(BatchRetrieveViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Installed software titles with installation counts.
+
+    `?organization=` restricts the counts to one organization and
+    `?search=` matches a name prefix.
+    """
+    serializer_class = SoftwareCatalogEntrySerializer
+    permission_classes = [IsAuthenticated]
+    search_fields = ['^normalized_name']
+    ordering_fields = ['normalized_name', 'install_count']
+    ordering = ['normalized_name']
+
+    def get_queryset(self):
+        org_id, error = uuid_param(self.request, 'organization')
+        if error:
+            raise ParseError(error.data['detail'])
+        installs = Q(installations__organization_id=org_id) if org_id else Q()
+        queryset = SoftwareCatalogEntry.objects.annotate(install_count=Count('installations', filter=installs))
+        if org_id:
+            queryset = queryset.filter(install_count__gt=0)
+        return queryset
+
+    @action(detail=True, methods=['get'])
+    def installations(self, request, pk=None):
+        """Machines with this title; accepts the software-installations filters (e.g. ?version_lt=120)."""
+        catalog = self.get_object()
+        queryset = SoftwareInstallation.objects.filter(catalog=catalog).select_related(
+            'catalog', 'endpoint_user', 'server'
+        ).order_by('version_key')
+        queryset = SoftwareInstallationFilter(request.query_params, queryset=queryset).qs
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = SoftwareInstallationSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(SoftwareInstallationSerializer(queryset, many=True).data)
+
+
+class SoftwareInstallationViewSet(BatchRetrieveViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Software installations on documented endpoints and servers.
+
+    Filter by software (`?name=`, `?name_prefix=`, `?version_lt=` ...) to find
+    machines, or by machine (`?endpoint_user=`, `?server=`) to list its software.
+    """
+    serializer_class = SoftwareInstallationSerializer
+    permission_classes = [IsAuthenticated]
+    filterset_class = SoftwareInstallationFilter
+    ordering_fields = ['version_key', 'catalog__normalized_name']
+    ordering = ['catalog__normalized_name', 'version_key']
+
+    def get_queryset(self):
+        return SoftwareInstallation.objects.select_related('catalog', 'endpoint_user', 'server')
+
+
+class SubnetViewSet(BatchRetrieveViewSetMixin, BulkViewSetMixin, SoftDeleteViewSetMixin, viewsets.ModelViewSet):
+    """
+    Documented subnets with address utilization.
+
+    `used` counts distinct indexed addresses of the subnet's organization inside
+    the network; `size` is the number of assignable addresses.
+    """
+    serializer_class = SubnetSerializer
+    permission_classes = [IsAuthenticated]
+    filterset_fields = ['organization', 'location', 'vlan_id']
+    search_fields = ['name', 'network', 'description']
+    ordering_fields = ['name', 'start_key', 'vlan_id', 'created_at']
+    ordering = ['organization', 'start_key']
+
+    def get_queryset(self):
+        return with_utilization(Subnet.objects.select_related('organization', 'location'))
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=['get'])
+    def addresses(self, request, pk=None):
+        """Indexed addresses inside this subnet, in address order."""
+        subnet = self.get_object()
+        entries = in_network(
+            IPAddressEntry.objects.filter(organization_id=subnet.organization_id), parse_network(subnet.network)
+        ).order_by('address_key', 'name')
+        page = self.paginate_queryset(entries)
+        if page is not None:
+            return self.get_paginated_response(IPAddressEntrySerializer(page, many=True).data)
+        return Response(IPAddressEntrySerializer(entries, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def utilization(self, request):
+        """Subnet utilization of one organization grouped by location (?organization_id=, ?location_id=)."""
+        org_id, error = organization_id_param(request, required=True)
+        if error:
+            return error
+        location_id, error = uuid_param(request, 'location_id')
+        if error:
+            return error
+        return Response(location_utilization(org_id, location_id))
+
+
+class IPAddressViewSet(BatchRetrieveViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Validated IP addresses of network devices, endpoints, servers and peripherals.
+
+    `?network=10.20.0.0/16` lists everything inside a subnet; the `conflicts`
+    action reports addresses held by more than one device in an organization.
+    """
+    serializer_class = IPAddressEntrySerializer
+    permission_classes = [IsAuthenticated]
+    filterset_class = IPAddressEntryFilter
+    ordering_fields = ['address_key', 'name']
+    ordering = ['address_key', 'name']
+
+    def get_queryset(self):
+        return IPAddressEntry.objects.all()
+
+    @action(detail=False, methods=['get'])
+    def conflicts(self, request):
+        """Duplicate addresses within an organization (?organization_id= narrows to one)."""
+        org_id, error = organization_id_param(request)
+        if error:
+            return error
+        conflicts = ip_conflicts(org_id)
+        return Response({'count': len(conflicts), 'results': conflicts})
@@ -1,92 +1,60 @@
 import React, { useState, useEffect } from 'react';
 import { Card } from '../components/ui/Card';
 import { Button } from '../components/ui/Button';
-import { ListHeader } from '../components/ListHeader';
-import { RotateCcw, Trash2, RefreshCw } from 'lucide-react';
-import {
-  organizationAPI, locationAPI, contactAPI, documentationAPI,
-  passwordAPI, configurationAPI, networkDeviceAPI, endpointUserAPI,
-  serverAPI, peripheralAPI
-} from '../services/core';
+import { Trash2, RefreshCw } from 'lucide-react';
+import { trashAPI } from '../services/core';
+import { TrashItem, TrashItemType } from '../types/core';
 
-type EntityType =
-  | 'organizations'
-  | 'locations'
-  | 'contacts'
-  | 'documentations'
-  | 'passwords'
-  | 'configurations'
-  | 'network-devices'
-  | 'endpoints'
-  | 'servers'
-  | 'peripherals';
+const PAGE_SIZE = 50;
+
+const typeLabels: Record<TrashItemType, string> = {
+  organization: 'Organization',
+  location: 'Location',
+  contact: 'Contact',
+  documentation: 'Documentation',
+  password: 'Password',
+  configuration: 'Configuration',
+  network_device: 'Network Device',
+  endpoint_user: 'Endpoint',
+  server: 'Server',
+  peripheral: 'Peripheral',
+  subnet: 'Subnet',
+  software: 'Software',
+  software_assignment: 'Software Assignment',
+  backup: 'Backup',
+  voip: 'VoIP',
+  voip_assignment: 'VoIP Assignment',
+  rmm_source: 'RMM Source',
+  rmm_endpoint: 'RMM Endpoint',
+};
+
+const itemKey = (item: Pick<TrashItem, 'type' | 'id'>) => `${item.type}:${item.id}`;
 
 const DeletedItems: React.FC = () => {
-  const [activeTab, setActiveTab] = useState<EntityType>('organizations');
+  const [typeFilter, setTypeFilter] = useState<TrashItemType | 'all'>('all');
+  const [items, setItems] = useState<TrashItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [selected, setSelected] = useState<Set<string>>(new Set());
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState<string | null>(null);
 
-  // State for each entity type
-  const [deletedItems, setDeletedItems] = useState<Record<EntityType, any[]>>({
-    organizations: [],
-    locations: [],
-    contacts: [],
-    documentations: [],
-    passwords: [],
-    configurations: [],
-    'network-devices': [],
-    endpoints: [],
-    servers: [],
-    peripherals: [],
-  });
-
-  const entityConfig = {
-    organizations: { api: organizationAPI, label: 'Organizations', nameField: 'name' },
-    locations: { api: locationAPI, label: 'Locations', nameField: 'name' },
-    contacts: { api: contactAPI, label: 'Contacts', nameField: 'full_name' },
-    documentations: { api: documentationAPI, label: 'Documentation', nameField: 'title' },
-    passwords: { api: passwordAPI, label: 'Passwords', nameField: 'name' },
-    configurations: { api: configurationAPI, label: 'Configurations', nameField: 'name' },
-    'network-devices': { api: networkDeviceAPI, label: 'Network Devices', nameField: 'name' },
-    endpoints: { api: endpointUserAPI, label: 'Endpoints', nameField: 'name' },
-    servers: { api: serverAPI, label: 'Servers', nameField: 'name' },
-    peripherals: { api: peripheralAPI, label: 'Peripherals', nameField: 'name' },
-  };
-
   useEffect(() => {
-    loadAllDeletedItems();
-  }, []);
+    loadItems();
+  }, [typeFilter]);
 
-  const loadAllDeletedItems = async () => {
+  const loadItems = async (cursor?: string) => {
     setLoading(true);
     setError(null);
     try {
-      const results = await Promise.all([
-        organizationAPI.getDeleted(),
-        locationAPI.getDeleted(),
-        contactAPI.getDeleted(),
-        documentationAPI.getDeleted(),
-        passwordAPI.getDeleted(),
-        configurationAPI.getDeleted(),
-        networkDeviceAPI.getDeleted(),
-        endpointUserAPI.getDeleted(),
-        serverAPI.getDeleted(),
-        peripheralAPI.getDeleted(),
-      ]);
-
-      setDeletedItems({
-        organizations: results[0].data.results || [],
-        locations: results[1].data.results || [],
-        contacts: results[2].data.results || [],
-        documentations: results[3].data.results || [],
-        passwords: results[4].data.results || [],
-        configurations: results[5].data.results || [],
-        'network-devices': results[6].data.results || [],
-        endpoints: results[7].data.results || [],
-        servers: results[8].data.results || [],
-        peripherals: results[9].data.results || [],
+      const response = await trashAPI.list({
+        types: typeFilter === 'all' ? undefined : [typeFilter],
+        limit: PAGE_SIZE,
+        cursor,
       });
+      setItems(cursor ? [...items, ...response.data.results] : response.data.results);
+      setNextCursor(response.data.next);
+      if (!cursor) setSelected(new Set());
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to load deleted items');
     } finally {
@@ -94,32 +62,51 @@ const DeletedItems: React.FC = () => {
     }
   };
 
-  const handleRestore = async (id: string, entityType: EntityType) => {
+  const toggleSelected = (item: TrashItem) => {
+    const next = new Set(selected);
+    if (next.has(itemKey(item))) {
+      next.delete(itemKey(item));
+    } else {
+      next.add(itemKey(item));
+    }
+    setSelected(next);
+  };
+
+  const toggleAll = () => {
+    setSelected(selected.size === items.length ? new Set() : new Set(items.map(itemKey)));
+  };
+
+  const showSuccess = (message: string) => {
+    setSuccess(message);
+    setTimeout(() => setSuccess(null), 3000);
+  };
+
+  const showError = (message: string) => {
+    setError(message);
+    setTimeout(() => setError(null), 5000);
+  };
+
+  const handleRestore = async (targets: TrashItem[]) => {
     try {
-      const config = entityConfig[entityType];
-      await config.api.restore(id);
-      setSuccess(`${config.label} item restored successfully!`);
-      setTimeout(() => setSuccess(null), 3000);
-      loadAllDeletedItems();
+      const response = await trashAPI.restore(targets.map(({ type, id }) => ({ type, id })));
+      showSuccess(response.data.detail);
+      loadItems();
     } catch (err: any) {
-      setError(err.response?.data?.detail || `Failed to restore item`);
-      setTimeout(() => setError(null), 5000);
+      showError(err.response?.data?.detail || 'Failed to restore items');
     }
   };
 
-  const handleHardDelete = async (id: string, entityType: EntityType) => {
-    const config = entityConfig[entityType];
-    if (!window.confirm(`Are you sure you want to PERMANENTLY delete this ${config.label} item? This action cannot be undone!`)) {
+  const handlePurge = async (targets: TrashItem[]) => {
+    const what = targets.length === 1 ? `"${targets[0].label}"` : `${targets.length} items`;
+    if (!window.confirm(`Are you sure you want to PERMANENTLY delete ${what}? Everything that belongs to them is deleted too. This action cannot be undone!`)) {
       return;
     }
     try {
-      await config.api.hardDelete(id);
-      setSuccess(`${config.label} item permanently deleted!`);
-      setTimeout(() => setSuccess(null), 3000);
-      loadAllDeletedItems();
+      const response = await trashAPI.purge(targets.map(({ type, id }) => ({ type, id })));
+      showSuccess(response.data.detail);
+      loadItems();
     } catch (err: any) {
-      setError(err.response?.data?.detail || `Failed to permanently delete item`);
-      setTimeout(() => setError(null), 5000);
+      showError(err.response?.data?.detail || 'Failed to permanently delete items');
     }
   };
 
@@ -128,8 +115,7 @@ const DeletedItems: React.FC = () => {
     return new Date(dateString).toLocaleString();
   };
 
-  const currentItems = deletedItems[activeTab];
-  const config = entityConfig[activeTab];
+  const selectedItems = items.filter((item) => selected.has(itemKey(item)));
 
   return (
     <div className="space-y-6">
@@ -152,42 +138,65 @@ const DeletedItems: React.FC = () => {
         </div>
       )}
 
-      {/* Tab Navigation */}
       <Card>
+        {/* Type filter */}
         <div className="border-b border-border overflow-x-auto">
           <div className="flex min-w-max">
-            {Object.entries(entityConfig).map(([key, value]) => {
-              const count = deletedItems[key as EntityType].length;
-              return (
-                <button
-                  key={key}
-                  onClick={() => setActiveTab(key as EntityType)}
-                  className={`px-4 py-3 text-sm font-medium border-b-2 transition-colors whitespace-nowrap ${
-                    activeTab === key
-                      ? 'border-primary text-primary'
-                      : 'border-transparent text-muted-foreground hover:text-foreground hover:border-border'
-                  }`}
-                >
-                  {value.label} ({count})
-                </button>
-              );
-            })}
+            {(['all', ...Object.keys(typeLabels)] as (TrashItemType | 'all')[]).map((key) => (
+              <button
+                key={key}
+                onClick={() => setTypeFilter(key)}
+                className={`px-4 py-3 text-sm font-medium border-b-2 transition-colors whitespace-nowrap ${
+                  typeFilter === key
+                    ? 'border-primary text-primary'
+                    : 'border-transparent text-muted-foreground hover:text-foreground hover:border-border'
+                }`}
+              >
+                {key === 'all' ? 'All' : typeLabels[key]}
+              </button>
+            ))}
           </div>
         </div>
 
         {/* Content */}
         <div className="p-6">
-          {loading ? (
+          {selectedItems.length > 0 && (
+            <div className="flex items-center justify-between mb-4">
+              <span className="text-sm text-muted-foreground">{selectedItems.length} selected</span>
+              <div className="flex gap-2">
+                <Button
+                  variant="outline"
+                  size="sm"
+                  onClick={() => handleRestore(selectedItems)}
+                  className="flex items-center gap-1"
+                >
+                  <RefreshCw className="h-4 w-4" />
+                  Restore Selected
+                </Button>
+                <Button
+                  variant="destructive"
+                  size="sm"
+                  onClick={() => handlePurge(selectedItems)}
+                  className="flex items-center gap-1"
+                >
+                  <Trash2 className="h-4 w-4" />
+                  Delete Selected Forever
+                </Button>
+              </div>
+            </div>
+          )}
+
+          {loading && items.length === 0 ? (
             <div className="text-center py-12">
               <div className="inline-block animate-spin rounded-full h-8 w-8 border-b-2 border-blue-500"></div>
               <p className="mt-4 text-gray-400">Loading deleted items...</p>
             </div>
-          ) : currentItems.length === 0 ? (
+          ) : items.length === 0 ? (
             <div className="text-center py-12">
               <Trash2 className="mx-auto h-12 w-12 text-muted-foreground/50" />
               <h3 className="mt-4 text-lg font-semibold">No deleted items</h3>
               <p className="text-muted-foreground">
-                No deleted {config.label.toLowerCase()} found
+                {typeFilter === 'all' ? 'The trash is empty' : `No deleted ${typeLabels[typeFilter].toLowerCase()} items found`}
               </p>
             </div>
           ) : (
@@ -195,39 +204,48 @@ const DeletedItems: React.FC = () => {
               <table className="w-full">
                 <thead>
                   <tr className="border-b border-border">
+                    <th className="py-3 px-4 w-8">
+                      <input
+                        type="checkbox"
+                        checked={selected.size === items.length}
+                        onChange={toggleAll}
+                      />
+                    </th>
                     <th className="text-left py-3 px-4 font-semibold text-sm">Name</th>
+                    <th className="text-left py-3 px-4 font-semibold text-sm">Type</th>
                     <th className="text-left py-3 px-4 font-semibold text-sm">Deleted At</th>
                     <th className="text-left py-3 px-4 font-semibold text-sm">Deleted By</th>
                     <th className="text-right py-3 px-4 font-semibold text-sm">Actions</th>
                   </tr>
                 </thead>
                 <tbody>
-                  {currentItems.map((item: any) => (
-                    <tr key={item.id} className="border-b border-border/50 hover:bg-accent/5">
+                  {items.map((item) => (
+                    <tr key={itemKey(item)} className="border-b border-border/50 hover:bg-accent/5">
                       <td className="py-3 px-4">
-                        <div className="font-medium">
-                          {item[config.nameField] || item.title || 'N/A'}
-                        </div>
-                        {item.organization_name && (
-                          <div className="text-sm text-muted-foreground">
-                            {item.organization_name}
-                          </div>
-                        )}
+                        <input
+                          type="checkbox"
+                          checked={selected.has(itemKey(item))}
+                          onChange={() => toggleSelected(item)}
+                        />
+                      </td>
+                      <td className="py-3 px-4">
+                        <div className="font-medium">{item.label || 'N/A'}</div>
+                      </td>
+                      <td className="py-3 px-4 text-sm text-muted-foreground">
+                        {typeLabels[item.type]}
                       </td>
                       <td className="py-3 px-4 text-sm text-muted-foreground">
                         {formatDate(item.deleted_at)}
                       </td>
                       <td className="py-3 px-4 text-sm text-muted-foreground">
-                        {item.deleted_by
-                          ? `${item.deleted_by.first_name} ${item.deleted_by.last_name}`
-                          : 'N/A'}
+                        {item.deleted_by || 'N/A'}
                       </td>
                       <td className="py-3 px-4">
                         <div className="flex justify-end gap-2">
                           <Button
                             variant="outline"
                             size="sm"
-                            onClick={() => handleRestore(item.id, activeTab)}
+                            onClick={() => handleRestore([item])}
                             className="flex items-center gap-1"
                           >
                             <RefreshCw className="h-4 w-4" />
@@ -236,7 +254,7 @@ const DeletedItems: React.FC = () => {
                           <Button
                             variant="destructive"
                             size="sm"
-                            onClick={() => handleHardDelete(item.id, activeTab)}
+                            onClick={() => handlePurge([item])}
                             className="flex items-center gap-1"
                           >
                             <Trash2 className="h-4 w-4" />
@@ -248,6 +266,13 @@ const DeletedItems: React.FC = () => {
                   ))}
                 </tbody>
               </table>
+              {nextCursor && (
+                <div className="text-center pt-4">
+                  <Button variant="outline" size="sm" onClick={() => loadItems(nextCursor)} disabled={loading}>
+                    {loading ? 'Loading...' : 'Load more'}
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </div>
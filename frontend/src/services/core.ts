@@ -2,7 +2,10 @@ import api from './api';
 import {
   Organization, Location, Contact, Documentation,
   PasswordEntry, Configuration, NetworkDevice, EndpointUser,
-  Server, Peripheral, Software, Backup, VoIP, DiagramData, PaginatedResponse
+  Server, Peripheral, Software, Backup, VoIP, DiagramData, PaginatedResponse,
+  AutocompleteKind, AutocompleteOption, ExpiringResponse, PhoneLookupResponse, ExtensionConflict,
+  Subnet, IPAddressEntry, MACLookupResponse, AssetIdentifier, AssetIndexHit, DuplicateAsset,
+  TrashItem, TrashItemType, TrashPage, BulkResponse, BulkDeleteResponse, BatchResponse
 } from '../types/core';
 
 // Dashboard APIs
@@ -340,3 +343,102 @@ export const diagramAPI = {
     return api.get<DiagramData>('/api/diagram/data/', { params: Object.keys(params).length > 0 ? params : undefined });
   },
 };
+
+// Autocomplete APIs
+export const autocompleteAPI = {
+  lookup: (kind: AutocompleteKind, q: string, organizationId?: string, limit?: number) => {
+    const params: Record<string, string | number> = { q };
+    if (organizationId) params.organization_id = organizationId;
+    if (limit) params.limit = limit;
+    return api.get<AutocompleteOption[]>(`/api/autocomplete/${kind}/`, { params });
+  },
+};
+
+export const subnetAPI = {
+  getAll: (params?: Record<string, any>) =>
+    api.get<PaginatedResponse<Subnet>>('/api/subnets/', { params }),
+  getById: (id: string) =>
+    api.get<Subnet>(`/api/subnets/${id}/`),
+  create: (data: Partial<Subnet>) =>
+    api.post<Subnet>('/api/subnets/', data),
+  update: (id: string, data: Partial<Subnet>) =>
+    api.patch<Subnet>(`/api/subnets/${id}/`, data),
+  delete: (id: string) =>
+    api.delete(`/api/subnets/${id}/`),
+  addresses: (id: string, params?: Record<string, any>) =>
+    api.get<PaginatedResponse<IPAddressEntry>>(`/api/subnets/${id}/addresses/`, { params }),
+};
+
+export const ipAddressAPI = {
+  getAll: (params?: Record<string, any>) =>
+    api.get<PaginatedResponse<IPAddressEntry>>('/api/ip-addresses/', { params }),
+  inNetwork: (network: string, organizationId?: string) =>
+    api.get<PaginatedResponse<IPAddressEntry>>('/api/ip-addresses/', {
+      params: organizationId ? { network, organization: organizationId } : { network },
+    }),
+};
+
+export const phoneAPI = {
+  lookupNumber: (number: string, organizationId?: string) =>
+    api.get<PhoneLookupResponse>('/api/phone/lookup/', {
+      params: organizationId ? { number, organization_id: organizationId } : { number },
+    }),
+  lookupExtension: (extension: string, organizationId: string) =>
+    api.get<PhoneLookupResponse>('/api/phone/lookup/', { params: { extension, organization_id: organizationId } }),
+  extensionConflicts: (organizationId?: string) =>
+    api.get<{ count: number; results: ExtensionConflict[] }>('/api/phone/extension-conflicts/', {
+      params: organizationId ? { organization_id: organizationId } : {},
+    }),
+};
+
+export const macAPI = {
+  lookup: (mac: string, organizationId?: string) =>
+    api.get<MACLookupResponse>('/api/mac/lookup/', {
+      params: organizationId ? { mac, organization_id: organizationId } : { mac },
+    }),
+  vendors: (macs: string[]) =>
+    api.post<{ results: Record<string, string | null> }>('/api/mac/vendors/', { macs }),
+};
+
+export const assetIndexAPI = {
+  lookup: (q: string, params?: { identifiers?: AssetIdentifier[]; organization_id?: string }) =>
+    api.get<{ query: string; count: number; results: AssetIndexHit[] }>('/api/assets/lookup/', {
+      params: { q, ...params, identifiers: params?.identifiers?.join(',') },
+    }),
+  duplicates: (params?: { identifiers?: AssetIdentifier[]; organization_id?: string }) =>
+    api.get<{ count: number; results: DuplicateAsset[] }>('/api/assets/duplicates/', {
+      params: { ...params, identifiers: params?.identifiers?.join(',') },
+    }),
+};
+
+export const expiringAPI = {
+  list: (params?: { start?: string; end?: string; organization_id?: string; types?: string; limit?: number }) =>
+    api.get<ExpiringResponse>('/api/dashboard/expiring/', { params }),
+};
+
+export const trashAPI = {
+  list: (params?: { organization_id?: string; types?: TrashItemType[]; limit?: number; cursor?: string }) =>
+    api.get<TrashPage>('/api/trash/', { params: { ...params, types: params?.types?.join(',') } }),
+  restore: (items: Pick<TrashItem, 'type' | 'id'>[]) =>
+    api.post<{ detail: string; restored: Record<string, number> }>('/api/trash/restore/', { items }),
+  purge: (items: Pick<TrashItem, 'type' | 'id'>[]) =>
+    api.post<{ detail: string; deleted: Record<string, number> }>('/api/trash/purge/', { items }),
+};
+
+// Bulk create, update and delete on any writable resource, e.g. bulkAPI<Server>('servers').
+// Each call validates every item first and writes all of them or none.
+export const bulkAPI = <T extends { id: string }>(resource: string) => ({
+  create: (items: Partial<T>[]) =>
+    api.post<BulkResponse<T>>(`/api/${resource}/bulk/`, items),
+  update: (items: (Partial<T> & Pick<T, 'id'>)[]) =>
+    api.patch<BulkResponse<T>>(`/api/${resource}/bulk/`, items),
+  delete: (ids: string[]) =>
+    api.delete<BulkDeleteResponse>(`/api/${resource}/bulk/`, { data: { ids } }),
+});
+
+// Fetch many items of any resource by id in one request, e.g. batchAPI<Contact>('contacts').get(ids).
+// Ids travel in the POST body so long lists stay clear of URL length limits.
+export const batchAPI = <T>(resource: string) => ({
+  get: (ids: string[]) =>
+    api.post<BatchResponse<T>>(`/api/${resource}/batch/`, { ids }),
+});
@@ -132,6 +132,7 @@ export interface NetworkDevice {
   model: string;
   ip_address: string;
   mac_address: string;
+  mac_vendor: string | null;
   serial_number: string;
   firmware_version: string;
   location: string | null;
@@ -164,6 +165,7 @@ export interface EndpointUser {
   software_installed: string;
   ip_address: string;
   mac_address: string;
+  mac_vendor: string | null;
   hostname: string;
   serial_number: string;
   purchase_date: string | null;
@@ -196,6 +198,7 @@ export interface Server {
   software_installed: string;
   ip_address: string;
   mac_address: string;
+  mac_vendor: string | null;
   hostname: string;
   serial_number: string;
   location: string | null;
@@ -220,6 +223,7 @@ export interface Peripheral {
   model: string;
   ip_address: string;
   mac_address: string;
+  mac_vendor: string | null;
   serial_number: string;
   location: string | null;
   location_name: string | null;
@@ -283,6 +287,9 @@ export interface Backup {
   last_backup_date: string | null;
   next_backup_date: string | null;
   backup_status: 'active' | 'inactive' | 'failed' | 'warning';
+  health_status?: 'ok' | 'overdue' | 'failed' | 'unknown';
+  overdue_since?: string | null;
+  health_checked_at?: string | null;
   location: string | null;
   location_name: string | null;
   notes: string;
@@ -344,6 +351,173 @@ export interface DiagramData {
   voip: VoIP[];
 }
 
+export interface AutocompleteOption {
+  id: string;
+  label: string;
+  type?: 'network_device' | 'endpoint_user' | 'server' | 'peripheral';
+}
+
+export type AutocompleteKind = 'contacts' | 'locations' | 'organizations' | 'devices';
+
+export interface Subnet {
+  id: string;
+  organization: string;
+  organization_name: string;
+  location: string | null;
+  location_name: string | null;
+  name: string;
+  network: string;
+  vlan_id: number | null;
+  gateway: string | null;
+  description: string;
+  size: number;
+  used: number | null;
+  created_at: string;
+  updated_at: string;
+  deleted_at: string | null;
+}
+
+export interface IPAddressEntry {
+  id: number;
+  address: string;
+  version: 4 | 6;
+  object_type: 'network_device' | 'endpoint_user' | 'server' | 'peripheral';
+  object_id: string;
+  name: string;
+  organization: string;
+  location: string | null;
+}
+
+export interface PhoneOwner {
+  number: string;
+  kind: 'number' | 'extension';
+  source_type: 'voip' | 'voip_assignment' | 'contact';
+  source_id: string;
+  field: string;
+  raw: string;
+  organization_id: string;
+  organization_name: string;
+  contact_id: string | null;
+  contact_name: string | null;
+  voip_id: string | null;
+  voip_name: string | null;
+}
+
+export interface PhoneLookupResponse {
+  number?: string;
+  extension?: string;
+  results: PhoneOwner[];
+}
+
+export interface ExtensionConflict {
+  organization_id: string;
+  extension: string;
+  contacts: number;
+  services: number;
+  owners: PhoneOwner[];
+}
+
+export type MACDeviceType = 'network_device' | 'endpoint_user' | 'server' | 'peripheral' | 'rmm_endpoint';
+
+export interface MACDevice {
+  type: MACDeviceType;
+  id: string;
+  name: string;
+  organization_id: string;
+  mac_address: string;
+}
+
+export interface MACLookupResponse {
+  mac: string;
+  vendor: string | null;
+  results: MACDevice[];
+}
+
+export type AssetIdentifier = 'serial_number' | 'mac_address' | 'hostname';
+
+export interface AssetIndexHit {
+  type: MACDeviceType;
+  id: string;
+  asset_id: string;
+  name: string;
+  organization_id: string;
+  location_id: string | null;
+  serial_number: string;
+  hostname: string;
+  mac_address: string;
+  matched_on?: AssetIdentifier[];
+}
+
+export interface DuplicateAsset {
+  identifier: AssetIdentifier;
+  value: string;
+  organization_id: string | null;
+  organizations: number;
+  holders: AssetIndexHit[];
+}
+
+export type ExpiringKind = 'software' | 'voip' | 'warranty';
+
+export interface ExpiringItem {
+  kind: ExpiringKind;
+  id: string;
+  organization_id: string;
+  organization_name: string;
+  name: string;
+  expires_on: string;
+  detail: string;
+}
+
+export interface ExpiringResponse {
+  start: string;
+  end: string;
+  counts: Partial<Record<ExpiringKind, number>>;
+  results: ExpiringItem[];
+}
+
+export type TrashItemType =
+  | 'organization' | 'location' | 'contact' | 'documentation' | 'password' | 'configuration'
+  | 'network_device' | 'endpoint_user' | 'server' | 'peripheral' | 'subnet' | 'software'
+  | 'software_assignment' | 'backup' | 'voip' | 'voip_assignment' | 'rmm_source' | 'rmm_endpoint';
+
+export interface TrashItem {
+  type: TrashItemType;
+  id: string;
+  label: string;
+  deleted_by: string | null;
+  deleted_at: string;
+}
+
+export interface TrashPage {
+  results: TrashItem[];
+  next: string | null;
+}
+
+export interface BulkResponse<T> {
+  count: number;
+  results: T[];
+}
+
+// Items fetched by id: results in the requested order, unknown or deleted ids in `missing`
+export interface BatchResponse<T> {
+  count: number;
+  results: T[];
+  missing: string[];
+}
+
+// Per-item errors of a rejected bulk request, in input order ({} for valid items)
+export interface BulkErrorResponse {
+  detail: string;
+  errors?: Record<string, string[]>[];
+}
+
+export interface BulkDeleteResponse {
+  detail: string;
+  deletion_batch: string;
+  deleted: Record<string, number>;
+  ids: string[];
+}
+
 export interface PaginatedResponse<T> {
   count: number;
   next: string | null;